@@ -9,6 +9,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from crypto.crypto_analyzer import CryptoAnalyzer
+from crypto.coin_classifier import coin_classifier
 
 def analyze_coin_types():
     print("🪙 Coin Türü Analizi Başlıyor...")
@@ -67,57 +68,10 @@ def analyze_coin_types():
 def determine_coin_type(symbol, price, volume):
     """Coin'in türünü belirler"""
     
-    # Major coins (ana coinler)
-    major_coins = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'XRPUSDT', 'ADAUSDT', 'SOLUSDT', 'DOTUSDT', 'LINKUSDT', 'LTCUSDT', 'BCHUSDT']
-    
-    # Stablecoins (sabit coinler)
-    stablecoins = ['USDTUSDT', 'USDCUSDT', 'BUSDUSDT', 'DAIUSDT', 'TUSDUSDT', 'FRAXUSDT']
-    
-    # Meme coins (meme coinler) - genellikle düşük fiyatlı ve yüksek hacimli
-    meme_indicators = ['DOGE', 'SHIB', 'PEPE', 'FLOKI', 'BONK', 'WIF', 'MYRO', 'POPCAT', 'BOOK', 'TURBO']
-    
-    # DeFi tokens (DeFi tokenleri)
-    defi_indicators = ['UNI', 'AAVE', 'COMP', 'MKR', 'SUSHI', 'CRV', 'BAL', 'YFI', 'SNX', '1INCH']
-    
-    # Gaming tokens (oyun tokenleri)
-    gaming_indicators = ['AXS', 'MANA', 'SAND', 'ENJ', 'GALA', 'ILV', 'ALICE', 'HERO', 'TLM', 'ALPHA']
-    
-    # Layer 1 coins (katman 1 coinler)
-    layer1_indicators = ['AVAX', 'MATIC', 'ATOM', 'NEAR', 'FTM', 'ALGO', 'ICP', 'APT', 'SUI', 'SEI']
-    
-    # Layer 2 coins (katman 2 coinler)
-    layer2_indicators = ['ARB', 'OP', 'IMX', 'ZKSYNC', 'STARK', 'POLYGON', 'OPTIMISM']
-    
-    # AI tokens (yapay zeka tokenleri)
-    ai_indicators = ['FET', 'OCEAN', 'AGIX', 'RNDR', 'TAO', 'BITTENSOR', 'AI', 'GPT', 'NEURAL']
-    
-    # Exchange tokens (borsa tokenleri)
-    exchange_indicators = ['BNB', 'OKB', 'HT', 'KCS', 'GT', 'MX', 'BGB', 'CRO', 'FTT']
-    
-    # Utility tokens (fayda tokenleri)
-    utility_indicators = ['LINK', 'CHAINLINK', 'BAT', 'ZRX', 'REP', 'KNC', 'BAND', 'API3']
-    
-    # Check coin type
-    if symbol in major_coins:
-        return "Major Coin"
-    elif symbol in stablecoins:
-        return "Stablecoin"
-    elif any(indicator in symbol for indicator in meme_indicators):
-        return "Meme Coin"
-    elif any(indicator in symbol for indicator in defi_indicators):
-        return "DeFi Token"
-    elif any(indicator in symbol for indicator in gaming_indicators):
-        return "Gaming Token"
-    elif any(indicator in symbol for indicator in layer1_indicators):
-        return "Layer 1"
-    elif any(indicator in symbol for indicator in layer2_indicators):
-        return "Layer 2"
-    elif any(indicator in symbol for indicator in ai_indicators):
-        return "AI Token"
-    elif any(indicator in symbol for indicator in exchange_indicators):
-        return "Exchange Token"
-    elif any(indicator in symbol for indicator in utility_indicators):
-        return "Utility Token"
+    # Sembole bağlı tür önceden derlenmiş indeksten gelir
+    coin_type = coin_classifier.coin_type(symbol)
+    if coin_type is not None:
+        return coin_type
     elif price < 0.01 and volume > 10000000:  # Çok düşük fiyat, yüksek hacim
         return "Altcoin/Meme"
     elif price < 1.0:
@@ -15,6 +15,9 @@ from datetime import datetime, timedelta
 import json
 import os
 
+from utils.ttl_cache import TTLCache
+from data.ohlcv_store import ohlcv_store
+
 class BISTYFinanceIntegration:
     """BIST hisseleri için yfinance entegrasyon sınıfı"""
     
@@ -26,7 +29,8 @@ class BISTYFinanceIntegration:
         })
         self.rate_limit_delay = 5.0  # Rate limiting için bekleme süresi
         self.max_retries = 3  # Maksimum deneme sayısı
-        self.cache = {}  # Basit önbellek
+        self.cache = TTLCache(ttl=3600, max_entries=128)  # 1 saatlik, boyut sınırlı önbellek
+        self.ohlcv_store = ohlcv_store  # Sütunlu günlük mum deposu (pazar/sembol bölümlü)
         
     def _wait_for_rate_limit(self):
         """Rate limiting için bekleme"""
@@ -77,9 +81,10 @@ class BISTYFinanceIntegration:
             
             # Önbellekte var mı kontrol et
             cache_key = f"{symbol}_{start_date}_{end_date}"
-            if cache_key in self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
                 print(f"✅ Önbellekten veri alındı: {symbol}")
-                return self.cache[cache_key]
+                return cached
             
             # yfinance ticker oluştur
             ticker = self._create_ticker_with_retry(symbol)
@@ -114,7 +119,7 @@ class BISTYFinanceIntegration:
             print(f"📊 Ortalama hacim: {result_df['Hacim'].mean():,.0f}")
             
             # Önbelleğe kaydet
-            self.cache[cache_key] = result_df
+            self.cache.set(cache_key, result_df)
             
             return result_df
             
@@ -137,9 +142,10 @@ class BISTYFinanceIntegration:
             
             # Önbellekte var mı kontrol et
             cache_key = f"info_{symbol}"
-            if cache_key in self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
                 print(f"✅ Önbellekten bilgi alındı: {symbol}")
-                return self.cache[cache_key]
+                return cached
             
             # yfinance ticker oluştur
             ticker = self._create_ticker_with_retry(symbol)
@@ -184,7 +190,7 @@ class BISTYFinanceIntegration:
             print(f"📈 Günlük değişim: {stock_info['daily_change_percent']:.2f}%")
             
             # Önbelleğe kaydet
-            self.cache[cache_key] = stock_info
+            self.cache.set(cache_key, stock_info)
             
             return stock_info
             
@@ -261,6 +267,38 @@ class BISTYFinanceIntegration:
             print(f"❌ Dosya yükleme hatası: {str(e)}")
             return None
 
+    def save_data_to_store(self, df, symbol, market="BIST"):
+        """
+        DataFrame'i sütunlu mum deposuna ekler (yalnızca son kayıttan yeni günler yazılır)
+        
+        Args:
+            df (pandas.DataFrame): Tarih ve OHLCV sütunları (Türkçe veya İngilizce adlarla)
+            symbol (str): Hisse kodu (örn: ASELS.IS)
+            market (str): Pazar bölümü (BIST, US)
+            
+        Returns:
+            int: Eklenen gün sayısı
+        """
+        added = self.ohlcv_store.append(market, symbol.replace('.IS', ''), df)
+        print(f"✅ Depoya eklendi: {market}/{symbol} ({added} yeni gün)")
+        return added
+
+    def load_data_from_store(self, symbol, columns=None, start_date=None, end_date=None, market="BIST"):
+        """
+        Sütunlu depodan veri yükler; yalnızca istenen sütunlar okunur
+        
+        Args:
+            symbol (str): Hisse kodu
+            columns (list): Okunacak sütunlar (örn: ['close', 'volume']); None ise tümü
+            start_date (str): Başlangıç tarihi (YYYY-MM-DD formatında)
+            end_date (str): Bitiş tarihi (YYYY-MM-DD formatında)
+            market (str): Pazar bölümü
+            
+        Returns:
+            pandas.DataFrame: Tarih indeksli veri (kayıt yoksa boş)
+        """
+        return self.ohlcv_store.read_frame(market, symbol.replace('.IS', ''), columns, start_date, end_date)
+
     def get_mock_bist_data(self, symbol, start_date, end_date, force_big_drop=False, drop_ratio=0.7):
         """
         Rate limiting durumunda kullanılacak mock data
@@ -381,6 +419,7 @@ def main():
                 filename = f"data/{symbol.replace('.IS', '')}_data.csv"
                 os.makedirs('data', exist_ok=True)
                 bist_integration.save_data_to_csv(df, filename)
+                bist_integration.save_data_to_store(df, symbol)
                 
                 # İstatistikler
                 print(f"💰 Son kapanış: {df['Kapanış'].iloc[-1]:.2f} TL")
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Vektörel Geriye Dönük Test
+Skorlayıcı kurallarını tüm tarihsel mum dizileri üzerinde tek geçişte (her mum bir
+tarama anıymış gibi) hesaplar; girişi ve hedef fiyat / süre sonu çıkışını sonraki
+24 saatlik veya 1 saatlik pencere üzerinde simüle eder
+"""
+
+import os
+import time
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .candles import Candles, KLINE_COLUMNS, INTERVAL_MS, KLINES_PAGE_LIMIT
+from .indicator_panel import (ema, score_24h_features, score_1h_features, PROFIT_TIERS,
+                              PROFIT_DEFAULT_TIER, ONE_HOUR_RECOMMENDATIONS)
+
+# Skorlayıcı -> tutma süresi (mum)
+HORIZONS = {'24h': 24, '1h': 1}
+
+
+def lagged(values: np.ndarray, lag: int) -> np.ndarray:
+    """Her zaman adımında `lag` mum önceki değer (başta NaN)"""
+    if lag == 0:
+        return values
+    result = np.full(values.shape, np.nan)
+    result[:, lag:] = values[:, :-lag]
+    return result
+
+
+def lead(values: np.ndarray, lag: int) -> np.ndarray:
+    """Her zaman adımında `lag` mum sonraki değer (sonda NaN)"""
+    result = np.full(values.shape, np.nan)
+    result[:, :-lag] = values[:, lag:]
+    return result
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Son `window` değerin toplamı (pencere dolmadan NaN)"""
+    total = values.astype(np.float64, copy=True)
+    for lag in range(1, window):
+        total += lagged(values, lag)
+    return total
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return rolling_sum(values, window) / window
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Son `window` değerin örneklem standart sapması (ddof=1, iki geçişli)"""
+    mean = rolling_mean(values, window)
+    squares = np.zeros(values.shape)
+    for lag in range(window):
+        squares += (lagged(values, lag) - mean) ** 2
+    return np.sqrt(squares / (window - 1))
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    result = values.astype(np.float64, copy=True)
+    for lag in range(1, window):
+        result = np.minimum(result, lagged(values, lag))
+    return result
+
+
+def history_features(close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray,
+                     quote_volume: np.ndarray, window: int = 168) -> Dict[str, np.ndarray]:
+    """Her mumda, o ana kadarki son `window` mumla yapılan taramanın göreceği özellikler (N x T).
+
+    MACD, pencere başından değil serinin başından hesaplanır; 168 mumluk pencerede
+    fark 1e-5 mertebesindedir.
+    """
+    delta = close - lagged(close, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # RSI: calculate_rsi ile aynı basit ortalama
+        gain = rolling_mean(np.where(delta > 0, delta, 0.0), 14)
+        loss = rolling_mean(np.where(delta < 0, -delta, 0.0), 14)
+        rsi = 100 - (100 / (1 + gain / loss))
+        rsi[:, :14] = np.nan
+
+        recent_volume = rolling_sum(quote_volume, 24)
+        previous_volume = lagged(recent_volume, 24)
+        volume_increase = np.where(previous_volume > 0,
+                                   (recent_volume - previous_volume) / previous_volume * 100, np.nan)
+
+        macd_line = ema(close, 12) - ema(close, 26)
+        signal_line = ema(macd_line, 9)
+        macd_cross = (macd_line > signal_line) & (lagged(macd_line, 1) <= lagged(signal_line, 1))
+
+        bb_middle = rolling_mean(close, 20)
+        bb_std = rolling_std(close, 20)
+        bb_position = (close - (bb_middle - 2 * bb_std)) / (4 * bb_std)
+
+        returns = close / lagged(close, 1) - 1
+
+        features = {
+            'change_24h': (close - lagged(close, 23)) / lagged(close, 23) * 100,
+            'change_7d': (close - lagged(close, window - 1)) / lagged(close, window - 1) * 100,
+            'change_1h': (close - lagged(close, 1)) / lagged(close, 1) * 100,
+            'change_4h': (close - lagged(close, 4)) / lagged(close, 4) * 100,
+            'rsi': rsi,
+            'volume_increase': volume_increase,
+            'volume_24h': recent_volume,
+            'volume_spike': volume > rolling_mean(volume, 24) * 1.5,
+            'momentum': (close - lagged(close, 5)) / lagged(close, 5) * 100,
+            'current_price': close,
+            'support_level': rolling_min(low, 24),
+            'sma_short': rolling_mean(close, 12),
+            'sma_long': rolling_mean(close, 24),
+            'volatility': rolling_std(returns, 23) * 100,
+            'macd_cross': macd_cross,
+            'bb_position': bb_position,
+        }
+    return features
+
+
+def simulate_exits(close: np.ndarray, high: np.ndarray, low: np.ndarray, target: np.ndarray,
+                   horizon: int) -> Dict[str, np.ndarray]:
+    """Her mumun kapanışında girilen pozisyonun çıkışını simüle eder.
+
+    Hedef fiyat girişin üzerindeyse ilk ulaşıldığı mumda hedeften çıkılır; ulaşılmazsa
+    (veya hedef yoksa) `horizon` mum sonraki kapanışta çıkılır. Düşüş, pozisyon açıkken
+    görülen en düşük fiyattır (hedefe ulaşılan mumun dibi dahil).
+    """
+    has_target = target > close
+    is_open = np.ones(close.shape, dtype=bool)
+    reached_target = np.zeros(close.shape, dtype=bool)
+    exit_price = np.full(close.shape, np.nan)
+    lowest = close.copy()
+
+    # Döngü yalnızca tutma süresi boyunca; her adım tüm semboller ve zamanlar için vektörel
+    for step in range(1, horizon + 1):
+        lowest = np.where(is_open, np.fmin(lowest, lead(low, step)), lowest)
+        reached = is_open & has_target & (lead(high, step) >= target)
+        exit_price = np.where(reached, target, exit_price)
+        reached_target |= reached
+        is_open &= ~reached
+
+    final_close = lead(close, horizon)
+    exit_price = np.where(is_open, final_close, exit_price)
+    returns = (exit_price - close) / close * 100
+
+    return {
+        'return': returns,
+        'hit': np.where(has_target, reached_target, returns > 0),
+        'drawdown': (lowest - close) / close * 100,
+        'complete': ~np.isnan(final_close),
+    }
+
+
+def tier_report(labels: List[str], tiers: np.ndarray, exits: Dict[str, np.ndarray],
+                valid: np.ndarray) -> pd.DataFrame:
+    """Tavsiye kademesi başına isabet oranı, ortalama getiri ve düşüş özeti"""
+    mask = valid & exits['complete']
+    rows = []
+    for code, label in enumerate(labels):
+        selected = mask & (tiers == code)
+        count = int(selected.sum())
+        if count == 0:
+            rows.append({'recommendation': label, 'signals': 0, 'hit_rate': np.nan, 'avg_return': np.nan,
+                         'avg_drawdown': np.nan, 'max_drawdown': np.nan})
+            continue
+        rows.append({
+            'recommendation': label,
+            'signals': count,
+            'hit_rate': float(exits['hit'][selected].mean() * 100),
+            'avg_return': float(exits['return'][selected].mean()),
+            'avg_drawdown': float(exits['drawdown'][selected].mean()),
+            'max_drawdown': float(exits['drawdown'][selected].min()),
+        })
+    return pd.DataFrame(rows).set_index('recommendation')
+
+
+class Backtester:
+    """24 saatlik ve 1 saatlik kazanç skorlayıcıları için vektörel geriye dönük test"""
+
+    def __init__(self, analyzer, data_dir: str = "data", window: int = 168, chunk_size: int = 64):
+        self.analyzer = analyzer
+        self.history_dir = os.path.join(data_dir, "backtest")
+        self.window = window  # Taramanın her sembol için kullandığı mum sayısı
+        self.chunk_size = chunk_size  # Bellek kullanımını sınırlamak için birlikte işlenen sembol sayısı
+        self.logger = logging.getLogger(__name__)
+
+    # ---- Tarihsel veri ----
+
+    def load_history(self, symbols: List[str], interval: str = "1h", days: int = 365,
+                     end_ms: Optional[int] = None) -> Dict[str, Candles]:
+        """Sembollerin son `days` günlük mumlarını yükler (yerel mum deposu + eksik kısım REST)"""
+        end_ms = end_ms if end_ms is not None else int(time.time() * 1000)
+        start_ms = end_ms - days * 86_400_000
+        return self.analyzer.fetcher.map(
+            symbols, lambda symbol: self.analyzer.load_history(symbol, interval, start_ms, end_ms)
+        )
+
+    def load_cached(self, symbols: List[str], interval: str = "1h", days: Optional[int] = None) -> Dict[str, Candles]:
+        """Yalnızca yerel mum deposundaki geçmişi yükler (ağ isteği yapılmaz); `days` verilirse son günler alınır"""
+        history = {}
+        store = self.analyzer.candle_store
+        if store is None:
+            return history
+        for symbol in symbols:
+            start = None
+            if days is not None:
+                bounds = store.bounds(symbol, interval)
+                if bounds is None:
+                    continue
+                start = bounds[1] - days * 86_400_000 + 1
+            candles = store.read(symbol, interval, start=start)
+            if not candles.empty:
+                history[symbol] = candles
+        return history
+
+    # ---- Test ----
+
+    def chunks(self, history: Dict[str, Candles]) -> List[List[str]]:
+        """Aynı uzunluktaki sembolleri `chunk_size`'lık gruplara ayırır (kısa geçmişliler atlanır)"""
+        minimum_length = self.window + max(HORIZONS.values())
+
+        groups = {}
+        for symbol, candles in history.items():
+            if candles is not None and len(candles) >= minimum_length:
+                groups.setdefault(len(candles), []).append(symbol)
+
+        return [symbols[start:start + self.chunk_size]
+                for symbols in groups.values() for start in range(0, len(symbols), self.chunk_size)]
+
+    def prepare(self, candles: List[Candles]) -> Dict[str, np.ndarray]:
+        """Aynı uzunluktaki semboller için fiyat dizileri, özellikler ve ısınma maskesi (N x T)"""
+        def stack(column):
+            return np.vstack([item.array(column) for item in candles])
+
+        close, high, low = stack('close'), stack('high'), stack('low')
+
+        # Tarama penceresi dolmadan (ilk window-1 mum) sinyal üretilmez
+        warmed_up = np.zeros(close.shape, dtype=bool)
+        warmed_up[:, self.window - 1:] = True
+
+        return {
+            'close': close,
+            'high': high,
+            'low': low,
+            'warmed_up': warmed_up,
+            'features': history_features(close, high, low, stack('volume'), stack('quote_asset_volume'),
+                                         self.window),
+        }
+
+    def run(self, history: Dict[str, Candles], min_volume: Optional[float] = None,
+            params: Optional[Dict] = None) -> Dict[str, pd.DataFrame]:
+        """Skorlayıcı başına kademe raporunu döndürür ({'24h': DataFrame, '1h': DataFrame}).
+
+        Aynı uzunluktaki semboller `chunk_size`'lık N x T dizilerinde birlikte işlenir;
+        eşikler verilmezse analizörün `scoring_params` değerleri kullanılır.
+        """
+        min_volume = self.analyzer.min_volume_usdt if min_volume is None else min_volume
+        params = self.analyzer.scoring_params if params is None else params
+        chunks = self.chunks(history)
+
+        collected = {key: {'tiers': [], 'valid': [], 'exits': []} for key in HORIZONS}
+        for symbols in chunks:
+            prepared = self.prepare([history[s] for s in symbols])
+            for key, (tiers, valid, exits) in self._run_group(prepared, min_volume, params).items():
+                # Yalnızca değerlendirilebilen sinyaller saklanır
+                keep = valid & exits['complete']
+                collected[key]['tiers'].append(tiers[keep])
+                collected[key]['valid'].append(valid[keep])
+                collected[key]['exits'].append({name: values[keep] for name, values in exits.items()})
+
+        labels = {
+            '24h': [tier[1] for tier in PROFIT_TIERS] + [PROFIT_DEFAULT_TIER[0]],
+            '1h': list(ONE_HOUR_RECOMMENDATIONS),
+        }
+        reports = {}
+        for key, parts in collected.items():
+            if parts['tiers']:
+                exits = {name: np.concatenate([item[name] for item in parts['exits']]) for name in parts['exits'][0]}
+                tiers, valid = np.concatenate(parts['tiers']), np.concatenate(parts['valid'])
+            else:
+                exits = {name: np.empty(0) for name in ('return', 'hit', 'drawdown')}
+                exits['complete'] = np.empty(0, dtype=bool)
+                tiers, valid = np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+            reports[key] = tier_report(labels[key], tiers, exits, valid)
+
+        self.logger.info(f"Geriye dönük test: {sum(len(symbols) for symbols in chunks)} sembol, "
+                         f"{sum(len(symbols) * len(history[symbols[0]]) for symbols in chunks)} mum")
+        return reports
+
+    def _run_group(self, prepared: Dict, min_volume: float, params: Dict) -> Dict[str, tuple]:
+        """Hazırlanmış grup için skorlayıcıları ve çıkışları hesaplar"""
+        close, high, low = prepared['close'], prepared['high'], prepared['low']
+        features, warmed_up = prepared['features'], prepared['warmed_up']
+
+        scored_24h = score_24h_features(features, params)
+        exits_24h = simulate_exits(close, high, low, scored_24h['target_price'], HORIZONS['24h'])
+
+        scored_1h = score_1h_features(features, params)
+        exits_1h = simulate_exits(close, high, low, close, HORIZONS['1h'])
+
+        return {
+            '24h': (scored_24h['tier'], warmed_up, exits_24h),
+            '1h': (scored_1h['rec_code'], warmed_up & (features['volume_24h'] >= min_volume), exits_1h),
+        }
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Mum Verisi Halka Tamponu
+Bir (sembol, aralık) çifti için mumları önceden ayrılmış dizilerde tutar,
+yenilemede yalnızca yeni mumları ekler ve açık mumu yerinde günceller
+"""
+
+import threading
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .candles import Candles, KLINE_COLUMNS, INT_COLUMNS
+
+
+class CandleBuffer:
+    """Sabit kapasiteli, sütun bazlı mum halka tamponu"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self.history_exhausted = False  # Borsada daha eski mum yoksa True
+        self.lock = threading.RLock()  # Canlı akış yazarken okuyucular tutarlı görüntü alır
+        self.version = 0  # Her değişiklikte artar; türetilmiş mumlar bununla doğrulanır
+        self.refreshed_at = None  # Son REST yenilemesi (time.monotonic())
+        self._allocate(self.capacity)
+
+    def _allocate(self, capacity: int):
+        """Sütun dizilerini ayırır ve tamponu boşaltır"""
+        self._columns = {
+            name: np.zeros(capacity, dtype=np.int64 if name in INT_COLUMNS else np.float64)
+            for name in KLINE_COLUMNS
+        }
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        """Tüm mumları siler"""
+        with self.lock:
+            self._start = 0
+            self._size = 0
+            self.history_exhausted = False
+            self.version += 1
+
+    def resize(self, capacity: int):
+        """Kapasiteyi büyütür (mevcut mumlar korunur)"""
+        with self.lock:
+            if capacity <= self.capacity:
+                return
+            current = {name: self.column(name) for name in KLINE_COLUMNS}
+            self.capacity = int(capacity)
+            self._allocate(self.capacity)
+            for name, values in current.items():
+                self._columns[name][:len(values)] = values
+            self._size = len(current['open_time'])
+            self.version += 1
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        """Son mumun açılış zamanı (ms)"""
+        if self._size == 0:
+            return None
+        return int(self._columns['open_time'][(self._start + self._size - 1) % self.capacity])
+
+    @property
+    def last_close_time(self) -> Optional[int]:
+        """Son mumun kapanış zamanı (ms)"""
+        if self._size == 0:
+            return None
+        return int(self._columns['close_time'][(self._start + self._size - 1) % self.capacity])
+
+    def _order(self, limit: Optional[int] = None) -> np.ndarray:
+        """Kronolojik sırada fiziksel indeksler (son `limit` mum)"""
+        count = self._size if limit is None else min(limit, self._size)
+        offsets = np.arange(self._size - count, self._size)
+        return (self._start + offsets) % self.capacity
+
+    def column(self, name: str, limit: Optional[int] = None) -> np.ndarray:
+        """Bir sütunu kronolojik sırada kopya olarak döndürür"""
+        with self.lock:
+            return self._columns[name][self._order(limit)]
+
+    def extend(self, rows: List[list]) -> int:
+        """Ham kline satırlarını ekler; son mumla aynı açılış zamanlı satır yerinde güncellenir.
+
+        Eklenen ya da güncellenen satır sayısını döndürür.
+        """
+        if not rows:
+            return 0
+
+        parsed = np.array([row[:len(KLINE_COLUMNS)] for row in rows], dtype=np.float64)
+        open_times = parsed[:, 0].astype(np.int64)
+
+        with self.lock:
+            last_open = self.last_open_time
+            if last_open is not None:
+                keep = open_times >= last_open
+                parsed = parsed[keep]
+                open_times = open_times[keep]
+                if len(open_times) == 0:
+                    return 0
+
+                # Hâlâ açık olan son mum yerinde güncellenir
+                if open_times[0] == last_open:
+                    last_index = (self._start + self._size - 1) % self.capacity
+                    self._write(np.array([last_index]), parsed[:1])
+                    parsed = parsed[1:]
+
+            self.version += 1
+            new_count = len(parsed)
+            if new_count:
+                # Kapasiteden fazlası gelirse yalnızca en yeniler tutulur
+                if new_count > self.capacity:
+                    parsed = parsed[-self.capacity:]
+                    new_count = self.capacity
+
+                positions = (self._start + self._size + np.arange(new_count)) % self.capacity
+                self._write(positions, parsed)
+
+                overflow = self._size + new_count - self.capacity
+                if overflow > 0:
+                    self._start = (self._start + overflow) % self.capacity
+                self._size = min(self._size + new_count, self.capacity)
+
+            return len(open_times)
+
+    def _write(self, positions: np.ndarray, parsed: np.ndarray):
+        """Ayrıştırılmış satırları verilen fiziksel konumlara yazar"""
+        for i, name in enumerate(KLINE_COLUMNS):
+            self._columns[name][positions] = parsed[:, i]
+
+    def to_candles(self, limit: Optional[int] = None) -> Candles:
+        """Son `limit` mumun kronolojik kopyasını kompakt mum dizisi olarak döndürür"""
+        with self.lock:
+            order = self._order(limit)
+            return Candles(**{name: self._columns[name][order] for name in KLINE_COLUMNS})
+
+    def to_dataframe(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """Son `limit` mumu analizde kullanılan DataFrame biçiminde döndürür"""
+        return self.to_candles(limit).to_dataframe()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Yerel Mum Geçmişi Deposu
+İndirilen mumları (sembol, aralık, açılış zamanı) anahtarlı SQLite tablosunda saklar;
+aralık okumaları ve boşluk tespiti SQL ile yapılır, yalnızca eksik kısımlar çekilir
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.sqlite_pool import SQLitePool
+
+from .candles import Candles, KLINE_COLUMNS, INTERVAL_MS
+
+Range = Tuple[int, int]  # Kapalı açılış zamanı aralığı (ms)
+
+
+class CandleStore:
+    """Süreçler arası kalıcı, aralık sorgulu mum deposu"""
+
+    def __init__(self, data_dir: str = "data", filename: str = "crypto_candles.db"):
+        self.data_dir = data_dir
+        self.db_path = os.path.join(data_dir, filename)
+        self.logger = logging.getLogger(__name__)
+
+        self.db = SQLitePool(self.db_path)  # İş parçacığı başına kalıcı bağlantı (tarama iş parçacıkları)
+        self._write_lock = threading.Lock()  # Aynı süreçteki yazmalar sıraya alınır
+        self._initialized = False  # Veritabanı ilk yazmada oluşturulur
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = self.db.connection()
+        if not self._initialized:
+            self.init_database(conn)
+        return conn
+
+    def init_database(self, conn: sqlite3.Connection):
+        """Mum ve boş aralık tablolarını oluşturur"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS candles (
+                symbol TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                open_time INTEGER NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume REAL,
+                close_time INTEGER,
+                quote_asset_volume REAL,
+                PRIMARY KEY (symbol, interval, open_time)
+            ) WITHOUT ROWID
+        ''')
+
+        # Borsada mum olmadığı doğrulanan aralıklar (listeleme öncesi, bakım kesintileri)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS candle_holes (
+                symbol TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                start_time INTEGER NOT NULL,
+                end_time INTEGER NOT NULL,
+                PRIMARY KEY (symbol, interval, start_time)
+            ) WITHOUT ROWID
+        ''')
+        conn.commit()
+        self._initialized = True
+
+    def _exists(self) -> bool:
+        return self._initialized or os.path.exists(self.db_path)
+
+    def write(self, symbol: str, interval: str, rows: Union[List[list], Candles]) -> int:
+        """Ham kline satırlarını (veya Candles) ekler; aynı açılış zamanlı mum güncellenir"""
+        if isinstance(rows, Candles):
+            rows = list(zip(*(rows.array(name).tolist() for name in KLINE_COLUMNS)))
+        if len(rows) == 0:
+            return 0
+
+        try:
+            values = [
+                (symbol, interval, int(row[0]), float(row[1]), float(row[2]), float(row[3]), float(row[4]),
+                 float(row[5]), int(row[6]), float(row[7]))
+                for row in rows
+            ]
+            os.makedirs(self.data_dir, exist_ok=True)
+            with self._write_lock:
+                with self._connect() as conn:
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', values
+                    )
+            return len(values)
+
+        except Exception as e:
+            self.logger.error(f"{symbol} {interval} mumları kaydedilirken hata: {e}")
+            return 0
+
+    def read(self, symbol: str, interval: str, start: Optional[int] = None, end: Optional[int] = None,
+             limit: Optional[int] = None) -> Candles:
+        """[start, end] aralığındaki mumlar (kronolojik); `limit` verilirse son `limit` mum"""
+        empty = Candles.from_rows([])
+        if not self._exists():
+            return empty
+
+        query = f"SELECT {', '.join(KLINE_COLUMNS)} FROM candles WHERE symbol = ? AND interval = ?"
+        params = [symbol, interval]
+        if start is not None:
+            query += " AND open_time >= ?"
+            params.append(int(start))
+        if end is not None:
+            query += " AND open_time <= ?"
+            params.append(int(end))
+        if limit is not None:
+            query += " ORDER BY open_time DESC LIMIT ?"
+            params.append(int(limit))
+        else:
+            query += " ORDER BY open_time"
+
+        try:
+            rows = self._connect().execute(query, params).fetchall()
+        except Exception as e:
+            self.logger.error(f"{symbol} {interval} mumları okunurken hata: {e}")
+            return empty
+
+        if not rows:
+            return empty
+        if limit is not None:
+            rows.reverse()
+        parsed = np.array(rows, dtype=np.float64)
+        return Candles(**{name: parsed[:, i] for i, name in enumerate(KLINE_COLUMNS)})
+
+    def bounds(self, symbol: str, interval: str) -> Optional[Tuple[int, int, int]]:
+        """Saklanan ilk ve son açılış zamanı ile mum sayısı"""
+        if not self._exists():
+            return None
+        first, last, count = self._connect().execute(
+            "SELECT MIN(open_time), MAX(open_time), COUNT(*) FROM candles WHERE symbol = ? AND interval = ?",
+            (symbol, interval)
+        ).fetchone()
+        return (first, last, count) if count else None
+
+    def gaps(self, symbol: str, interval: str, start: int, end: int) -> List[Range]:
+        """[start, end] içinde saklanmayan açılış zamanı aralıkları.
+
+        Baştaki, aradaki ve sondaki eksikler döner; borsada boş olduğu bilinen
+        aralıklar çıkarılır.
+        """
+        step = INTERVAL_MS.get(interval)
+        if step is None or start > end:
+            return []
+        if not self._exists():
+            return [(start, end)]
+
+        conn = self._connect()
+        # Ardışık iki mum arasında bir adımdan fazla fark varsa arada eksik vardır
+        rows = conn.execute('''
+            SELECT previous, open_time FROM (
+                SELECT open_time, LAG(open_time) OVER (ORDER BY open_time) AS previous
+                FROM candles WHERE symbol = ? AND interval = ? AND open_time BETWEEN ? AND ?
+            ) WHERE previous IS NOT NULL AND open_time - previous > ?
+        ''', (symbol, interval, start, end, step)).fetchall()
+        first, last = conn.execute(
+            "SELECT MIN(open_time), MAX(open_time) FROM candles "
+            "WHERE symbol = ? AND interval = ? AND open_time BETWEEN ? AND ?",
+            (symbol, interval, start, end)
+        ).fetchone()
+        holes = conn.execute(
+            "SELECT start_time, end_time FROM candle_holes "
+            "WHERE symbol = ? AND interval = ? AND start_time <= ? AND end_time >= ? ORDER BY start_time",
+            (symbol, interval, end, start)
+        ).fetchall()
+
+        if first is None:
+            missing = [(start, end)]
+        else:
+            missing = [(previous + step, open_time - 1) for previous, open_time in rows]
+            if first - step >= start:
+                missing.insert(0, (start, first - 1))
+            if last + step <= end:
+                missing.append((last + step, end))
+
+        return [piece for gap in missing for piece in self._subtract(gap, holes)]
+
+    @staticmethod
+    def _subtract(gap: Range, holes: List[Range]) -> List[Range]:
+        """Aralıktan bilinen boş aralıkları çıkarır (delikler başlangıca göre sıralı)"""
+        pieces = []
+        low, high = gap
+        for hole_start, hole_end in holes:
+            if hole_end < low or hole_start > high:
+                continue
+            if hole_start > low:
+                pieces.append((low, hole_start - 1))
+            low = max(low, hole_end + 1)
+            if low > high:
+                return pieces
+        pieces.append((low, high))
+        return pieces
+
+    def mark_empty(self, symbol: str, interval: str, ranges: List[Range]):
+        """Borsanın mum döndürmediği aralıkları kaydeder (tekrar istenmez)"""
+        if not ranges:
+            return
+        try:
+            with self._write_lock:
+                with self._connect() as conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO candle_holes VALUES (?, ?, ?, ?)",
+                        [(symbol, interval, int(low), int(high)) for low, high in ranges]
+                    )
+        except Exception as e:
+            self.logger.error(f"{symbol} {interval} boş aralıkları kaydedilirken hata: {e}")
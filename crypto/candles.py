@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Kompakt Mum Verisi
+Ham kline yanıtını tek geçişte float64/int64 sütunlara ayrıştırır;
+DataFrame yalnızca grafik gibi gerçekten gerektiğinde oluşturulur
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Binance /klines yanıtındaki ilk sekiz alan; işlem sayısı, taker ve 'ignore'
+# alanları analizde kullanılmadığından saklanmaz
+KLINE_COLUMNS = [
+    'open_time', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_asset_volume'
+]
+
+INT_COLUMNS = ('open_time', 'close_time')
+TIME_COLUMNS = ('open_time', 'close_time')
+
+# Binance aralık kodlarının milisaniye karşılıkları
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000, '3d': 259_200_000, '1w': 604_800_000,
+}
+
+# /klines tek istekte en fazla 1000 mum döndürür
+KLINES_PAGE_LIMIT = 1000
+
+
+class Candles:
+    """Salt okunur, sütun bazlı mum dizisi (DataFrame benzeri sütun erişimiyle)"""
+
+    __slots__ = tuple(KLINE_COLUMNS) + ('_frame',)
+
+    def __init__(self, **columns: np.ndarray):
+        for name in KLINE_COLUMNS:
+            values = np.ascontiguousarray(columns[name], dtype=np.int64 if name in INT_COLUMNS else np.float64)
+            values.flags.writeable = False
+            setattr(self, name, values)
+        self._frame = None
+
+    @classmethod
+    def from_rows(cls, rows: List[list]) -> 'Candles':
+        """Ham kline satırlarını tek geçişte ayrıştırır"""
+        if not rows:
+            return cls(**{name: np.empty(0) for name in KLINE_COLUMNS})
+
+        parsed = np.array([row[:len(KLINE_COLUMNS)] for row in rows], dtype=np.float64)
+        return cls(**{name: parsed[:, i] for i, name in enumerate(KLINE_COLUMNS)})
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def columns(self) -> List[str]:
+        return list(KLINE_COLUMNS)
+
+    def __contains__(self, name: str) -> bool:
+        return name in KLINE_COLUMNS
+
+    def array(self, name: str) -> np.ndarray:
+        """Sütunu kopyasız NumPy dizisi olarak döndürür"""
+        if name not in KLINE_COLUMNS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __getitem__(self, name: str) -> pd.Series:
+        """Sütunu pandas Series olarak döndürür (zaman sütunları datetime'a çevrilir)"""
+        values = self.array(name)
+        if name in TIME_COLUMNS:
+            return pd.Series(pd.to_datetime(values, unit='ms'), name=name)
+        return pd.Series(values, name=name, copy=False)
+
+    @property
+    def nbytes(self) -> int:
+        """Sütunların kapladığı bayt sayısı"""
+        return sum(getattr(self, name).nbytes for name in KLINE_COLUMNS)
+
+    def tail(self, count: int) -> 'Candles':
+        """Son `count` mumu döndürür"""
+        return Candles(**{name: getattr(self, name)[-count:] if count else getattr(self, name)[:0]
+                          for name in KLINE_COLUMNS})
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Analiz ve grafiklerde kullanılan DataFrame biçimi (ilk çağrıda oluşturulur)"""
+        if self._frame is None:
+            self._frame = pd.DataFrame({name: self[name] for name in KLINE_COLUMNS})
+        return self._frame
+
+    def __repr__(self) -> str:
+        if self.empty:
+            return "Candles(0)"
+        start = pd.to_datetime(int(self.open_time[0]), unit='ms')
+        end = pd.to_datetime(int(self.open_time[-1]), unit='ms')
+        return f"Candles({len(self)}, {start} - {end})"
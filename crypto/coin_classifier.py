@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Coin Sınıflandırma İndeksi
+Sembol türlerini ve filtre kategorilerini tek derlenmiş eşleştiriciyle bir kez hesaplar;
+sonuçlar sembol evreniyle birlikte saklanır, filtreler önceden hesaplanmış kovalara bakar
+"""
+
+import re
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Kurallar değiştiğinde diskteki sınıflandırmalar yeniden hesaplanır
+CLASSIFIER_VERSION = 1
+
+# Tam sembol eşleşmesiyle belirlenen türler
+MAJOR_COINS = {'BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'XRPUSDT', 'ADAUSDT', 'SOLUSDT', 'DOTUSDT', 'LINKUSDT',
+               'LTCUSDT', 'BCHUSDT'}
+STABLECOINS = {'USDTUSDT', 'USDCUSDT', 'BUSDUSDT', 'DAIUSDT', 'TUSDUSDT', 'FRAXUSDT'}
+
+# Sembol içinde geçen göstergeye göre türler (öncelik sırasıyla; ilk eşleşen tür kazanır)
+COIN_TYPE_INDICATORS = [
+    ("Meme Coin", ['DOGE', 'SHIB', 'PEPE', 'FLOKI', 'BONK', 'WIF', 'MYRO', 'POPCAT', 'BOOK', 'TURBO']),
+    ("DeFi Token", ['UNI', 'AAVE', 'COMP', 'MKR', 'SUSHI', 'CRV', 'BAL', 'YFI', 'SNX', '1INCH']),
+    ("Gaming Token", ['AXS', 'MANA', 'SAND', 'ENJ', 'GALA', 'ILV', 'ALICE', 'HERO', 'TLM', 'ALPHA']),
+    ("Layer 1", ['AVAX', 'MATIC', 'ATOM', 'NEAR', 'FTM', 'ALGO', 'ICP', 'APT', 'SUI', 'SEI']),
+    ("Layer 2", ['ARB', 'OP', 'IMX', 'ZKSYNC', 'STARK', 'POLYGON', 'OPTIMISM']),
+    ("AI Token", ['FET', 'OCEAN', 'AGIX', 'RNDR', 'TAO', 'BITTENSOR', 'AI', 'GPT', 'NEURAL']),
+    ("Exchange Token", ['BNB', 'OKB', 'HT', 'KCS', 'GT', 'MX', 'BGB', 'CRO', 'FTT']),
+    ("Utility Token", ['LINK', 'CHAINLINK', 'BAT', 'ZRX', 'REP', 'KNC', 'BAND', 'API3']),
+]
+
+# Fırsat filtresi kategorileri (bir sembol birden çok kategoriye girebilir)
+CATEGORY_INDICATORS = {
+    'MAJOR': ['BTC', 'ETH', 'BNB', 'XRP', 'ADA'],
+    'MEME': ['DOGE', 'SHIB', 'PEPE', 'FLOKI'],
+    'DEFI': ['UNI', 'AAVE', 'COMP', 'MKR'],
+    'GAMING': ['AXS', 'MANA', 'SAND', 'ENJ'],
+    'LAYER1': ['AVAX', 'MATIC', 'ATOM', 'NEAR'],
+    'LAYER2': ['ARB', 'OP', 'IMX'],
+    'AI': ['FET', 'OCEAN', 'AGIX', 'RNDR'],
+    'EXCHANGE': ['BNB', 'OKB', 'HT', 'KCS'],
+    'UTILITY': ['LINK', 'BAT', 'ZRX'],
+}
+
+MICRO_CAP_VOLUME = 10_000_000  # USDT; MICRO_CAP filtresi hacme bağlı olduğundan anlık değerlendirilir
+
+
+class TokenMatcher:
+    """Gösterge listelerini tek düzenli ifadede birleştirip sembolde geçen tüm etiketleri bulur"""
+
+    def __init__(self, labels: Dict[str, Iterable[str]]):
+        self.token_labels = {}  # gösterge -> etiketler (aynı gösterge birden çok etikette olabilir)
+        for label, tokens in labels.items():
+            for token in tokens:
+                self.token_labels.setdefault(token, set()).add(label)
+
+        # Aynı konumda yalnızca en uzun gösterge eşleşir; onun önekleri olan göstergelerin
+        # etiketleri de eklenir, böylece çakışan eşleşmeler kaybolmaz
+        self.closure = {
+            token: frozenset().union(*(self.token_labels[prefix] for prefix in self.token_labels
+                                       if token.startswith(prefix)))
+            for token in self.token_labels
+        }
+        alternation = '|'.join(re.escape(token) for token in sorted(self.token_labels, key=len, reverse=True))
+        self.pattern = re.compile(f"(?=({alternation}))")  # Sıfır genişlikli: örtüşen eşleşmeler
+
+    def labels(self, text: str) -> Set[str]:
+        """Metinde geçen tüm göstergelerin etiketleri"""
+        found = set()
+        for match in self.pattern.finditer(text):
+            found |= self.closure[match.group(1)]
+        return found
+
+
+class CoinClassifier:
+    """Sembol -> (sabit tür, filtre kategorileri) indeksi"""
+
+    def __init__(self):
+        self.type_priority = {name: index for index, (name, _) in enumerate(COIN_TYPE_INDICATORS)}
+        self.type_matcher = TokenMatcher(dict(COIN_TYPE_INDICATORS))
+        self.category_matcher = TokenMatcher(CATEGORY_INDICATORS)
+        self.logger = logging.getLogger(__name__)
+
+        self.index = {}  # sembol -> (tür veya None, kategori kümesi)
+        self.buckets = {}  # kategori -> semboller
+        self._lock = threading.Lock()
+
+    def classify(self, symbol: str) -> Tuple[Optional[str], FrozenSet[str]]:
+        """Sembolün fiyat/hacimden bağımsız türü ve filtre kategorileri (önbelleksiz)"""
+        if symbol in MAJOR_COINS:
+            coin_type = "Major Coin"
+        elif symbol in STABLECOINS:
+            coin_type = "Stablecoin"
+        else:
+            matched = self.type_matcher.labels(symbol)
+            coin_type = min(matched, key=self.type_priority.get) if matched else None
+
+        categories = self.category_matcher.labels(symbol)
+        if 'MAJOR' not in categories:
+            categories.add('ALTCOIN')
+        return coin_type, frozenset(categories)
+
+    def entry(self, symbol: str) -> Tuple[Optional[str], FrozenSet[str]]:
+        """İndeksteki kayıt; evrende olmayan semboller ilk kullanımda eklenir"""
+        entry = self.index.get(symbol)
+        if entry is None:
+            entry = self.classify(symbol)
+            with self._lock:
+                self._add(symbol, entry)
+        return entry
+
+    def build(self, symbols: Dict[str, Dict]) -> int:
+        """Sembol evrenini tek geçişte sınıflandırır.
+
+        Evren kayıtlarında önceki sınıflandırma varsa yeniden hesaplanmaz; yeni
+        hesaplananlar kayda yazılır ve evrenle birlikte diske kaydedilir.
+        Yeni hesaplanan sembol sayısını döndürür.
+        """
+        computed = 0
+        index, buckets = {}, {}
+        for symbol, info in symbols.items():
+            if info.get('coin_categories') is not None:
+                entry = (info.get('coin_type'), frozenset(info['coin_categories']))
+            else:
+                entry = self.classify(symbol)
+                info['coin_type'] = entry[0]
+                info['coin_categories'] = sorted(entry[1])
+                computed += 1
+            index[symbol] = entry
+            for category in entry[1]:
+                buckets.setdefault(category, set()).add(symbol)
+
+        with self._lock:
+            self.index, self.buckets = index, buckets
+        self.logger.info(f"Coin sınıflandırma indeksi: {len(index)} sembol, {computed} yeni hesaplandı")
+        return computed
+
+    def _add(self, symbol: str, entry: Tuple[Optional[str], FrozenSet[str]]):
+        self.index[symbol] = entry
+        for category in entry[1]:
+            self.buckets.setdefault(category, set()).add(symbol)
+
+    def coin_type(self, symbol: str) -> Optional[str]:
+        """Sembolün fiyat/hacimden bağımsız türü (yoksa None)"""
+        return self.entry(symbol)[0]
+
+    def in_category(self, symbol: str, category: str, volume: float = 0.0) -> bool:
+        """Sembol filtre kategorisine giriyor mu"""
+        if category == "ALL":
+            return True
+        if category == "MICRO_CAP":
+            return volume < MICRO_CAP_VOLUME
+        if symbol not in self.index:
+            self.entry(symbol)  # Evrende olmayan sembol kovalara eklenir
+        return symbol in self.buckets.get(category, ())
+
+    def filter(self, opportunities: List[Dict], category: str) -> List[Dict]:
+        """Fırsatları kategori kovasına göre süzer"""
+        if category == "ALL":
+            return opportunities
+        return [opp for opp in opportunities
+                if self.in_category(opp['symbol'], category, opp.get('volume_24h', 0))]
+
+    def counts(self) -> Dict[str, int]:
+        """Kategori başına sembol sayısı"""
+        return {category: len(symbols) for category, symbols in self.buckets.items()}
+
+
+# Süreç genelinde paylaşılan indeks (sembol evreni yüklendiğinde doldurulur)
+coin_classifier = CoinClassifier()
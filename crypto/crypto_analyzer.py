@@ -14,8 +14,22 @@ from typing import Dict, List, Optional, Tuple
 import json
 import os
 
+from utils.ttl_cache import TTLCache
+
+from .fetcher import ConcurrentFetcher
+from .rate_limiter import binance_limiter
+from .candle_buffer import CandleBuffer
+from .candle_store import CandleStore
+from .candles import Candles, KLINE_COLUMNS, KLINES_PAGE_LIMIT
+from .scan_session import ScanSession
+from .kline_stream import KlineStream, BINANCE_STREAM_URL
+from .symbol_universe import SymbolUniverse
+from .parallel_scan import ShardedScanner
+from .resample import can_resample, resample_candles, base_candles_needed
+from .indicator_panel import SCORING_PARAMS
+
 class CryptoAnalyzer:
-    def __init__(self):
+    def __init__(self, max_workers: int = 10, request_timeout: float = 10.0, data_dir: Optional[str] = "data"):
         self.base_url = "https://api.binance.com/api/v3"
         self.exchange_info_url = f"{self.base_url}/exchangeInfo"
         self.klines_url = f"{self.base_url}/klines"
@@ -25,28 +39,64 @@ class CryptoAnalyzer:
         self.min_volume_usdt = 1000000  # Minimum 1M USDT hacim
         self.min_price_change = 2.0  # Minimum %2 değişim
         self.opportunity_threshold = 5.0  # %5 düşüş fırsat eşiği
+        self.scoring_params = dict(SCORING_PARAMS)  # RSI ve tavsiye kademe eşikleri (parametre taramasıyla ayarlanabilir)
+        
+        # Ön filtre parametreleri
+        self.stablecoin_bases = ['USDC', 'BUSD', 'DAI', 'TUSD', 'FDUSD', 'USDP', 'PAX', 'FRAX', 'USDD', 'PYUSD']
+        self.prefilter_volume_slack = 0.8  # Ticker hacmi mum toplamından biraz farklı olabilir
+        self.max_scan_pairs = None  # None: tüm USDT evreni taranır
+        
+        # Cache için (süre ve boyut sınırlı LRU; her kayıt bir DataFrame tutar)
+        self.cache = TTLCache(ttl=60, max_entries=512, max_bytes=64 * 1024 * 1024)  # 60 saniye cache
+        
+        # Üç skorlayıcının paylaştığı tarama oturumu
+        self.scan_session = None
+        self.scan_session_duration = 300  # 5 dakika boyunca sekmeler aynı taramayı kullanır
+        self.use_panel_scoring = True  # Tarama skorlaması N x T dizilerle tek seferde yapılır
+        self.scan_processes = None  # None/1: tek süreç; >1: evren süreç havuzunda parçalı skorlanır
+        self.sharded_scan_min_symbols = 200  # Bundan küçük evrenlerde süreç açma maliyeti kazancı aşar
+        self.sharded_scanner = None
+        
+        # (sembol, aralık) -> CandleBuffer; yenilemede yalnızca yeni mumlar eklenir
+        self.candle_buffers = {}
+        
+        # İndirilen mumlar diskte saklanır; yeniden başlatmada tamponlar buradan doldurulur
+        # data_dir=None: mum deposu ve sembol anlık görüntüsü diske yazılmaz (yalnızca bellek)
+        self.candle_store = CandleStore(data_dir=data_dir) if data_dir is not None else None
+        
+        # Çoklu zaman dilimi: 4h/1d/1w mumları tek taban aralıktan yerelde türetilir
+        self.resample_base_interval = "1h"  # None: her aralık ayrı istenir
+        self.max_resample_base_candles = 1000  # Binance /klines tek istek sınırı
+        self.derived_candles = TTLCache(ttl=None, max_entries=512)  # (sembol, aralık, limit) -> (sürüm, Candles)
+        
+        # Canlı WebSocket akışı (start_stream ile başlatılır)
+        self.kline_stream = None
         
-        # Cache için
-        self.cache = {}
-        self.cache_duration = 60  # 60 saniye cache
+        # Eşzamanlı veri çekme (eşzamanlılık sınırı ve istek başına timeout)
+        # Tüm analizörler süreç genelindeki Binance ağırlık bütçesini paylaşır
+        self.fetcher = ConcurrentFetcher(max_workers=max_workers, timeout=request_timeout, limiter=binance_limiter)
+        
+        # İşlem çifti evreni diskte saklanır; soğuk başlangıçta /exchangeInfo beklenmez
+        self.symbol_universe = SymbolUniverse(self.fetcher, self.exchange_info_url, data_dir=data_dir)
         
         # Logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def cache_duration(self) -> float:
+        """Coin verisi önbellek süresi (saniye)"""
+        return self.cache.ttl
+    
+    @cache_duration.setter
+    def cache_duration(self, seconds: float):
+        self.cache.ttl = seconds
+    
     def get_all_usdt_pairs(self) -> List[str]:
         """Binance'deki tüm USDT çiftlerini getirir"""
         try:
-            response = requests.get(self.exchange_info_url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            usdt_pairs = []
-            
-            for symbol_info in data['symbols']:
-                symbol = symbol_info['symbol']
-                if symbol.endswith('USDT') and symbol_info['status'] == 'TRADING':
-                    usdt_pairs.append(symbol)
+            # Diskteki anlık görüntüden; süresi dolmuşsa arka planda yenilenir
+            usdt_pairs = self.symbol_universe.get_symbols(quote_asset='USDT', status='TRADING')
             
             self.logger.info(f"Toplam {len(usdt_pairs)} USDT çifti bulundu")
             return usdt_pairs
@@ -55,51 +105,118 @@ class CryptoAnalyzer:
             self.logger.error(f"USDT çiftleri alınırken hata: {e}")
             return []
     
+    def get_all_tickers(self) -> pd.DataFrame:
+        """Tüm semboller için 24 saatlik ticker verisini tek istekte getirir"""
+        try:
+            # Canlı akış güncel mini ticker verisi tutuyorsa ağ isteği yapılmaz
+            if self.kline_stream is not None:
+                streamed = self.kline_stream.ticker_frame()
+                if streamed is not None:
+                    return streamed
+            
+            data = self.fetcher.get_json(self.ticker_url)
+            
+            if not data:
+                return pd.DataFrame()
+            
+            tickers = pd.DataFrame(data, columns=['symbol', 'lastPrice', 'priceChangePercent', 'quoteVolume'])
+            tickers.columns = ['symbol', 'last_price', 'price_change_percent', 'quote_volume']
+            
+            numeric_columns = ['last_price', 'price_change_percent', 'quote_volume']
+            tickers[numeric_columns] = tickers[numeric_columns].apply(pd.to_numeric, errors='coerce')
+            
+            return tickers
+            
+        except Exception as e:
+            self.logger.error(f"Toplu ticker verisi alınırken hata: {e}")
+            return pd.DataFrame()
+    
+    def prefilter_pairs(self, symbols: List[str], min_volume: Optional[float] = None,
+                        min_abs_change: Optional[float] = None, exclude_stablecoins: bool = True,
+                        tickers: Optional[pd.DataFrame] = None) -> List[str]:
+        """Toplu ticker verisiyle mum verisi çekilecek sembolleri ön filtreler (hacme göre sıralı).
+        
+        `tickers` verilirse (aynı anlık görüntüyle birden çok filtre için) yeniden istenmez.
+        """
+        if tickers is None:
+            tickers = self.get_all_tickers()
+        
+        if tickers.empty:
+            # Ticker alınamazsa ön filtre uygulanmaz
+            self.logger.warning("Ticker verisi alınamadı, ön filtre atlanıyor")
+            pairs = list(symbols)
+            return pairs[:self.max_scan_pairs] if self.max_scan_pairs else pairs
+        
+        tickers = tickers[tickers['symbol'].isin(symbols)]
+        mask = np.ones(len(tickers), dtype=bool)
+        
+        # Hacim filtresi (skorlayıcı kesin kontrolü mum verisiyle ayrıca yapar)
+        if min_volume is not None:
+            mask &= tickers['quote_volume'].to_numpy() >= min_volume * self.prefilter_volume_slack
+        
+        # Fiyat değişimi filtresi
+        if min_abs_change is not None:
+            mask &= np.abs(tickers['price_change_percent'].to_numpy()) >= min_abs_change
+        
+        # Stablecoin filtresi
+        if exclude_stablecoins:
+            bases = tickers['symbol'].str[:-len('USDT')]
+            mask &= ~bases.isin(self.stablecoin_bases).to_numpy()
+        
+        survivors = tickers[mask].sort_values('quote_volume', ascending=False)
+        pairs = survivors['symbol'].tolist()
+        
+        if self.max_scan_pairs:
+            pairs = pairs[:self.max_scan_pairs]
+        
+        self.logger.info(f"Ön filtre: {len(symbols)} çiftten {len(pairs)} tanesi mum verisi için seçildi")
+        return pairs
+    
     def get_coin_data(self, symbol: str, interval: str = "1h", limit: int = 168) -> Optional[Dict]:
         """Belirli bir coinin verilerini çeker (son 7 gün - 168 saat)"""
         try:
-            # Cache kontrolü
             cache_key = f"{symbol}_{interval}_{limit}"
-            if cache_key in self.cache:
-                cache_time, cache_data = self.cache[cache_key]
-                if (datetime.now() - cache_time).seconds < self.cache_duration:
-                    return cache_data
             
-            url = f"{self.klines_url}?symbol={symbol}&interval={interval}&limit={limit}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            # Büyük aralıklar taban aralığın tamponundan türetilir
+            source_interval, source_limit = self._source_interval(interval, limit)
             
-            data = response.json()
+            if self.kline_stream is not None and self.kline_stream.is_live(symbol, source_interval, source_limit):
+                # Canlı akış tamponu güncel tutuyor, ağ isteği gerekmez
+                buffer = self.candle_buffers[(symbol, source_interval)]
+            else:
+                # Cache kontrolü
+                cache_data = self.cache.get(cache_key)
+                if cache_data is not None:
+                    return cache_data
+                
+                buffer = self.candle_buffers.get((symbol, source_interval))
+                if not self._buffer_is_fresh(buffer, source_limit):
+                    # Mum tamponunu yenile (yalnızca yeni mumlar çekilir)
+                    buffer = self._refresh_candle_buffer(symbol, source_interval, source_limit)
             
-            if not data:
+            if len(buffer) == 0:
                 return None
             
-            # Veriyi DataFrame'e çevir
-            df = pd.DataFrame(data, columns=[
-                'open_time', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume', 'number_of_trades',
-                'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-            ])
-            
-            # Veri tiplerini düzelt
-            numeric_columns = ['open', 'high', 'low', 'close', 'volume', 'quote_asset_volume']
-            for col in numeric_columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
-            df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+            # Kompakt mum dizisi; DataFrame yalnızca grafik için istenirse oluşturulur
+            if source_interval == interval:
+                candles = buffer.to_candles(limit)
+            else:
+                candles = self._derived(symbol, interval, limit, buffer)
+                if candles.empty:
+                    return None
+            close = candles.close
             
             # Son fiyat bilgileri
-            current_price = float(df['close'].iloc[-1])
-            price_24h_ago = float(df['close'].iloc[-24]) if len(df) >= 24 else float(df['close'].iloc[0])
-            price_7d_ago = float(df['close'].iloc[0])
+            current_price = float(close[-1])
+            price_24h_ago = float(close[-24]) if len(close) >= 24 else float(close[0])
+            price_7d_ago = float(close[0])
             
             # Değişim hesaplamaları
             change_24h = ((current_price - price_24h_ago) / price_24h_ago) * 100
             change_7d = ((current_price - price_7d_ago) / price_7d_ago) * 100
             
             # Hacim bilgileri
-            volume_24h = float(df['quote_asset_volume'].iloc[-24:].sum()) if len(df) >= 24 else float(df['quote_asset_volume'].sum())
+            volume_24h = float(candles.quote_asset_volume[-24:].sum())
             
             # Sonuç verisi
             result = {
@@ -110,12 +227,12 @@ class CryptoAnalyzer:
                 'change_24h': change_24h,
                 'change_7d': change_7d,
                 'volume_24h': volume_24h,
-                'data': df,
+                'data': candles,
                 'last_updated': datetime.now().isoformat()
             }
             
             # Cache'e kaydet
-            self.cache[cache_key] = (datetime.now(), result)
+            self.cache.set(cache_key, result)
             
             return result
             
@@ -123,14 +240,156 @@ class CryptoAnalyzer:
             self.logger.error(f"{symbol} verisi alınırken hata: {e}")
             return None
     
+    def _source_interval(self, interval: str, limit: int) -> Tuple[str, int]:
+        """İstenen aralığın okunacağı tampon aralığı ve gereken mum sayısı"""
+        base = self.resample_base_interval
+        if base and can_resample(base, interval):
+            needed = base_candles_needed(base, interval, limit)
+            if needed <= self.max_resample_base_candles:
+                return base, needed
+        return interval, limit
+    
+    def _buffer_is_fresh(self, buffer: Optional[CandleBuffer], limit: int) -> bool:
+        """Tampon cache süresi içinde yenilendiyse ve istenen geçmişi kapsıyorsa True"""
+        if buffer is None or buffer.refreshed_at is None:
+            return False
+        if len(buffer) < limit and not buffer.history_exhausted:
+            return False
+        return time.monotonic() - buffer.refreshed_at < self.cache_duration
+    
+    def _derived(self, symbol: str, interval: str, limit: int, buffer: CandleBuffer):
+        """Taban tampondan türetilmiş mumlar; tampon değişmediyse önbellekten döner"""
+        key = (symbol, interval, limit)
+        with buffer.lock:
+            version = buffer.version
+            cached = self.derived_candles.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            base_candles = buffer.to_candles()
+        
+        candles = resample_candles(base_candles, self.resample_base_interval, interval, limit)
+        self.derived_candles.set(key, (version, candles))
+        return candles
+    
+    def _refresh_candle_buffer(self, symbol: str, interval: str, limit: int) -> CandleBuffer:
+        """Sembolün mum tamponunu artımlı olarak günceller"""
+        buffer_key = (symbol, interval)
+        buffer = self.candle_buffers.get(buffer_key)
+        
+        if buffer is None:
+            buffer = self.candle_buffers.setdefault(buffer_key, CandleBuffer(limit))
+        elif buffer.capacity < limit:
+            buffer.resize(limit)
+            buffer.history_exhausted = False
+        
+        if len(buffer) == 0 and self.candle_store is not None:
+            # Soğuk başlangıç: yerel geçmiş yeterliyse yalnızca son saklanan mumdan sonrası çekilir
+            self._preload_buffer(symbol, interval, limit, buffer)
+
+        params = {'symbol': symbol, 'interval': interval, 'limit': limit}
+        
+        # Tampon istenen geçmişi kapsıyorsa yalnızca son (açık) mumdan itibaren iste
+        incremental = len(buffer) >= limit or (buffer.history_exhausted and len(buffer) > 0)
+        if incremental:
+            params['startTime'] = buffer.last_open_time
+        
+        data = self.fetcher.get_json(self.klines_url, params=params)
+        
+        if incremental and len(data) >= limit:
+            # Aradaki boşluk limitten büyük olabilir, tamamını yeniden çek
+            params.pop('startTime')
+            data = self.fetcher.get_json(self.klines_url, params=params)
+            incremental = False
+        
+        with buffer.lock:
+            if not incremental:
+                buffer.clear()
+                buffer.history_exhausted = len(data) < limit
+            
+            buffer.extend(data)
+            buffer.refreshed_at = time.monotonic()
+        
+        if self.candle_store is not None:
+            self.candle_store.write(symbol, interval, data)
+        return buffer
+    
+    def _preload_buffer(self, symbol: str, interval: str, limit: int, buffer: CandleBuffer):
+        """Boş tamponu yerel depodaki son `limit` mumla doldurur; aradaki eksikler önce tamamlanır"""
+        try:
+            stored = self.candle_store.read(symbol, interval, limit=limit)
+            if len(stored) < limit:
+                return  # Yetersiz geçmiş: normal tam çekim yapılır
+            
+            if self._backfill(symbol, interval, int(stored.open_time[0]), int(stored.open_time[-1])):
+                stored = self.candle_store.read(symbol, interval, limit=limit)
+            
+            with buffer.lock:
+                buffer.extend(list(np.column_stack([stored.array(name) for name in KLINE_COLUMNS])))
+        
+        except Exception as e:
+            self.logger.error(f"{symbol} yerel mum geçmişi yüklenirken hata: {e}")
+    
+    def _backfill(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> int:
+        """[start_ms, end_ms] içindeki eksik mumları çeker; çekilen mum sayısını döndürür"""
+        gaps = self.candle_store.gaps(symbol, interval, start_ms, end_ms)
+        fetched, complete = 0, True
+        for gap_start, gap_end in gaps:
+            rows = self._fetch_range(symbol, interval, gap_start, gap_end)
+            written = self.candle_store.write(symbol, interval, rows)
+            complete = complete and written == len(rows)
+            fetched += written
+        
+        if gaps and complete:
+            # Çekimden sonra hâlâ eksik olup son saklanan mumdan önce kalan aralıklar borsada boştur
+            bounds = self.candle_store.bounds(symbol, interval)
+            if bounds is not None:
+                remaining = self.candle_store.gaps(symbol, interval, start_ms, min(end_ms, bounds[1] - 1))
+                self.candle_store.mark_empty(symbol, interval, remaining)
+        return fetched
+    
+    def _fetch_range(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[list]:
+        """[start_ms, end_ms] aralığındaki mumları sayfa sayfa çeker"""
+        rows = []
+        while start_ms <= end_ms:
+            page = self.fetcher.get_json(self.klines_url, params={
+                'symbol': symbol, 'interval': interval, 'startTime': start_ms,
+                'endTime': end_ms, 'limit': KLINES_PAGE_LIMIT,
+            })
+            rows.extend(page)
+            if len(page) < KLINES_PAGE_LIMIT:
+                break
+            start_ms = int(page[-1][0]) + 1
+        return rows
+    
+    def load_history(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> Optional[Candles]:
+        """[start_ms, end_ms] aralığındaki mumları yerel depodan döndürür; yalnızca eksikler çekilir
+        
+        Geriye dönük test ve uzun periyotlu göstergeler (ör. SMA 200) bu yolu kullanır.
+        """
+        try:
+            bounds = self.candle_store.bounds(symbol, interval)
+            if bounds is not None and start_ms <= bounds[1] <= end_ms:
+                # Son saklanan mum açık olabilir; önce eksikler, sonra kuyruk o mumdan itibaren çekilir
+                self._backfill(symbol, interval, start_ms, bounds[1] - 1)
+                self.candle_store.write(symbol, interval, self._fetch_range(symbol, interval, bounds[1], end_ms))
+            else:
+                self._backfill(symbol, interval, start_ms, end_ms)
+            
+            candles = self.candle_store.read(symbol, interval, start=start_ms, end=end_ms)
+            return candles if not candles.empty else None
+        
+        except Exception as e:
+            self.logger.error(f"{symbol} geçmiş verisi alınırken hata: {e}")
+            return None
+    
+    def get_multiple_coin_data(self, symbols: List[str], interval: str = "1h", limit: int = 168) -> Dict[str, Dict]:
+        """Birden fazla coinin verilerini paralel çeker (sembol -> coin_data)"""
+        return self.fetcher.map(symbols, lambda symbol: self.get_coin_data(symbol, interval, limit))
+    
     def get_ticker_info(self, symbol: str) -> Optional[Dict]:
         """Coin'in 24 saatlik ticker bilgilerini getirir"""
         try:
-            url = f"{self.ticker_url}?symbol={symbol}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self.fetcher.get_json(self.ticker_url, params={'symbol': symbol})
             
             return {
                 'symbol': data['symbol'],
@@ -213,7 +472,7 @@ class CryptoAnalyzer:
         
         # 6. Teknik göstergeler
         rsi = self.calculate_rsi(df['close'])
-        if rsi < 30:
+        if rsi < self.scoring_params['rsi_oversold_opportunity']:
             opportunity_score += 15  # Aşırı satım
             opportunity_type += " + Aşırı Satım"
         
@@ -269,10 +528,10 @@ class CryptoAnalyzer:
             reasoning.append(f"Güçlü 24 saat artış: %{change_24h:.1f}")
         
         # 3. RSI aşırı satım durumu (düşüşten sonra toparlanma sinyali)
-        if rsi < 25:
+        if rsi < self.scoring_params['rsi_oversold_24h']:
             profit_score += 25
             reasoning.append(f"RSI aşırı satım: {rsi:.1f} - güçlü toparlanma sinyali")
-        elif rsi < 35:
+        elif rsi < self.scoring_params['rsi_low_24h']:
             profit_score += 15
             reasoning.append(f"RSI düşük: {rsi:.1f} - toparlanma potansiyeli")
         
@@ -337,16 +596,17 @@ class CryptoAnalyzer:
                     reasoning.append("Bollinger alt bandında - yükseliş potansiyeli")
         
         # Tavsiye belirleme
-        if profit_score >= 70:
+        tiers = self.scoring_params['profit_tiers']  # Varsayılan: 70 / 50 / 30 / 15
+        if profit_score >= tiers[0]:
             recommendation = "KESİNLİKLE AL"
             confidence = "Çok Yüksek"
-        elif profit_score >= 50:
+        elif profit_score >= tiers[1]:
             recommendation = "GÜÇLÜ AL"
             confidence = "Yüksek"
-        elif profit_score >= 30:
+        elif profit_score >= tiers[2]:
             recommendation = "AL"
             confidence = "Orta"
-        elif profit_score >= 15:
+        elif profit_score >= tiers[3]:
             recommendation = "İZLE"
             confidence = "Düşük"
         else:
@@ -355,7 +615,7 @@ class CryptoAnalyzer:
         
         # 24 saatlik hedef fiyat tahmini
         target_price = current_price
-        if profit_score >= 30:
+        if profit_score >= tiers[2]:
             # Düşüşten sonra toparlanma için %5-25 artış
             potential_gain = min(profit_score / 3, 25)  # Maksimum %25
             target_price = current_price * (1 + potential_gain / 100)
@@ -380,45 +640,12 @@ class CryptoAnalyzer:
     def find_24h_profit_opportunities(self, min_score: float = 20.0, max_results: int = 20) -> List[Dict]:
         """24 saatlik kazanç potansiyeli olan coinleri bulur"""
         try:
-            # Tüm USDT çiftlerini al
-            usdt_pairs = self.get_all_usdt_pairs()
-            
-            if not usdt_pairs:
-                return []
-            
-            profit_opportunities = []
-            
-            # İlk 100 coin'i analiz et
-            pairs_to_analyze = usdt_pairs[:100]
-            
-            self.logger.info(f"{len(pairs_to_analyze)} coin 24 saatlik kazanç potansiyeli için analiz ediliyor...")
-            
-            for i, symbol in enumerate(pairs_to_analyze):
-                try:
-                    # Rate limiting
-                    if i % 10 == 0 and i > 0:
-                        time.sleep(0.5)
-                    
-                    # Coin verisini al
-                    coin_data = self.get_coin_data(symbol)
-                    
-                    if coin_data:
-                        # 24 saatlik kazanç potansiyeli analizi
-                        profit_analysis = self.analyze_24h_profit_potential(coin_data)
-                        
-                        if profit_analysis and profit_analysis.get('profit_score', 0) >= min_score:
-                            profit_opportunities.append(profit_analysis)
-                    
-                except Exception as e:
-                    self.logger.error(f"{symbol} 24 saatlik analiz edilirken hata: {e}")
-                    continue
-            
-            # Skora göre sırala
-            profit_opportunities.sort(key=lambda x: x.get('profit_score', 0), reverse=True)
+            # Paylaşılan tarama oturumundan al (güncel değilse evren yeniden taranır)
+            profit_opportunities = self.get_scan_session().get_24h_profit_opportunities(min_score, max_results)
             
             self.logger.info(f"{len(profit_opportunities)} 24 saatlik kazanç fırsatı bulundu")
             
-            return profit_opportunities[:max_results]
+            return profit_opportunities
             
         except Exception as e:
             self.logger.error(f"24 saatlik kazanç fırsatı arama hatası: {e}")
@@ -492,11 +719,11 @@ class CryptoAnalyzer:
         
         # 4. RSI analizi
         rsi = self.calculate_rsi(df['close'])
-        if rsi < 30:  # Aşırı satım bölgesi
+        if rsi < self.scoring_params['rsi_oversold_1h']:  # Aşırı satım bölgesi
             opportunity_score += 20
             opportunity_type = "Aşırı Satım Fırsatı"
             recommendation = "ACİL AL"
-        elif rsi < 40:
+        elif rsi < self.scoring_params['rsi_low_1h']:
             opportunity_score += 10
             opportunity_type = "Satım Bölgesi Fırsatı"
             recommendation = "HIZLI AL"
@@ -531,45 +758,12 @@ class CryptoAnalyzer:
     def find_1h_profit_opportunities(self, min_score: float = 35.0, max_results: int = 15) -> List[Dict]:
         """1 saatlik kazanç potansiyeli olan coinleri bulur"""
         try:
-            # Tüm USDT çiftlerini al
-            usdt_pairs = self.get_all_usdt_pairs()
-            
-            if not usdt_pairs:
-                return []
-            
-            profit_opportunities = []
-            
-            # İlk 100 coin'i analiz et
-            pairs_to_analyze = usdt_pairs[:100]
-            
-            self.logger.info(f"{len(pairs_to_analyze)} coin 1 saatlik kazanç potansiyeli için analiz ediliyor...")
-            
-            for i, symbol in enumerate(pairs_to_analyze):
-                try:
-                    # Rate limiting
-                    if i % 10 == 0 and i > 0:
-                        time.sleep(0.5)
-                    
-                    # Coin verisini al
-                    coin_data = self.get_coin_data(symbol)
-                    
-                    if coin_data:
-                        # 1 saatlik kazanç potansiyeli analizi
-                        profit_analysis = self.analyze_1h_profit_potential(coin_data)
-                        
-                        if profit_analysis and profit_analysis.get('opportunity_score', 0) >= min_score:
-                            profit_opportunities.append(profit_analysis)
-                    
-                except Exception as e:
-                    self.logger.error(f"{symbol} 1 saatlik analiz edilirken hata: {e}")
-                    continue
-            
-            # Skora göre sırala
-            profit_opportunities.sort(key=lambda x: x.get('opportunity_score', 0), reverse=True)
+            # Paylaşılan tarama oturumundan al (güncel değilse evren yeniden taranır)
+            profit_opportunities = self.get_scan_session().get_1h_profit_opportunities(min_score, max_results)
             
             self.logger.info(f"{len(profit_opportunities)} 1 saatlik kazanç fırsatı bulundu")
             
-            return profit_opportunities[:max_results]
+            return profit_opportunities
             
         except Exception as e:
             self.logger.error(f"1 saatlik kazanç fırsatı arama hatası: {e}")
@@ -611,48 +805,53 @@ class CryptoAnalyzer:
         except:
             return 50.0  # Varsayılan değer
     
+    def get_scan_session(self, force_refresh: bool = False) -> ScanSession:
+        """Güncel tarama oturumunu döndürür; süresi dolmuşsa evreni bir kez yeniden tarar"""
+        if force_refresh or self.scan_session is None or self.scan_session.age >= self.scan_session_duration:
+            session = ScanSession(self)
+            session.run()
+            self.scan_session = session
+        return self.scan_session
+    
+    def get_sharded_scanner(self, symbol_count: int) -> Optional[ShardedScanner]:
+        """Süreç havuzlu tarama açıksa ve evren yeterince büyükse tarayıcıyı döndürür"""
+        if not self.scan_processes or self.scan_processes <= 1 or symbol_count < self.sharded_scan_min_symbols:
+            return None
+        
+        if self.sharded_scanner is None or self.sharded_scanner.max_processes != self.scan_processes:
+            if self.sharded_scanner is not None:
+                self.sharded_scanner.shutdown()
+            self.sharded_scanner = ShardedScanner(max_processes=self.scan_processes)
+        return self.sharded_scanner
+    
+    def start_stream(self, symbols: Optional[List[str]] = None, interval: str = "1h", limit: int = 168,
+                     url: str = BINANCE_STREAM_URL, **kwargs) -> KlineStream:
+        """Canlı kline/miniTicker akışını başlatır; tamponlar sürekli güncel tutulur"""
+        if self.kline_stream is not None:
+            self.stop_stream()
+        
+        if symbols is None:
+            symbols = self.prefilter_pairs(self.get_all_usdt_pairs())
+        
+        self.kline_stream = KlineStream(self, symbols, interval=interval, limit=limit, url=url, **kwargs)
+        self.kline_stream.start()
+        return self.kline_stream
+    
+    def stop_stream(self):
+        """Canlı akışı durdurur; sonraki istekler yeniden REST ile yapılır"""
+        if self.kline_stream is not None:
+            self.kline_stream.stop()
+            self.kline_stream = None
+    
     def find_opportunities(self, min_score: float = 10.0, max_results: int = 20) -> List[Dict]:
         """Fırsat coinlerini bulur"""
         try:
-            # Tüm USDT çiftlerini al
-            usdt_pairs = self.get_all_usdt_pairs()
-            
-            if not usdt_pairs:
-                return []
-            
-            opportunities = []
-            
-            # İlk 100 coin'i analiz et (performans için)
-            pairs_to_analyze = usdt_pairs[:100]
-            
-            self.logger.info(f"{len(pairs_to_analyze)} coin analiz ediliyor...")
-            
-            for i, symbol in enumerate(pairs_to_analyze):
-                try:
-                    # Rate limiting
-                    if i % 10 == 0 and i > 0:
-                        time.sleep(0.5)
-                    
-                    # Coin verisini al
-                    coin_data = self.get_coin_data(symbol)
-                    
-                    if coin_data:
-                        # Fırsat analizi yap
-                        opportunity = self.analyze_coin_opportunity(coin_data)
-                        
-                        if opportunity and opportunity.get('opportunity_score', 0) >= min_score:
-                            opportunities.append(opportunity)
-                    
-                except Exception as e:
-                    self.logger.error(f"{symbol} analiz edilirken hata: {e}")
-                    continue
-            
-            # Skora göre sırala
-            opportunities.sort(key=lambda x: x.get('opportunity_score', 0), reverse=True)
+            # Paylaşılan tarama oturumundan al (güncel değilse evren yeniden taranır)
+            opportunities = self.get_scan_session().get_opportunities(min_score, max_results)
             
             self.logger.info(f"{len(opportunities)} fırsat bulundu")
             
-            return opportunities[:max_results]
+            return opportunities
             
         except Exception as e:
             self.logger.error(f"Fırsat arama hatası: {e}")
@@ -703,7 +902,7 @@ class CryptoAnalyzer:
         try:
             coin_data = self.get_coin_data(symbol, interval, limit)
             if coin_data and 'data' in coin_data:
-                return coin_data['data']
+                return coin_data['data'].to_dataframe()
             return None
         except Exception as e:
             self.logger.error(f"{symbol} grafik verisi alınırken hata: {e}")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Eşzamanlı Veri Çekme Modülü
+Çok sayıda sembol için HTTP isteklerini sınırlı eşzamanlılıkla paralel yürütür
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import RequestWeightLimiter, endpoint_weight
+
+
+class ConcurrentFetcher:
+    """Sembol listesini sınırlı sayıda iş parçacığıyla paralel işler"""
+
+    def __init__(self, max_workers: int = 10, timeout: float = 10.0,
+                 limiter: Optional[RequestWeightLimiter] = None, max_retries: int = 3):
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+        self.limiter = limiter  # None: ağırlık sınırı uygulanmaz
+        self.max_retries = max_retries  # 429/418 yanıtlarında sınırlayıcının beklemesinden sonra tekrar
+        self.logger = logging.getLogger(__name__)
+
+        # Bağlantı havuzu eşzamanlılık sınırı kadar büyük olmalı, aksi halde
+        # fazla iş parçacıkları bağlantı bekler ve paralellik kaybolur
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get_json(self, url: str, params: Optional[Dict] = None) -> Any:
+        """Tek bir GET isteği yapar ve JSON yanıtı döndürür (istek başına timeout ile)"""
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire(endpoint_weight(url, params))
+
+            response = self.session.get(url, params=params, timeout=self.timeout)
+
+            if self.limiter is not None:
+                self.limiter.observe(response.status_code, response.headers)
+                if response.status_code in (418, 429) and attempt < self.max_retries:
+                    continue  # Sınırlayıcı bir sonraki acquire'da Retry-After kadar bekletir
+
+            response.raise_for_status()
+            return response.json()
+
+    def map(self, symbols: List[str], func: Callable[[str], Any]) -> Dict[str, Any]:
+        """func(symbol) çağrılarını paralel yürütür, None olmayan sonuçları giriş sırasıyla döndürür"""
+        if not symbols:
+            return {}
+
+        results = {}
+        workers = min(self.max_workers, len(symbols))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(func, symbol): symbol for symbol in symbols}
+
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.logger.error(f"{symbol} paralel çekim sırasında hata: {e}")
+                    continue
+
+                if result is not None:
+                    results[symbol] = result
+
+        # Sonuçları giriş sırasına göre döndür
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
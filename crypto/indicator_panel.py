@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+Kesitsel Gösterge Paneli
+N sembol x T mum verisini 2 boyutlu NumPy dizilerinde tutar; göstergeleri ve
+skorlama kurallarını tüm semboller için tek seferde dizi maskeleriyle hesaplar
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 24 saatlik kazanç tavsiye kademeleri (eşik, tavsiye, güven)
+PROFIT_TIERS = [
+    (70, "KESİNLİKLE AL", "Çok Yüksek"),
+    (50, "GÜÇLÜ AL", "Yüksek"),
+    (30, "AL", "Orta"),
+    (15, "İZLE", "Düşük"),
+]
+PROFIT_DEFAULT_TIER = ("BEKLE", "Yok")
+
+# Skorlayıcı eşikleri; CryptoAnalyzer.scoring_params ve parametre taraması bu anahtarları kullanır
+SCORING_PARAMS = {
+    'rsi_oversold_24h': 25,          # 24h: güçlü aşırı satım
+    'rsi_low_24h': 35,               # 24h: düşük RSI
+    'rsi_oversold_1h': 30,           # 1h: aşırı satım
+    'rsi_low_1h': 40,                # 1h: satım bölgesi
+    'rsi_oversold_opportunity': 30,  # Fırsat skorlayıcısı: aşırı satım
+    'profit_tiers': tuple(tier[0] for tier in PROFIT_TIERS),  # 24h tavsiye kademe eşikleri
+}
+
+
+def scoring_params(params: Optional[Dict] = None) -> Dict:
+    """Varsayılan eşiklerin üzerine verilen değerleri yazar"""
+    return {**SCORING_PARAMS, **(params or {})}
+
+# 1 saatlik skorlayıcının tür ve tavsiye etiketleri (score_1h_features kodlarıyla indekslenir)
+ONE_HOUR_TYPES = np.array(["Nötr", "1h Düşüş Fırsatı", "4h Aşırı Düşüş Fırsatı", "4h Düşüş Fırsatı",
+                           "Aşırı Satım Fırsatı", "Satım Bölgesi Fırsatı", "Hacim Artışı Fırsatı",
+                           "Düşük Fiyat Fırsatı"], dtype=object)
+ONE_HOUR_RECOMMENDATIONS = np.array(["Bekle", "ACİL AL", "HIZLI AL", "AL"], dtype=object)
+
+# Fırsat skorlayıcısının tür ve tavsiye etiketleri (score_opportunity_features kodlarıyla indekslenir)
+OPPORTUNITY_TYPES = np.array(["Nötr", "Düşüş Fırsatı", "Toparlanma Fırsatı", "Aşırı Düşüş Fırsatı"], dtype=object)
+OPPORTUNITY_RECOMMENDATIONS = np.array(["Bekle", "Alım Fırsatı", "Güçlü Alım"], dtype=object)
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Son eksen boyunca pandas ewm(span=span, adjust=True).mean() karşılığı"""
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+
+    result = np.empty_like(values, dtype=np.float64)
+    weighted = values[..., 0].astype(np.float64)
+    result[..., 0] = weighted
+    old_weight = 1.0
+
+    # Ağırlık tüm semboller için aynı olduğundan döngü yalnızca zaman ekseninde
+    for t in range(1, values.shape[-1]):
+        current = values[..., t]
+        old_weight *= decay
+        # pandas gibi sabit serilerde sayısal hatayı önlemek için eşit değerler güncellenmez
+        weighted = np.where(weighted != current, (old_weight * weighted + current) / (old_weight + 1.0), weighted)
+        old_weight += 1.0
+        result[..., t] = weighted
+
+    return result
+
+
+def recommendation_tiers(profit_score: np.ndarray, thresholds: Optional[Tuple] = None) -> np.ndarray:
+    """Skorları PROFIT_TIERS indekslerine çevirir (len(PROFIT_TIERS) = varsayılan kademe)"""
+    thresholds = thresholds or SCORING_PARAMS['profit_tiers']
+    tiers = np.full(np.shape(profit_score), len(PROFIT_TIERS), dtype=np.int64)
+    for index in range(len(PROFIT_TIERS) - 1, -1, -1):
+        tiers = np.where(profit_score >= thresholds[index], index, tiers)
+    return tiers
+
+
+def score_opportunity_features(features: Dict[str, np.ndarray], opportunity_threshold: float,
+                               params: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """analyze_coin_opportunity kurallarını herhangi bir biçimdeki özellik dizilerine uygular.
+
+    Tür ve tavsiye, OPPORTUNITY_TYPES / OPPORTUNITY_RECOMMENDATIONS indeksleri olarak döner
+    (hacim eşiği kontrolü çağırana bırakılır).
+    """
+    params = scoring_params(params)
+    change_7d = features['change_7d']
+    change_24h = features['change_24h']
+
+    shape = np.shape(change_7d)
+    score = np.zeros(shape, dtype=np.float64)
+    type_code = np.zeros(shape, dtype=np.int64)
+    rec_code = np.zeros(shape, dtype=np.int64)
+
+    drop = change_7d < -opportunity_threshold
+    score += np.where(drop, np.abs(change_7d) * 2, 0)
+    type_code = np.where(drop, 1, type_code)
+    rec_code = np.where(drop, 1, rec_code)
+
+    recovery = (change_24h > 0) & (change_7d < 0)
+    score += np.where(recovery, change_24h * 1.5, 0)
+    type_code = np.where(recovery, 2, type_code)
+    rec_code = np.where(recovery, 1, rec_code)
+
+    extreme = change_7d < -20
+    score += np.where(extreme, 20, 0)
+    type_code = np.where(extreme, 3, type_code)
+    rec_code = np.where(extreme, 2, rec_code)
+
+    volume_spike = features['volume_increase'] > 50
+    score += np.where(volume_spike, 10, 0)
+
+    oversold = features['rsi'] < params['rsi_oversold_opportunity']
+    score += np.where(oversold, 15, 0)
+
+    return {'opportunity_score': score, 'type_code': type_code, 'rec_code': rec_code,
+            'volume_spike': volume_spike, 'oversold': oversold}
+
+
+def score_24h_features(features: Dict[str, np.ndarray], params: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """analyze_24h_profit_potential kurallarını herhangi bir biçimdeki özellik dizilerine uygular.
+
+    Koşulu sağlanamayan (NaN) özellikler kuralı tetiklemez. Hedef fiyat, skor "AL"
+    kademesine ulaştığında hesaplanır.
+    """
+    params = scoring_params(params)
+    change_7d = features['change_7d']
+    change_24h = features['change_24h']
+    rsi = features['rsi']
+    volume_increase = features['volume_increase']
+    current_price = features['current_price']
+
+    masks = {}
+    score = np.zeros(np.shape(change_7d), dtype=np.float64)
+
+    # 1. Uzun vadeli düşüş
+    masks['drop_10'] = change_7d < -10
+    masks['drop_5'] = ~masks['drop_10'] & (change_7d < -5)
+    score += np.where(masks['drop_10'], 25, np.where(masks['drop_5'], 15, 0))
+
+    # 2. Toparlanma başlangıcı
+    masks['recovery'] = (change_24h > 0) & (change_7d < 0)
+    masks['strong_24h'] = ~masks['recovery'] & (change_24h > 2)
+    score += np.where(masks['recovery'], 30, np.where(masks['strong_24h'], 20, 0))
+
+    # 3. RSI aşırı satım
+    masks['rsi_25'] = rsi < params['rsi_oversold_24h']
+    masks['rsi_35'] = ~masks['rsi_25'] & (rsi < params['rsi_low_24h'])
+    score += np.where(masks['rsi_25'], 25, np.where(masks['rsi_35'], 15, 0))
+
+    # 4. Hacim artışı
+    masks['volume_100'] = volume_increase > 100
+    masks['volume_50'] = ~masks['volume_100'] & (volume_increase > 50)
+    score += np.where(masks['volume_100'], 20, np.where(masks['volume_50'], 10, 0))
+
+    # 5. Momentum
+    masks['momentum'] = features['momentum'] > 3
+    score += np.where(masks['momentum'], 15, 0)
+
+    # 6. Destek seviyesi
+    masks['support'] = current_price <= features['support_level'] * 1.03
+    score += np.where(masks['support'], 10, 0)
+
+    # 7. Trend dönüşü
+    masks['trend'] = (current_price > features['sma_short']) & (features['sma_short'] > features['sma_long'])
+    score += np.where(masks['trend'], 15, 0)
+
+    # 8. Volatilite
+    masks['volatility'] = features['volatility'] > 8
+    score += np.where(masks['volatility'], 5, 0)
+
+    # 9. MACD kesişimi
+    masks['macd'] = features['macd_cross']
+    score += np.where(masks['macd'], 10, 0)
+
+    # 10. Bollinger alt bandı
+    masks['bollinger'] = features['bb_position'] < 0.2
+    score += np.where(masks['bollinger'], 10, 0)
+
+    # Hedef fiyat
+    buy = score >= params['profit_tiers'][2]
+    potential_gain = np.where(buy, np.minimum(score / 3, 25), 0.0)
+    target_price = np.where(buy, current_price * (1 + potential_gain / 100), current_price)
+
+    masks['profit_score'] = score
+    masks['tier'] = recommendation_tiers(score, params['profit_tiers'])
+    masks['target_price'] = target_price
+    return masks
+
+
+def score_1h_features(features: Dict[str, np.ndarray], params: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """analyze_1h_profit_potential kurallarını herhangi bir biçimdeki özellik dizilerine uygular.
+
+    Tür ve tavsiye, ONE_HOUR_TYPES / ONE_HOUR_RECOMMENDATIONS indeksleri olarak döner
+    (hacim eşiği kontrolü çağırana bırakılır).
+    """
+    params = scoring_params(params)
+    change_1h = features['change_1h']
+    change_4h = features['change_4h']
+    rsi = features['rsi']
+
+    shape = np.shape(change_1h)
+    score = np.zeros(shape, dtype=np.float64)
+    type_code = np.zeros(shape, dtype=np.int64)
+    rec_code = np.zeros(shape, dtype=np.int64)
+
+    def apply(mask, points, type_value, rec_value=None):
+        nonlocal score, type_code, rec_code
+        score = score + np.where(mask, points, 0)
+        type_code = np.where(mask, type_value, type_code)
+        if rec_value is not None:
+            rec_code = np.where(mask, rec_value, rec_code)
+
+    # 1 saatlik düşüş
+    drop_5 = change_1h < -5
+    drop_3 = ~drop_5 & (change_1h < -3)
+    drop_1 = ~drop_5 & ~drop_3 & (change_1h < -1)
+    apply(drop_5, np.abs(change_1h) * 3, 1, 1)
+    apply(drop_3, np.abs(change_1h) * 2, 1, 2)
+    apply(drop_1, np.abs(change_1h), 1, 3)
+
+    # 4 saatlik trend
+    drop_4h_10 = change_4h < -10
+    drop_4h_5 = ~drop_4h_10 & (change_4h < -5)
+    apply(drop_4h_10, 15, 2, 1)
+    apply(drop_4h_5, 10, 3, 2)
+
+    # RSI
+    rsi_30 = rsi < params['rsi_oversold_1h']
+    rsi_40 = ~rsi_30 & (rsi < params['rsi_low_1h'])
+    apply(rsi_30, 20, 4, 1)
+    apply(rsi_40, 10, 5, 2)
+
+    # Son saatte hacim artışı
+    apply(features['volume_spike'], 10, 6, 2)
+
+    # Düşük fiyat
+    apply(features['current_price'] < 0.01, 5, 7)
+
+    return {'opportunity_score': score, 'type_code': type_code, 'rec_code': rec_code}
+
+
+class IndicatorPanel:
+    """Aynı uzunlukta mum serisine sahip semboller için kesitsel gösterge motoru"""
+
+    def __init__(self, symbols: List[str], close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                 volume: np.ndarray, quote_volume: np.ndarray, current_price: np.ndarray,
+                 change_24h: np.ndarray, change_7d: np.ndarray, volume_24h: np.ndarray):
+        self.symbols = symbols
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.quote_volume = quote_volume
+        self.current_price = current_price
+        self.change_24h = change_24h
+        self.change_7d = change_7d
+        self.volume_24h = volume_24h
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @staticmethod
+    def partition(coin_data_map: Dict[str, Dict], min_length: int = 48) -> Tuple[List[str], List[str]]:
+        """Sembolleri panele girecekler ve tek tek skorlanacaklar olarak ayırır.
+
+        En yaygın seri uzunluğuna sahip semboller panele alınır; diğerleri
+        (yeni listelenmiş, kısa geçmişli coinler) tek tek skorlanmak üzere döndürülür.
+        """
+        lengths = {symbol: len(data['data']) for symbol, data in coin_data_map.items()}
+        candidates = [length for length in lengths.values() if length >= min_length]
+        panel_length = max(set(candidates), key=candidates.count) if candidates else None
+
+        symbols = [symbol for symbol, length in lengths.items() if length == panel_length]
+        selected = set(symbols)
+        fallback = [symbol for symbol in coin_data_map if symbol not in selected]
+        return symbols, fallback
+
+    @classmethod
+    def from_coin_data(cls, coin_data_map: Dict[str, Dict], min_length: int = 48) -> Tuple['IndicatorPanel', List[str]]:
+        """coin_data sözlüklerinden panel kurar; panele girmeyen sembolleri ayrıca döndürür"""
+        symbols, fallback = cls.partition(coin_data_map, min_length)
+
+        def stack(column):
+            if not symbols:
+                return np.empty((0, 0))
+            return np.vstack([coin_data_map[s]['data'].array(column) for s in symbols])
+
+        def scalars(key):
+            return np.array([coin_data_map[s][key] for s in symbols], dtype=np.float64)
+
+        panel = cls(
+            symbols=symbols,
+            close=stack('close'),
+            high=stack('high'),
+            low=stack('low'),
+            volume=stack('volume'),
+            quote_volume=stack('quote_asset_volume'),
+            current_price=scalars('current_price'),
+            change_24h=scalars('change_24h'),
+            change_7d=scalars('change_7d'),
+            volume_24h=scalars('volume_24h'),
+        )
+        return panel, fallback
+
+    # Göstergeler (son değerler, her biri (N,) dizisi)
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        """Son mumdaki RSI (calculate_rsi ile aynı basit ortalama yöntemi)"""
+        delta = np.diff(self.close[:, -(period + 1):], axis=1)
+        gain = np.where(delta > 0, delta, 0.0).mean(axis=1)
+        loss = np.where(delta < 0, -delta, 0.0).mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
+            return 100 - (100 / (1 + rs))
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray]:
+        """MACD ve sinyal çizgisi serileri (N x T)"""
+        macd_line = ema(self.close, fast) - ema(self.close, slow)
+        return macd_line, ema(macd_line, signal)
+
+    def macd_cross(self) -> np.ndarray:
+        """Son mumda MACD'nin sinyal çizgisini yukarı kesip kesmediği"""
+        macd_line, signal_line = self.macd()
+        return (macd_line[:, -1] > signal_line[:, -1]) & (macd_line[:, -2] <= signal_line[:, -2])
+
+    def bollinger(self, period: int = 20, std_dev: int = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Son mumdaki Bollinger üst, orta ve alt bantları"""
+        window = self.close[:, -period:]
+        middle = window.mean(axis=1)
+        std = window.std(axis=1, ddof=1)
+        return middle + std * std_dev, middle, middle - std * std_dev
+
+    def bollinger_position(self, period: int = 20, std_dev: int = 2) -> np.ndarray:
+        """Fiyatın Bollinger bantları içindeki konumu (0: alt bant, 1: üst bant)"""
+        upper, _, lower = self.bollinger(period, std_dev)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (self.current_price - lower) / (upper - lower)
+
+    def sma(self, window: int) -> np.ndarray:
+        """Son `window` kapanışın basit ortalaması"""
+        return self.close[:, -window:].mean(axis=1)
+
+    def volatility(self, window: int = 24) -> np.ndarray:
+        """Son `window` mumdaki getirilerin yüzde standart sapması"""
+        prices = self.close[:, -window:]
+        returns = prices[:, 1:] / prices[:, :-1] - 1
+        return returns.std(axis=1, ddof=1) * 100
+
+    def volume_increase(self, window: int = 24) -> np.ndarray:
+        """Son `window` mum hacminin önceki pencereye göre yüzde artışı (önceki 0 ise NaN)"""
+        recent = self.quote_volume[:, -window:].sum(axis=1)
+        previous = self.quote_volume[:, -2 * window:-window].sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(previous > 0, (recent - previous) / np.where(previous > 0, previous, 1) * 100, np.nan)
+
+    def momentum(self, window: int = 6) -> np.ndarray:
+        """Son `window` mumdaki yüzde fiyat değişimi"""
+        start = self.close[:, -window]
+        return (self.close[:, -1] - start) / start * 100
+
+    def change_over(self, candles: int) -> np.ndarray:
+        """Güncel fiyatın `candles` mum önceki kapanışa göre yüzde değişimi"""
+        previous = self.close[:, -(candles + 1)]
+        return ((self.current_price - previous) / previous) * 100
+
+    def features_24h(self) -> Dict[str, np.ndarray]:
+        """24 saatlik kazanç skorlayıcısının kullandığı özellikler"""
+        return {
+            'change_7d': self.change_7d,
+            'change_24h': self.change_24h,
+            'rsi': self.rsi(),
+            'volume_increase': self.volume_increase(),
+            'momentum': self.momentum(),
+            'current_price': self.current_price,
+            'support_level': self.low[:, -24:].min(axis=1),
+            'sma_short': self.sma(12),
+            'sma_long': self.sma(24),
+            'volatility': self.volatility(),
+            'macd_cross': self.macd_cross(),
+            'bb_position': self.bollinger_position(),
+        }
+
+    def features_1h(self) -> Dict[str, np.ndarray]:
+        """1 saatlik kazanç skorlayıcısının kullandığı özellikler"""
+        return {
+            'change_1h': self.change_over(1),
+            'change_4h': self.change_over(4),
+            'rsi': self.rsi(),
+            'volume_spike': self.volume[:, -1] > self.volume[:, -24:].mean(axis=1) * 1.5,
+            'current_price': self.current_price,
+        }
+
+    # Skorlayıcılar (analyze_* metotlarıyla aynı sözlükleri üretir)
+
+    def _low_volume_result(self, i: int, min_volume: float) -> Dict:
+        """Hacim eşiğinin altındaki sembol için sonuç"""
+        return {
+            'symbol': self.symbols[i],
+            'opportunity_score': 0,
+            'opportunity_type': "Düşük Hacim",
+            'recommendation': "Hacim yetersiz",
+            'reason': f"24h hacim: ${self.volume_24h[i]:,.0f} (min: ${min_volume:,.0f})"
+        }
+
+    def score_opportunity(self, min_volume: float, opportunity_threshold: float,
+                          params: Optional[Dict] = None) -> List[Dict]:
+        """analyze_coin_opportunity kurallarını tüm panele uygular"""
+        change_7d, change_24h = self.change_7d, self.change_24h
+        rsi = self.rsi()
+        features = {'change_7d': change_7d, 'change_24h': change_24h, 'rsi': rsi,
+                    'volume_increase': self.volume_increase()}
+        scored = score_opportunity_features(features, opportunity_threshold, params)
+
+        score, type_code, rec_code = scored['opportunity_score'], scored['type_code'], scored['rec_code']
+        volume_spike, oversold = scored['volume_spike'], scored['oversold']
+
+        now = datetime.now().isoformat()
+        results = []
+        for i, symbol in enumerate(self.symbols):
+            if self.volume_24h[i] < min_volume:
+                results.append(self._low_volume_result(i, min_volume))
+                continue
+
+            opportunity_type = OPPORTUNITY_TYPES[type_code[i]]
+            if volume_spike[i]:
+                opportunity_type += " + Hacim Artışı"
+            if oversold[i]:
+                opportunity_type += " + Aşırı Satım"
+
+            results.append({
+                'symbol': symbol,
+                'current_price': float(self.current_price[i]),
+                'change_24h': float(change_24h[i]),
+                'change_7d': float(change_7d[i]),
+                'volume_24h': float(self.volume_24h[i]),
+                'opportunity_score': float(score[i]),
+                'opportunity_type': opportunity_type,
+                'recommendation': OPPORTUNITY_RECOMMENDATIONS[rec_code[i]],
+                'rsi': float(rsi[i]),
+                'last_updated': now
+            })
+
+        return results
+
+    def score_24h_profit(self, params: Optional[Dict] = None) -> List[Dict]:
+        """analyze_24h_profit_potential kurallarını tüm panele uygular"""
+        features = self.features_24h()
+        masks = score_24h_features(features, params)
+
+        score = masks['profit_score']
+        target_price = masks['target_price']
+        change_7d, change_24h, rsi = self.change_7d, self.change_24h, features['rsi']
+        volume_increase, momentum = features['volume_increase'], features['momentum']
+
+        results = []
+        for i, symbol in enumerate(self.symbols):
+            # Gerekçeler yalnızca tetiklenen kurallar için üretilir
+            reasoning = []
+            if masks['drop_10'][i]:
+                reasoning.append(f"7 günde %{abs(change_7d[i]):.1f} düşüş - toparlanma potansiyeli")
+            elif masks['drop_5'][i]:
+                reasoning.append(f"7 günde %{abs(change_7d[i]):.1f} düşüş")
+            if masks['recovery'][i]:
+                reasoning.append(f"24 saatte %{change_24h[i]:.1f} artış başladı")
+            elif masks['strong_24h'][i]:
+                reasoning.append(f"Güçlü 24 saat artış: %{change_24h[i]:.1f}")
+            if masks['rsi_25'][i]:
+                reasoning.append(f"RSI aşırı satım: {rsi[i]:.1f} - güçlü toparlanma sinyali")
+            elif masks['rsi_35'][i]:
+                reasoning.append(f"RSI düşük: {rsi[i]:.1f} - toparlanma potansiyeli")
+            if masks['volume_100'][i]:
+                reasoning.append(f"Hacim %{volume_increase[i]:.1f} arttı - güçlü alım sinyali")
+            elif masks['volume_50'][i]:
+                reasoning.append(f"Hacim %{volume_increase[i]:.1f} arttı")
+            if masks['momentum'][i]:
+                reasoning.append(f"Son 6 saatte %{momentum[i]:.1f} momentum")
+            if masks['support'][i]:
+                reasoning.append("Destek seviyesinde - düşüş durdu")
+            if masks['trend'][i]:
+                reasoning.append("Kısa vadeli trend pozitife döndü")
+            if masks['volatility'][i]:
+                reasoning.append("Yüksek volatilite - hızlı hareket potansiyeli")
+            if masks['macd'][i]:
+                reasoning.append("MACD pozitif sinyal - trend dönüşü")
+            if masks['bollinger'][i]:
+                reasoning.append("Bollinger alt bandında - yükseliş potansiyeli")
+
+            tier = masks['tier'][i]
+            recommendation, confidence = PROFIT_TIERS[tier][1:] if tier < len(PROFIT_TIERS) else PROFIT_DEFAULT_TIER
+            current_price = float(self.current_price[i])
+
+            results.append({
+                'symbol': symbol,
+                'profit_score': float(score[i]),
+                'recommendation': recommendation,
+                'confidence': confidence,
+                'target_price': float(target_price[i]),
+                'potential_gain_percent': ((float(target_price[i]) - current_price) / current_price) * 100,
+                'reasoning': reasoning,
+                'rsi': float(rsi[i]),
+                'current_price': current_price,
+                'change_24h': float(change_24h[i]),
+                'change_7d': float(change_7d[i]),
+                'volume_24h': float(self.volume_24h[i]),
+                'long_term_drop': bool(change_7d[i] < -5),
+                'recovery_started': bool(masks['recovery'][i])
+            })
+
+        return results
+
+    def score_1h_profit(self, min_volume: float, params: Optional[Dict] = None) -> List[Dict]:
+        """analyze_1h_profit_potential kurallarını tüm panele uygular"""
+        features = self.features_1h()
+        scored = score_1h_features(features, params)
+
+        change_1h, change_4h, rsi = features['change_1h'], features['change_4h'], features['rsi']
+        score, type_code, rec_code = scored['opportunity_score'], scored['type_code'], scored['rec_code']
+
+        now = datetime.now().isoformat()
+        results = []
+        for i, symbol in enumerate(self.symbols):
+            if self.volume_24h[i] < min_volume:
+                results.append(self._low_volume_result(i, min_volume))
+                continue
+
+            results.append({
+                'symbol': symbol,
+                'current_price': float(self.current_price[i]),
+                'change_1h': float(change_1h[i]),
+                'change_4h': float(change_4h[i]),
+                'volume_24h': float(self.volume_24h[i]),
+                'opportunity_score': float(score[i]),
+                'opportunity_type': ONE_HOUR_TYPES[type_code[i]],
+                'recommendation': ONE_HOUR_RECOMMENDATIONS[rec_code[i]],
+                'rsi': float(rsi[i]),
+                'last_updated': now
+            })
+
+        return results
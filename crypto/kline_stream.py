@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Canlı Kline Akışı
+Binance birleşik kline/miniTicker akışlarını dinler ve analizörün mum tamponlarını
+sürekli güncel tutar; bağlantı koptuğunda yeniden bağlanıp aradaki mumları REST ile tamamlar
+"""
+
+import json
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+
+try:
+    from websockets.sync.client import connect
+    from websockets.exceptions import WebSocketException
+except ImportError:  # websockets kurulu değilse yalnızca REST kullanılır
+    connect = None
+    WebSocketException = Exception
+
+from .candles import INTERVAL_MS
+
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443/stream"
+
+
+class KlineStream:
+    """USDT çiftleri için canlı mum ve mini ticker akışı"""
+
+    def __init__(self, analyzer, symbols: List[str], interval: str = "1h", limit: int = 168,
+                 url: str = BINANCE_STREAM_URL, max_streams_per_connection: int = 1000,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0,
+                 ticker_max_age: float = 30.0):
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Desteklenmeyen aralık: {interval}")
+
+        self.analyzer = analyzer
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.interval = interval
+        self.interval_ms = INTERVAL_MS[interval]
+        self.limit = limit
+        self.url = url
+        self.max_streams_per_connection = max_streams_per_connection
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ticker_max_age = ticker_max_age
+        self.logger = logging.getLogger(__name__)
+
+        # Mini ticker verisi: sembol -> son değerler
+        self.tickers = {}
+        self.tickers_updated = None  # time.monotonic() değeri
+
+        self.stats = {'messages': 0, 'klines': 0, 'tickers': 0, 'reconnects': 0, 'backfills': 0}
+
+        self._live = set()  # Bağlantısı açık ve boşluğu tamamlanmış semboller
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._connections = {}
+
+    # ---- Yaşam döngüsü ----
+
+    def start(self, seed: bool = True):
+        """Tamponları REST ile doldurur ve her bağlantı grubu için dinleyici başlatır"""
+        if connect is None:
+            raise RuntimeError("Canlı akış için 'websockets' paketi gerekli (pip install websockets)")
+
+        if self._threads:
+            return
+
+        if seed:
+            self.backfill(self.symbols)
+
+        self._stop_event.clear()
+        for index, group in enumerate(self._connection_groups()):
+            thread = threading.Thread(target=self._run, args=(index, group, seed),
+                                      name=f"kline-stream-{index}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+        self.logger.info(f"Canlı akış başlatıldı: {len(self.symbols)} sembol, "
+                         f"{len(self._threads)} bağlantı")
+
+    def stop(self, timeout: float = 5.0):
+        """Bağlantıları kapatır ve dinleyicileri durdurur"""
+        self._stop_event.set()
+
+        for websocket in list(self._connections.values()):
+            try:
+                websocket.close()
+            except Exception:
+                pass
+
+        for thread in self._threads:
+            thread.join(timeout)
+
+        self._threads = []
+        with self._lock:
+            self._live.clear()
+
+        self.logger.info("Canlı akış durduruldu")
+
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def is_live(self, symbol: str, interval: str, limit: int) -> bool:
+        """Sembolün tamponu akışla güncel tutuluyor ve istenen geçmişi kapsıyorsa True"""
+        if interval != self.interval or symbol not in self._live:
+            return False
+
+        buffer = self.analyzer.candle_buffers.get((symbol, interval))
+        return buffer is not None and (len(buffer) >= limit or buffer.history_exhausted)
+
+    # ---- Bağlantı yönetimi ----
+
+    def _connection_groups(self) -> List[List[str]]:
+        """Sembolleri bağlantı başına akış sınırına göre gruplar"""
+        # İlk bağlantı ayrıca tüm piyasa mini ticker akışını dinler
+        size = max(1, self.max_streams_per_connection - 1)
+        return [self.symbols[i:i + size] for i in range(0, len(self.symbols), size)] or [[]]
+
+    def _stream_names(self, symbols: List[str], include_tickers: bool) -> List[str]:
+        """Abone olunacak akış adları"""
+        streams = [f"{symbol.lower()}@kline_{self.interval}" for symbol in symbols]
+        if include_tickers:
+            streams.append("!miniTicker@arr")
+        return streams
+
+    def _run(self, index: int, symbols: List[str], seeded: bool):
+        """Tek bir bağlantıyı açık tutar; koparsa artan beklemeyle yeniden bağlanır"""
+        delay = self.reconnect_delay
+        first_attempt = True
+
+        while not self._stop_event.is_set():
+            try:
+                with connect(self.url, open_timeout=10, close_timeout=2) as websocket:
+                    self._connections[index] = websocket
+                    websocket.send(json.dumps({
+                        'method': 'SUBSCRIBE',
+                        'params': self._stream_names(symbols, include_tickers=index == 0),
+                        'id': index + 1,
+                    }))
+
+                    # Bağlantı yokken kaçırılan mumlar REST ile tamamlanır
+                    if not (first_attempt and seeded):
+                        self.backfill(symbols)
+
+                    with self._lock:
+                        self._live.update(symbols)
+                    delay = self.reconnect_delay
+
+                    for message in websocket:
+                        self.handle_message(message)
+
+            except (OSError, WebSocketException) as e:
+                self.logger.warning(f"Canlı akış bağlantısı {index} koptu: {e}")
+            except Exception as e:
+                self.logger.error(f"Canlı akış bağlantısı {index} hatası: {e}")
+            finally:
+                self._connections.pop(index, None)
+                with self._lock:
+                    self._live.difference_update(symbols)
+
+            first_attempt = False
+            if self._stop_event.wait(delay):
+                break
+            self.stats['reconnects'] += 1
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def backfill(self, symbols: List[str]):
+        """Sembollerin tamponlarını REST üzerinden (artımlı) tamamlar"""
+        if not symbols:
+            return
+        self.analyzer.fetcher.map(
+            symbols, lambda symbol: self.analyzer._refresh_candle_buffer(symbol, self.interval, self.limit)
+        )
+        self.stats['backfills'] += len(symbols)
+
+    # ---- Mesaj işleme ----
+
+    def handle_message(self, message: str):
+        """Birleşik akıştan gelen tek bir mesajı işler"""
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            self.logger.error(f"Çözümlenemeyen akış mesajı: {message[:100]}")
+            return
+
+        self.stats['messages'] += 1
+        data = payload.get('data', payload) if isinstance(payload, dict) else payload
+
+        if isinstance(data, list):
+            for item in data:
+                self._apply_ticker(item)
+            self.tickers_updated = time.monotonic()
+        elif data.get('e') == 'kline':
+            self._apply_kline(data)
+        elif data.get('e') == '24hrMiniTicker':
+            self._apply_ticker(data)
+            self.tickers_updated = time.monotonic()
+        # SUBSCRIBE yanıtları ({"result": null, "id": 1}) yok sayılır
+
+    def _apply_kline(self, data: Dict):
+        """Kline olayını tampona yazar; arada eksik mum varsa önce REST ile tamamlar"""
+        kline = data['k']
+        symbol = data['s']
+        if kline['i'] != self.interval:
+            return
+
+        row = [kline['t'], kline['o'], kline['h'], kline['l'], kline['c'], kline['v'],
+               kline['T'], kline['q'], kline['n'], kline['V'], kline['Q']]
+
+        buffer = self.analyzer.candle_buffers.get((symbol, self.interval))
+        last_open = buffer.last_open_time if buffer is not None else None
+
+        if last_open is None or kline['t'] > last_open + self.interval_ms:
+            self.backfill([symbol])
+            buffer = self.analyzer.candle_buffers.get((symbol, self.interval))
+            if buffer is None:
+                return
+
+        buffer.extend([row])
+        self.stats['klines'] += 1
+
+    def _apply_ticker(self, data: Dict):
+        """Mini ticker olayını saklar"""
+        open_price = float(data['o'])
+        last_price = float(data['c'])
+        self.tickers[data['s']] = {
+            'symbol': data['s'],
+            'last_price': last_price,
+            'price_change_percent': (last_price - open_price) / open_price * 100 if open_price else 0.0,
+            'quote_volume': float(data['q']),
+        }
+        self.stats['tickers'] += 1
+
+    def ticker_frame(self) -> Optional[pd.DataFrame]:
+        """Akıştan gelen ticker verisini get_all_tickers biçiminde döndürür (bayatsa None)"""
+        if not self.tickers or self.tickers_updated is None:
+            return None
+        if time.monotonic() - self.tickers_updated > self.ticker_max_age:
+            return None
+        return pd.DataFrame(list(self.tickers.values()),
+                            columns=['symbol', 'last_price', 'price_change_percent', 'quote_volume'])
+
+    @property
+    def live_symbols(self) -> Set[str]:
+        with self._lock:
+            return set(self._live)
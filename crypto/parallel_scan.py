@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Süreç Havuzlu Parçalı Tarama
+Aynı uzunluktaki mum serilerini tek bir paylaşılan bellek bloğuna yazar, evreni
+parçalara bölüp ProcessPoolExecutor ile skorlar ve sonuçları birleştirir
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .candles import Candles, KLINE_COLUMNS
+from .indicator_panel import IndicatorPanel, scoring_params
+
+# coin_data içindeki sayısal alanlar (sembol başına tek değer)
+SCALAR_FIELDS = ('current_price', 'price_24h_ago', 'price_7d_ago', 'change_24h', 'change_7d', 'volume_24h')
+
+RESULT_KEYS = ('opportunities', '24h', '1h')
+
+_worker_analyzer = None  # Tek tek skorlama modunda işçi süreç başına bir analizör
+
+
+def _shared_views(buffer, count: int, length: int):
+    """Paylaşılan bloğu (sütun, sembol, mum) ve (alan, sembol) dizileri olarak görür"""
+    series_size = len(KLINE_COLUMNS) * count * length
+    block = np.ndarray((series_size + len(SCALAR_FIELDS) * count,), dtype=np.float64, buffer=buffer)
+    series = block[:series_size].reshape(len(KLINE_COLUMNS), count, length)
+    scalars = block[series_size:].reshape(len(SCALAR_FIELDS), count)
+    return series, scalars
+
+
+def score_shard(task: Dict) -> Dict[str, List[Dict]]:
+    """İşçi süreçte bir parçayı skorlar (paylaşılan bloktan yalnızca kendi satırlarını kopyalar)"""
+    shm = shared_memory.SharedMemory(name=task['shm_name'])
+    try:
+        series, scalars = _shared_views(shm.buf, task['count'], task['length'])
+        start, stop = task['start'], task['stop']
+        columns = {name: np.array(series[i, start:stop]) for i, name in enumerate(KLINE_COLUMNS)}
+        values = {name: np.array(scalars[i, start:stop]) for i, name in enumerate(SCALAR_FIELDS)}
+        del series, scalars  # Blok kapatılmadan önce görünümler bırakılmalı
+    finally:
+        shm.close()
+
+    symbols = task['symbols']
+
+    if task['use_panel']:
+        panel = IndicatorPanel(
+            symbols=symbols,
+            close=columns['close'],
+            high=columns['high'],
+            low=columns['low'],
+            volume=columns['volume'],
+            quote_volume=columns['quote_asset_volume'],
+            current_price=values['current_price'],
+            change_24h=values['change_24h'],
+            change_7d=values['change_7d'],
+            volume_24h=values['volume_24h'],
+        )
+        return {
+            'opportunities': panel.score_opportunity(task['min_volume'], task['opportunity_threshold'],
+                                                     task['params']),
+            '24h': panel.score_24h_profit(task['params']),
+            '1h': panel.score_1h_profit(task['min_volume'], task['params']),
+        }
+
+    analyzer = _get_worker_analyzer()
+    analyzer.min_volume_usdt = task['min_volume']
+    analyzer.opportunity_threshold = task['opportunity_threshold']
+    analyzer.scoring_params = scoring_params(task['params'])
+
+    results = {key: [] for key in RESULT_KEYS}
+    for row, symbol in enumerate(symbols):
+        coin_data = {name: float(values[name][row]) for name in SCALAR_FIELDS}
+        coin_data['symbol'] = symbol
+        coin_data['data'] = Candles(**{name: columns[name][row] for name in KLINE_COLUMNS})
+
+        for key, scorer in (('opportunities', analyzer.analyze_coin_opportunity),
+                            ('24h', analyzer.analyze_24h_profit_potential),
+                            ('1h', analyzer.analyze_1h_profit_potential)):
+            result = scorer(coin_data)
+            if result:
+                results[key].append(result)
+    return results
+
+
+def _get_worker_analyzer():
+    """İşçi süreçteki analizörü ilk kullanımda oluşturur"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        from .crypto_analyzer import CryptoAnalyzer
+        # Yalnızca paylaşılan bellekteki veriyi skorlar: mum deposu ve sembol dosyası açılmaz
+        _worker_analyzer = CryptoAnalyzer(max_workers=1, data_dir=None)
+    return _worker_analyzer
+
+
+class ShardedScanner:
+    """Tarama evrenini süreç havuzunda parçalara bölerek skorlar"""
+
+    def __init__(self, max_processes: Optional[int] = None, min_shard_size: int = 25):
+        self.max_processes = max(1, max_processes or os.cpu_count() or 1)
+        self.min_shard_size = min_shard_size
+        self.logger = logging.getLogger(__name__)
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Süreç havuzunu ilk kullanımda açar; sonraki taramalar aynı havuzu kullanır"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_processes)
+        return self._executor
+
+    def shutdown(self):
+        """Süreç havuzunu kapatır"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def score(self, coin_data_map: Dict[str, Dict], symbols: List[str], min_volume: float,
+              opportunity_threshold: float, use_panel: bool = True,
+              params: Optional[Dict] = None) -> Dict[str, List[Dict]]:
+        """Aynı uzunluktaki sembolleri parçalara bölüp paralel skorlar; sonuçlar giriş sırasıyla birleşir"""
+        results = {key: [] for key in RESULT_KEYS}
+        if not symbols:
+            return results
+
+        count = len(symbols)
+        length = len(coin_data_map[symbols[0]]['data'])
+        size = (len(KLINE_COLUMNS) * count * length + len(SCALAR_FIELDS) * count) * 8
+
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            series, scalars = _shared_views(shm.buf, count, length)
+            for row, symbol in enumerate(symbols):
+                coin_data = coin_data_map[symbol]
+                for i, name in enumerate(KLINE_COLUMNS):
+                    series[i, row] = coin_data['data'].array(name)
+                for i, name in enumerate(SCALAR_FIELDS):
+                    scalars[i, row] = coin_data[name]
+            del series, scalars
+
+            shard_count = min(self.max_processes, max(1, count // self.min_shard_size))
+            bounds = np.linspace(0, count, shard_count + 1).astype(int)
+            tasks = [{
+                'shm_name': shm.name,
+                'count': count,
+                'length': length,
+                'start': int(start),
+                'stop': int(stop),
+                'symbols': symbols[start:stop],
+                'use_panel': use_panel,
+                'min_volume': min_volume,
+                'opportunity_threshold': opportunity_threshold,
+                'params': params,
+            } for start, stop in zip(bounds[:-1], bounds[1:])]
+
+            for shard in self._get_executor().map(score_shard, tasks):
+                for key in RESULT_KEYS:
+                    results[key].extend(shard[key])
+
+            self.logger.info(f"Parçalı tarama: {count} coin, {len(tasks)} parça, {self.max_processes} süreç")
+            return results
+
+        finally:
+            shm.close()
+            shm.unlink()
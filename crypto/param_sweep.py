@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Skorlama Parametre Taraması
+Saklanan tarihsel mumlar üzerinde hacim, fırsat, RSI ve tavsiye kademe eşiklerini
+ızgara veya rastgele aramayla dener; göstergeler bir kez hesaplanır, parametre setleri
+süreç havuzunda değerlendirilir ve sonuçlar sıralı tablo olarak yazılır
+"""
+
+import os
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backtest import HORIZONS, simulate_exits
+from .indicator_panel import (SCORING_PARAMS, scoring_params, score_24h_features, score_1h_features,
+                              score_opportunity_features)
+
+# Varsayılan arama uzayı (her anahtar için denenecek değerler)
+DEFAULT_SPACE = {
+    'min_volume_usdt': [250_000, 1_000_000, 5_000_000],
+    'opportunity_threshold': [3.0, 5.0, 8.0],
+    'rsi_oversold_24h': [20, 25, 30],
+    'rsi_low_24h': [30, 35, 40],
+    'rsi_oversold_1h': [25, 30, 35],
+    'rsi_low_1h': [35, 40, 45],
+    'rsi_oversold_opportunity': [25, 30, 35],
+    'profit_tiers': [(70, 50, 30, 15), (80, 60, 40, 20), (60, 45, 30, 15)],
+}
+
+# Değerlendirilen skorlayıcılar (fırsat sinyalleri 24 mum tutulur)
+SCORERS = ('24h', '1h', 'opportunity')
+
+_sweep_groups = None  # İşçi süreçte hazırlanmış gösterge dizileri
+
+
+def grid(space: Dict[str, List]) -> List[Dict]:
+    """Arama uzayındaki tüm kombinasyonlar"""
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def random_search(space: Dict[str, List], samples: int, seed: Optional[int] = None) -> List[Dict]:
+    """Arama uzayından tekrarsız rastgele `samples` kombinasyon"""
+    rng = np.random.default_rng(seed)
+    keys = list(space)
+    total = int(np.prod([len(space[key]) for key in keys]))
+    samples = min(samples, total)
+
+    seen, param_sets = set(), []
+    while len(param_sets) < samples:
+        indices = tuple(int(rng.integers(len(space[key]))) for key in keys)
+        if indices in seen:
+            continue
+        seen.add(indices)
+        param_sets.append({key: space[key][index] for key, index in zip(keys, indices)})
+    return param_sets
+
+
+def _summary(prefix: str, exits: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """Sinyallerin isabet, getiri ve düşüş özeti"""
+    count = len(exits['return'])
+    if count == 0:
+        return {f'signals_{prefix}': 0, f'hit_rate_{prefix}': np.nan,
+                f'avg_return_{prefix}': np.nan, f'avg_drawdown_{prefix}': np.nan}
+    return {
+        f'signals_{prefix}': count,
+        f'hit_rate_{prefix}': float(exits['hit'].mean() * 100),
+        f'avg_return_{prefix}': float(exits['return'].mean()),
+        f'avg_drawdown_{prefix}': float(exits['drawdown'].mean()),
+    }
+
+
+def evaluate_params(params: Dict, groups: Optional[List[Dict]] = None) -> Dict:
+    """Tek parametre setinin alım sinyallerini tüm gruplar üzerinde değerlendirir.
+
+    Alım sinyali: 24h için "AL" ve üstü kademeler, 1h ve fırsat skorlayıcıları için
+    hacim eşiğini geçen "Bekle" dışı tavsiyeler.
+    """
+    groups = _sweep_groups if groups is None else groups
+    thresholds = scoring_params({key: value for key, value in params.items() if key in SCORING_PARAMS})
+    min_volume = params['min_volume_usdt']
+    opportunity_threshold = params['opportunity_threshold']
+
+    collected = {key: {'return': [], 'hit': [], 'drawdown': []} for key in SCORERS}
+    for group in groups:
+        features = group['features']
+        valid = group['valid']
+        liquid = valid & (features['volume_24h'] >= min_volume)
+
+        # 24h hedef fiyatı skora bağlı olduğundan çıkışları her sette yeniden simüle edilir
+        scored_24h = score_24h_features(features, thresholds)
+        exits_24h = simulate_exits(group['close'], group['high'], group['low'],
+                                   scored_24h['target_price'], HORIZONS['24h'])
+        selections = {
+            '24h': (valid & (scored_24h['tier'] <= 2), exits_24h),
+            '1h': (liquid & (score_1h_features(features, thresholds)['rec_code'] > 0), group['exits_1h']),
+            'opportunity': (liquid & (score_opportunity_features(features, opportunity_threshold,
+                                                                 thresholds)['rec_code'] > 0),
+                            group['exits_hold']),
+        }
+        for key, (selected, exits) in selections.items():
+            for name in collected[key]:
+                collected[key][name].append(exits[name][selected])
+
+    result = dict(params)
+    for key in SCORERS:
+        result.update(_summary(key, {name: np.concatenate(parts) if parts else np.empty(0)
+                                     for name, parts in collected[key].items()}))
+    return result
+
+
+def _init_worker(groups: List[Dict]):
+    """İşçi süreçte hazırlanmış dizileri saklar (her parametre setinde yeniden gönderilmez)"""
+    global _sweep_groups
+    _sweep_groups = groups
+
+
+class ParameterSweep:
+    """Skorlama eşiklerini tarihsel veri üzerinde çevrimdışı ayarlar"""
+
+    def __init__(self, backtester, max_processes: Optional[int] = None, min_signals: int = 30,
+                 objective: str = 'avg_return_24h'):
+        self.backtester = backtester
+        self.max_processes = max(1, max_processes or os.cpu_count() or 1)
+        self.min_signals = min_signals  # Daha az sinyal üreten setler sıralamada sona atılır
+        self.objective = objective
+        self.logger = logging.getLogger(__name__)
+
+    def prepare(self, history: Dict) -> List[Dict]:
+        """Göstergeleri ve parametreden bağımsız çıkışları grup başına bir kez hesaplar"""
+        groups = []
+        for symbols in self.backtester.chunks(history):
+            prepared = self.backtester.prepare([history[s] for s in symbols])
+            close, high, low = prepared['close'], prepared['high'], prepared['low']
+
+            exits_1h = simulate_exits(close, high, low, close, HORIZONS['1h'])
+            exits_hold = simulate_exits(close, high, low, close, HORIZONS['24h'])
+
+            groups.append({
+                'close': close,
+                'high': high,
+                'low': low,
+                'features': prepared['features'],
+                # 24 mumluk pencere tamamlanmayan son mumlar tüm skorlayıcılardan çıkarılır
+                'valid': prepared['warmed_up'] & exits_hold['complete'],
+                'exits_1h': exits_1h,
+                'exits_hold': exits_hold,
+            })
+        return groups
+
+    def defaults(self) -> Dict:
+        """Analizörün mevcut eşikleri (setlerde verilmeyen anahtarlar bunlardan alınır)"""
+        analyzer = self.backtester.analyzer
+        return {
+            'min_volume_usdt': analyzer.min_volume_usdt,
+            'opportunity_threshold': analyzer.opportunity_threshold,
+            **analyzer.scoring_params,
+        }
+
+    def run(self, history: Dict, param_sets: List[Dict], output_path: Optional[str] = None) -> pd.DataFrame:
+        """Parametre setlerini değerlendirir ve amaç metriğine göre sıralı tabloyu döndürür/yazar"""
+        groups = self.prepare(history)
+        if not groups or not param_sets:
+            return pd.DataFrame()
+
+        param_sets = [{**self.defaults(), **params} for params in param_sets]
+
+        if self.max_processes > 1 and len(param_sets) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.max_processes, len(param_sets)),
+                                     initializer=_init_worker, initargs=(groups,)) as executor:
+                rows = list(executor.map(evaluate_params, param_sets))
+        else:
+            rows = [evaluate_params(params, groups) for params in param_sets]
+
+        results = self.rank(pd.DataFrame(rows))
+
+        if output_path is None:
+            output_path = os.path.join(self.backtester.history_dir, "param_sweep.csv")
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        results.to_csv(output_path, index=False)
+
+        self.logger.info(f"Parametre taraması: {len(param_sets)} set, en iyi {self.objective}: "
+                         f"{results[self.objective].iloc[0]:.3f} -> {output_path}")
+        return results
+
+    def rank(self, results: pd.DataFrame) -> pd.DataFrame:
+        """Yeterli sinyal üreten setleri amaç metriğine göre büyükten küçüğe sıralar"""
+        scorer = self.objective.rsplit('_', 1)[-1]
+        enough = results[f'signals_{scorer}'] >= self.min_signals
+        ranked = results.assign(_enough=enough).sort_values(
+            ['_enough', self.objective], ascending=[False, False], na_position='last', kind='stable')
+        ranked = ranked.drop(columns='_enough').reset_index(drop=True)
+        ranked.insert(0, 'rank', range(1, len(ranked) + 1))
+        return ranked
+
+    @staticmethod
+    def apply(analyzer, params: Dict):
+        """Seçilen parametreleri canlı analizöre uygular"""
+        if 'min_volume_usdt' in params:
+            analyzer.min_volume_usdt = params['min_volume_usdt']
+        if 'opportunity_threshold' in params:
+            analyzer.opportunity_threshold = params['opportunity_threshold']
+        analyzer.scoring_params = scoring_params(
+            {key: value for key, value in params.items() if key in SCORING_PARAMS}
+        )
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Binance İstek Ağırlığı Sınırlayıcı
+Süreç genelinde paylaşılan token kovası; uç nokta ağırlıklarını bilir, dakikalık
+pencereyi X-MBX-USED-WEIGHT başlıklarıyla eşitler ve 429/418 yanıtlarında geri çekilir
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+# Binance spot REST varsayılan dakikalık ağırlık sınırı (REQUEST_WEIGHT, 1 dakika)
+DEFAULT_WEIGHT_LIMIT = 6000
+
+MIN_WAIT = 0.001  # Saniye
+
+# Tek sembollü istek ağırlıkları (uç nokta yolunun /api/v3/ sonrası)
+ENDPOINT_WEIGHTS = {
+    'exchangeInfo': 20,
+    'klines': 2,
+    'ticker/24hr': 2,
+    'ticker/price': 2,
+}
+
+# Sembol verilmeden (tüm piyasa) yapılan isteklerin ağırlıkları
+ALL_SYMBOLS_WEIGHTS = {
+    'ticker/24hr': 80,
+    'ticker/price': 4,
+}
+
+
+def endpoint_weight(url: str, params: Optional[Dict] = None) -> int:
+    """İsteğin Binance ağırlığı (bilinmeyen uç noktalar 1 sayılır)"""
+    path = urlparse(url).path.split('/api/v3/', 1)[-1].strip('/')
+    params = params or {}
+
+    if path in ALL_SYMBOLS_WEIGHTS and 'symbol' not in params and 'symbol=' not in url:
+        symbols = params.get('symbols')
+        if symbols and path == 'ticker/24hr':
+            count = len(symbols) if isinstance(symbols, (list, tuple)) else symbols.count(',') + 1
+            return 2 if count <= 20 else 40 if count <= 100 else 80
+        return ALL_SYMBOLS_WEIGHTS[path]
+
+    return ENDPOINT_WEIGHTS.get(path, 1)
+
+
+class RequestWeightLimiter:
+    """Dakikalık ağırlık bütçesini aşmadan istekleri sıraya koyan token kovası"""
+
+    def __init__(self, limit: int = DEFAULT_WEIGHT_LIMIT, safety_margin: float = 0.9,
+                 burst_seconds: float = 10.0, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.limit = limit
+        self.budget = int(limit * safety_margin)  # Diğer istemcilere pay bırakılır
+        self.capacity = max(1.0, self.budget * burst_seconds / 60)  # Boşta biriken en fazla ağırlık
+        self.refill_rate = self.budget / 60  # Saniyede eklenen ağırlık
+        self.clock = clock
+        self.sleep = sleep
+        self.logger = logging.getLogger(__name__)
+
+        self.tokens = self.capacity
+        self.updated_at = clock()
+        self.window = int(self.updated_at // 60)  # Binance dakikalık penceresi (UTC dakika)
+        self.window_used = 0
+        self.banned_until = 0.0
+        self.backoff = 1.0
+
+        self.stats = {'requests': 0, 'weight': 0, 'waits': 0, 'waited_seconds': 0.0, 'rejections': 0}
+        self._lock = threading.Lock()
+
+    def _refresh(self, now: float):
+        """Kovayı doldurur ve dakika değiştiyse pencereyi sıfırlar"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+        window = int(now // 60)
+        if window != self.window:
+            self.window = window
+            self.window_used = 0
+
+    def _wait_time(self, weight: int, now: float) -> float:
+        """İsteğin gönderilebilmesi için beklenmesi gereken süre (0: hemen)"""
+        if now < self.banned_until:
+            delay = self.banned_until - now
+        elif self.window_used + weight > self.budget:
+            delay = (self.window + 1) * 60 - now
+        elif self.tokens < weight:
+            delay = (min(weight, self.capacity) - self.tokens) / self.refill_rate
+        else:
+            return 0.0
+        # Kayan nokta yuvarlamasıyla sınırın hemen önünde takılmamak için en az 1 ms
+        return max(delay, MIN_WAIT)
+
+    def acquire(self, weight: int = 1) -> float:
+        """Ağırlık bütçesi uygun olana kadar bekler; beklenen toplam süreyi döndürür"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._refresh(now)
+                delay = self._wait_time(weight, now)
+                if delay <= 0:
+                    # Kovadan büyük tek istek kovayı boşaltarak geçer
+                    self.tokens -= min(weight, self.tokens)
+                    self.window_used += weight
+                    self.stats['requests'] += 1
+                    self.stats['weight'] += weight
+                    if waited:
+                        self.stats['waits'] += 1
+                        self.stats['waited_seconds'] += waited
+                    return waited
+            self.sleep(delay)
+            waited += delay
+
+    def observe(self, status_code: int, headers: Dict[str, str]):
+        """Yanıt başlıklarıyla kullanılan ağırlığı eşitler; 429/418'de istekleri durdurur"""
+        used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('X-MBX-USED-WEIGHT')
+
+        with self._lock:
+            now = self.clock()
+            self._refresh(now)
+
+            if used is not None:
+                # Aynı IP'den başka süreçlerin harcadığı ağırlık da sayılır
+                self.window_used = max(self.window_used, int(used))
+
+            if status_code in (418, 429):
+                retry_after = headers.get('Retry-After')
+                delay = float(retry_after) if retry_after else self.backoff
+                self.banned_until = max(self.banned_until, now + delay)
+                self.backoff = min(self.backoff * 2, 300.0)
+                self.window_used = max(self.window_used, self.budget)
+                self.stats['rejections'] += 1
+                self.logger.warning(f"Binance ağırlık sınırı aşıldı ({status_code}), {delay:.0f} sn bekleniyor")
+            else:
+                self.backoff = 1.0
+
+    def status(self) -> Dict[str, float]:
+        """Kalan bütçe ve sayaçlar"""
+        with self._lock:
+            now = self.clock()
+            self._refresh(now)
+            return {
+                'limit': self.limit,
+                'budget': self.budget,
+                'used': self.window_used,
+                'remaining': max(0, self.budget - self.window_used),
+                'tokens': self.tokens,
+                'banned_for': max(0.0, self.banned_until - now),
+                **self.stats,
+            }
+
+
+# Süreç genelinde paylaşılan sınırlayıcı (tüm analizörler ve Streamlit oturumları)
+binance_limiter = RequestWeightLimiter()
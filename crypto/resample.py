@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Mum Yeniden Örnekleme
+Tek bir taban aralıktaki mumlardan (ör. 1h) 4h, 1d, 1w gibi daha büyük aralıkları
+NumPy reduceat ile yerelde türetir; ek API isteği gerekmez
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from .candles import Candles, INTERVAL_MS
+
+# Binance haftalık mumları Pazartesi 00:00 UTC'de açılır (1970-01-05 Pazartesi)
+WEEK_OFFSET_MS = 4 * INTERVAL_MS['1d']
+
+# 3d mumlarının hizalaması Binance tarafında çağdan (epoch) farklı olabildiğinden türetilmez
+NON_DERIVABLE = ('3d',)
+
+
+def can_resample(base_interval: str, target_interval: str) -> bool:
+    """Hedef aralık taban aralığın tam katıysa True"""
+    if target_interval in NON_DERIVABLE or base_interval not in INTERVAL_MS or target_interval not in INTERVAL_MS:
+        return False
+    base_ms = INTERVAL_MS[base_interval]
+    target_ms = INTERVAL_MS[target_interval]
+    return target_ms > base_ms and target_ms % base_ms == 0
+
+
+def bucket_offset(target_interval: str) -> int:
+    """Hedef aralığın hizalama kayması (ms)"""
+    return WEEK_OFFSET_MS if target_interval == '1w' else 0
+
+
+def resample_candles(candles: Candles, base_interval: str, target_interval: str,
+                     limit: Optional[int] = None) -> Candles:
+    """Taban mumları hedef aralığa toplar (açılış: ilk, yüksek: max, düşük: min, kapanış: son, hacim: toplam).
+
+    Başı eksik ilk kova atılır; son kova Binance'teki gibi henüz kapanmamış mum olabilir.
+    """
+    if not can_resample(base_interval, target_interval):
+        raise ValueError(f"{base_interval} tabanından {target_interval} türetilemez")
+
+    if candles.empty:
+        return candles
+
+    target_ms = INTERVAL_MS[target_interval]
+    offset = bucket_offset(target_interval)
+
+    open_time = candles.open_time
+    buckets = (open_time - offset) // target_ms
+
+    # İlk kova başından itibaren veri içermiyorsa (tampon kovanın ortasında başlıyorsa) atılır
+    first = 0
+    if open_time[0] != buckets[0] * target_ms + offset:
+        first = int(np.searchsorted(buckets, buckets[0], side='right'))
+        if first == len(buckets):
+            return candles.tail(0)
+
+    buckets = buckets[first:]
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+
+    def column(name):
+        return getattr(candles, name)[first:]
+
+    bucket_open = buckets[starts] * target_ms + offset
+    result = Candles(
+        open_time=bucket_open,
+        open=column('open')[starts],
+        high=np.maximum.reduceat(column('high'), starts),
+        low=np.minimum.reduceat(column('low'), starts),
+        close=column('close')[ends],
+        volume=np.add.reduceat(column('volume'), starts),
+        close_time=bucket_open + target_ms - 1,
+        quote_asset_volume=np.add.reduceat(column('quote_asset_volume'), starts),
+    )
+    return result.tail(limit) if limit is not None else result
+
+
+def base_candles_needed(base_interval: str, target_interval: str, limit: int) -> int:
+    """`limit` hedef mum için gereken taban mum sayısı (başı eksik ilk kova payı dahil)"""
+    ratio = INTERVAL_MS[target_interval] // INTERVAL_MS[base_interval]
+    return (limit + 1) * ratio
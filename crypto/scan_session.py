@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Kripto Tarama Oturumu
+USDT evrenini bir kez çeker ve üç skorlayıcıyı aynı veri üzerinde tek geçişte çalıştırır
+"""
+
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .indicator_panel import IndicatorPanel
+
+
+class ScanSession:
+    """Paylaşılan coin verisi üzerinde fırsat, 24 saat ve 1 saat sıralamalarını tutar"""
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.logger = logging.getLogger(__name__)
+
+        self.coin_data = {}  # sembol -> coin_data
+        self.results = {'opportunities': [], '24h': [], '1h': []}
+        self.created_at = None  # time.monotonic() değeri
+        self.last_updated = None
+        self._scored_params = None
+        self._ungated_pairs = []  # Stablecoin dışındaki tüm çiftler (24 saat skorlayıcısı için)
+        self.full_universe = False  # Eşiksiz çiftlerin mumları çekildi mi
+
+    @property
+    def age(self) -> float:
+        """Oturumun yaşı (saniye); hiç çalışmadıysa sonsuz"""
+        if self.created_at is None:
+            return float('inf')
+        return time.monotonic() - self.created_at
+
+    def run(self) -> Dict[str, List[Dict]]:
+        """Evreni çeker ve tüm skorlayıcıları çalıştırır.
+
+        Fırsat ve 1 saat skorlayıcıları hacim eşiklidir; başlangıçta yalnızca eşiği geçebilecek
+        çiftlerin mumları çekilir. Eşiksiz 24 saat sıralaması ilk istendiğinde kalan çiftler
+        `load_full_universe` ile eklenir.
+        """
+        stream = self.analyzer.kline_stream
+        streaming = stream is not None and stream.is_running
+        if streaming:
+            # Canlı akışın evreni kullanılır; tampon ve ticker verisi ağ isteği gerektirmez
+            usdt_pairs = list(stream.symbols)
+        else:
+            usdt_pairs = self.analyzer.get_all_usdt_pairs()
+
+        if not usdt_pairs:
+            return self.results
+
+        # Aynı ticker anlık görüntüsüyle hem hacim eşikli hem eşiksiz (yalnızca stablecoin) liste
+        tickers = self.analyzer.get_all_tickers()
+        gated_pairs = self.analyzer.prefilter_pairs(usdt_pairs, min_volume=self.analyzer.min_volume_usdt,
+                                                    tickers=tickers)
+        self._ungated_pairs = self.analyzer.prefilter_pairs(usdt_pairs, tickers=tickers)
+
+        # Akış açıksa mumlar tampondan gelir; tüm evren baştan skorlanır
+        pairs_to_analyze = self._ungated_pairs if streaming else gated_pairs
+        self.full_universe = streaming
+
+        self.logger.info(f"Tarama oturumu: {len(pairs_to_analyze)} coin tek geçişte analiz ediliyor...")
+
+        self.coin_data = self.analyzer.get_multiple_coin_data(pairs_to_analyze)
+        self.created_at = time.monotonic()
+        self.last_updated = datetime.now().isoformat()
+
+        return self.score()
+
+    def load_full_universe(self):
+        """Hacim eşiğinin altındaki çiftlerin mumlarını ekleyip yeniden skorlar (oturum başına bir kez)"""
+        if self.full_universe or self.created_at is None:
+            return
+        self.full_universe = True
+
+        missing = [symbol for symbol in self._ungated_pairs if symbol not in self.coin_data]
+        if missing:
+            self.logger.info(f"Tarama oturumu: 24 saat sıralaması için {len(missing)} coin ekleniyor...")
+            self.coin_data.update(self.analyzer.get_multiple_coin_data(missing))
+        self.score()
+
+    def _params_signature(self) -> tuple:
+        """Skorlamayı etkileyen analiz parametreleri"""
+        return (self.analyzer.min_volume_usdt, self.analyzer.opportunity_threshold,
+                tuple(sorted(self.analyzer.scoring_params.items())))
+
+    def score(self) -> Dict[str, List[Dict]]:
+        """Saklanan coin verisi üzerinde üç skorlayıcıyı ağ isteği olmadan çalıştırır"""
+        opportunities, profit_24h, profit_1h = [], [], []
+        individual = list(self.coin_data)
+
+        sharded = self.analyzer.get_sharded_scanner(len(self.coin_data))
+        if sharded is not None:
+            try:
+                # Evren parçalara bölünüp süreç havuzunda skorlanır
+                symbols, individual = IndicatorPanel.partition(self.coin_data)
+                shard_results = sharded.score(self.coin_data, symbols, self.analyzer.min_volume_usdt,
+                                              self.analyzer.opportunity_threshold,
+                                              use_panel=self.analyzer.use_panel_scoring,
+                                              params=self.analyzer.scoring_params)
+                opportunities = shard_results['opportunities']
+                profit_24h = shard_results['24h']
+                profit_1h = shard_results['1h']
+            except Exception as e:
+                self.logger.error(f"Parçalı tarama hatası, tek süreçte skorlanacak: {e}")
+                opportunities, profit_24h, profit_1h = [], [], []
+                individual = list(self.coin_data)
+        elif self.analyzer.use_panel_scoring and self.coin_data:
+            try:
+                # Aynı uzunluktaki seriler tek seferde dizi maskeleriyle skorlanır
+                panel, individual = IndicatorPanel.from_coin_data(self.coin_data)
+                params = self.analyzer.scoring_params
+                opportunities = panel.score_opportunity(self.analyzer.min_volume_usdt,
+                                                        self.analyzer.opportunity_threshold, params)
+                profit_24h = panel.score_24h_profit(params)
+                profit_1h = panel.score_1h_profit(self.analyzer.min_volume_usdt, params)
+            except Exception as e:
+                self.logger.error(f"Panel skorlama hatası, tek tek skorlanacak: {e}")
+                opportunities, profit_24h, profit_1h = [], [], []
+                individual = list(self.coin_data)
+
+        # Panele girmeyen (kısa geçmişli) coinler tek tek skorlanır
+        for symbol in individual:
+            coin_data = self.coin_data[symbol]
+            try:
+                opportunity = self.analyzer.analyze_coin_opportunity(coin_data)
+                if opportunity:
+                    opportunities.append(opportunity)
+
+                profit_analysis = self.analyzer.analyze_24h_profit_potential(coin_data)
+                if profit_analysis:
+                    profit_24h.append(profit_analysis)
+
+                hourly_analysis = self.analyzer.analyze_1h_profit_potential(coin_data)
+                if hourly_analysis:
+                    profit_1h.append(hourly_analysis)
+
+            except Exception as e:
+                self.logger.error(f"{symbol} tarama oturumunda analiz edilirken hata: {e}")
+                continue
+
+        # Skora göre sırala
+        opportunities.sort(key=lambda x: x.get('opportunity_score', 0), reverse=True)
+        profit_24h.sort(key=lambda x: x.get('profit_score', 0), reverse=True)
+        profit_1h.sort(key=lambda x: x.get('opportunity_score', 0), reverse=True)
+
+        self.results = {'opportunities': opportunities, '24h': profit_24h, '1h': profit_1h}
+        self._scored_params = self._params_signature()
+
+        self.logger.info(f"Tarama oturumu: {len(opportunities)} fırsat, {len(profit_24h)} 24h, "
+                         f"{len(profit_1h)} 1h analizi hazır")
+        return self.results
+
+    def _ranked(self, key: str, score_field: str, min_score: float, max_results: Optional[int]) -> List[Dict]:
+        """Sıralı listeyi eşik ve sonuç sayısına göre döndürür"""
+        # Parametreler değiştiyse eldeki veriyle yeniden skorla
+        if self.coin_data and self._scored_params != self._params_signature():
+            self.score()
+
+        ranked = [item for item in self.results[key] if item.get(score_field, 0) >= min_score]
+        return ranked[:max_results] if max_results is not None else ranked
+
+    def get_opportunities(self, min_score: float = 10.0, max_results: Optional[int] = 20) -> List[Dict]:
+        """Fırsat sıralaması"""
+        return self._ranked('opportunities', 'opportunity_score', min_score, max_results)
+
+    def get_24h_profit_opportunities(self, min_score: float = 20.0, max_results: Optional[int] = 20) -> List[Dict]:
+        """24 saatlik kazanç sıralaması (eşiksiz evren gerekirse önce yüklenir)"""
+        self.load_full_universe()
+        return self._ranked('24h', 'profit_score', min_score, max_results)
+
+    def get_1h_profit_opportunities(self, min_score: float = 35.0, max_results: Optional[int] = 15) -> List[Dict]:
+        """1 saatlik kazanç sıralaması"""
+        return self._ranked('1h', 'opportunity_score', min_score, max_results)
+
+    def get_all(self, min_scores: Optional[Dict[str, float]] = None,
+                max_results: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """Üç sıralı listeyi birlikte döndürür"""
+        min_scores = min_scores or {}
+        return {
+            'opportunities': self.get_opportunities(min_scores.get('opportunities', 10.0), max_results),
+            '24h': self.get_24h_profit_opportunities(min_scores.get('24h', 20.0), max_results),
+            '1h': self.get_1h_profit_opportunities(min_scores.get('1h', 35.0), max_results),
+        }
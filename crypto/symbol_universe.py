@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Sembol Evreni Önbelleği
+Binance /exchangeInfo yanıtından işlem çiftlerini, durumlarını ve filtrelerini
+diske kaydeder; taramalar bu anlık görüntüden beslenir, yenileme arka planda yapılır
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+from .coin_classifier import CLASSIFIER_VERSION, coin_classifier
+
+
+class SymbolUniverse:
+    """Diskte kalıcı, süre sınırlı işlem çifti listesi"""
+
+    def __init__(self, fetcher, exchange_info_url: str, data_dir: Optional[str] = "data", ttl: float = 3600,
+                 classifier=None):
+        self.fetcher = fetcher
+        self.classifier = classifier or coin_classifier  # Coin türleri evrenle birlikte saklanır
+        self.exchange_info_url = exchange_info_url
+        self.data_dir = data_dir
+        self.cache_path = os.path.join(data_dir, "crypto_symbols.json") if data_dir is not None else None  # None: yalnızca bellek
+        self.ttl = ttl  # Saniye; süresi dolan anlık görüntü kullanılmaya devam eder, arka planda yenilenir
+        self.logger = logging.getLogger(__name__)
+
+        self.symbols = {}  # sembol -> {status, base_asset, quote_asset, filtreler, coin_type, coin_categories}
+        self.updated_at = None  # time.time() değeri (süreçler arası geçerli)
+
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+        self._loaded = False
+
+    @property
+    def age(self) -> float:
+        """Anlık görüntünün yaşı (saniye); hiç yoksa sonsuz"""
+        if self.updated_at is None:
+            return float('inf')
+        return max(0.0, time.time() - self.updated_at)
+
+    @property
+    def is_stale(self) -> bool:
+        return self.age >= self.ttl
+
+    def load(self) -> bool:
+        """Diskteki anlık görüntüyü yükler"""
+        self._loaded = True
+        try:
+            if self.cache_path is None or not os.path.exists(self.cache_path):
+                return False
+
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+
+            symbols = snapshot['symbols']
+            if snapshot.get('classifier_version') != CLASSIFIER_VERSION:
+                for info in symbols.values():
+                    info.pop('coin_categories', None)
+
+            self.symbols = symbols
+            self.updated_at = float(snapshot['updated_at'])
+            if self.classifier.build(symbols):
+                self._save()  # Eski anlık görüntü yeni sınıflandırmayla güncellenir
+            self.logger.info(f"Sembol evreni diskten yüklendi: {len(self.symbols)} çift, "
+                             f"{self.age / 60:.0f} dakikalık")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Sembol evreni yüklenirken hata: {e}")
+            return False
+
+    def refresh(self) -> bool:
+        """/exchangeInfo yanıtını çeker, ayrıştırır ve diske kaydeder"""
+        with self._refresh_lock:
+            try:
+                data = self.fetcher.get_json(self.exchange_info_url)
+                symbols = {info['symbol']: self._parse_symbol(info) for info in data['symbols']}
+
+                if not symbols:
+                    self.logger.warning("exchangeInfo boş döndü, mevcut sembol evreni korunuyor")
+                    return False
+
+                self.classifier.build(symbols)
+                self.symbols = symbols
+                self.updated_at = time.time()
+                self._save()
+
+                self.logger.info(f"Sembol evreni yenilendi: {len(symbols)} çift")
+                return True
+
+            except Exception as e:
+                self.logger.error(f"Sembol evreni yenilenirken hata: {e}")
+                return False
+
+    def refresh_async(self) -> threading.Thread:
+        """Yenilemeyi arka planda başlatır (zaten çalışıyorsa yenisini açmaz)"""
+        if self._refresh_thread is None or not self._refresh_thread.is_alive():
+            self._refresh_thread = threading.Thread(target=self.refresh, name="symbol-universe-refresh",
+                                                    daemon=True)
+            self._refresh_thread.start()
+        return self._refresh_thread
+
+    def ensure_fresh(self):
+        """Anlık görüntü yoksa bekleyerek, bayatsa arka planda yeniler"""
+        if not self._loaded:
+            self.load()
+
+        if not self.symbols:
+            self.refresh()
+        elif self.is_stale:
+            self.refresh_async()
+
+    def get_symbols(self, quote_asset: str = "USDT", status: Optional[str] = "TRADING") -> List[str]:
+        """Koşula uyan işlem çiftleri (anlık görüntü sırasıyla)"""
+        self.ensure_fresh()
+        return [
+            symbol for symbol, info in self.symbols.items()
+            if symbol.endswith(quote_asset) and (status is None or info['status'] == status)
+        ]
+
+    def get_info(self, symbol: str) -> Optional[Dict]:
+        """Sembolün durum ve filtre bilgisi (tick_size, step_size, min_qty, min_notional)"""
+        self.ensure_fresh()
+        return self.symbols.get(symbol)
+
+    @staticmethod
+    def _parse_symbol(info: Dict) -> Dict:
+        """exchangeInfo sembol kaydından yalnızca kullanılan alanları çıkarır"""
+        filters = {item.get('filterType'): item for item in info.get('filters', [])}
+        notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+
+        def number(value):
+            return float(value) if value is not None else None
+
+        return {
+            'status': info.get('status'),
+            'base_asset': info.get('baseAsset'),
+            'quote_asset': info.get('quoteAsset'),
+            'tick_size': number(filters.get('PRICE_FILTER', {}).get('tickSize')),
+            'step_size': number(filters.get('LOT_SIZE', {}).get('stepSize')),
+            'min_qty': number(filters.get('LOT_SIZE', {}).get('minQty')),
+            'min_notional': number(notional.get('minNotional')),
+        }
+
+    def _save(self):
+        """Anlık görüntüyü geçici dosya üzerinden atomik olarak yazar.
+
+        Dosyayı birden çok süreç paylaştığından her yazıcı kendi geçici dosyasını kullanır;
+        yazım yarıda kalırsa geçici dosya silinir, mevcut anlık görüntü değişmez.
+        """
+        if self.cache_path is None:
+            return
+        os.makedirs(self.data_dir, exist_ok=True)
+        temp = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(self.cache_path),
+                                           prefix=f".{os.path.basename(self.cache_path)}.", suffix=".tmp",
+                                           delete=False)
+        try:
+            with temp:
+                json.dump({'updated_at': self.updated_at, 'classifier_version': CLASSIFIER_VERSION,
+                           'symbols': self.symbols}, temp, separators=(',', ':'))
+            os.replace(temp.name, self.cache_path)
+        except BaseException:
+            os.unlink(temp.name)
+            raise
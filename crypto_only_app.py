@@ -22,6 +22,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Crypto analiz modülü
 from crypto.crypto_analyzer import CryptoAnalyzer
+from crypto.coin_classifier import coin_classifier
+from crypto.rate_limiter import binance_limiter, endpoint_weight
+from utils.ttl_cache import TTLCache
 
 # Sayfa konfigürasyonu
 st.set_page_config(
@@ -84,6 +87,8 @@ if "opportunities_data" not in st.session_state:
 
 if "crypto_analyzer" not in st.session_state:
     st.session_state["crypto_analyzer"] = CryptoAnalyzer()
+    # Diskteki sembol evreni coin sınıflandırma indeksini de doldurur
+    st.session_state["crypto_analyzer"].symbol_universe.load()
 
 if "refresh_watchlist" not in st.session_state:
     st.session_state["refresh_watchlist"] = False
@@ -91,21 +96,22 @@ if "refresh_watchlist" not in st.session_state:
 # Exchange rate service
 class ExchangeRateService:
     def __init__(self):
-        self.cache = {}
-        self.cache_time = {}
         self.cache_duration = 300  # 5 dakika
+        self.cache = TTLCache(ttl=self.cache_duration, max_entries=16)
     
     def get_usdt_try_rate(self):
         """USDT/TRY kurunu al"""
-        current_time = time.time()
-        
         # Cache kontrolü
-        if 'usdt_try' in self.cache and current_time - self.cache_time.get('usdt_try', 0) < self.cache_duration:
-            return self.cache['usdt_try']
+        cached_rate = self.cache.get('usdt_try')
+        if cached_rate is not None:
+            return cached_rate
         
         try:
-            # Binance API'den USDT/TRY kuru
-            response = requests.get('https://api.binance.com/api/v3/ticker/price?symbol=USDTTUSD')
+            # Binance API'den USDT/TRY kuru (analizörle aynı ağırlık bütçesinden)
+            binance_url = 'https://api.binance.com/api/v3/ticker/price?symbol=USDTTUSD'
+            binance_limiter.acquire(endpoint_weight(binance_url))
+            response = requests.get(binance_url, timeout=10)
+            binance_limiter.observe(response.status_code, response.headers)
             if response.status_code == 200:
                 usdt_usd = float(response.json()['price'])
                 
@@ -117,8 +123,7 @@ class ExchangeRateService:
                         usdt_try = usdt_usd * usd_try
                         
                         # Cache'e kaydet
-                        self.cache['usdt_try'] = usdt_try
-                        self.cache_time['usdt_try'] = current_time
+                        self.cache.set('usdt_try', usdt_try)
                         
                         print(f"INFO: Güncel USDT/TRY kuru: {usdt_try:.4f}")
                         return usdt_try
@@ -127,16 +132,14 @@ class ExchangeRateService:
                 
                 # Fallback: Sabit kur
                 usdt_try = 40.0
-                self.cache['usdt_try'] = usdt_try
-                self.cache_time['usdt_try'] = current_time
+                self.cache.set('usdt_try', usdt_try)
                 print(f"INFO: Varsayılan USDT/TRY kuru kullanılıyor: {usdt_try:.4f}")
                 return usdt_try
         except Exception as e:
             print(f"ERROR: Döviz kuru alınamadı: {e}")
             # Fallback: Sabit kur
             usdt_try = 40.0
-            self.cache['usdt_try'] = usdt_try
-            self.cache_time['usdt_try'] = current_time
+            self.cache.set('usdt_try', usdt_try)
             print(f"INFO: Varsayılan USDT/TRY kuru kullanılıyor: {usdt_try:.4f}")
             return usdt_try
 
@@ -253,93 +256,15 @@ def sell_crypto(symbol, amount_usdt, price):
 
 def filter_opportunities_by_category(opportunities, category):
     """Fırsatları kategoriye göre filtrele"""
-    if category == "ALL":
-        return opportunities
-    
-    # Kategori filtreleme mantığı
-    filtered = []
-    for opp in opportunities:
-        symbol = opp['symbol']
-        
-        if category == "MAJOR" and any(major in symbol for major in ['BTC', 'ETH', 'BNB', 'XRP', 'ADA']):
-            filtered.append(opp)
-        elif category == "ALTCOIN" and not any(major in symbol for major in ['BTC', 'ETH', 'BNB', 'XRP', 'ADA']):
-            filtered.append(opp)
-        elif category == "MEME" and any(meme in symbol for meme in ['DOGE', 'SHIB', 'PEPE', 'FLOKI']):
-            filtered.append(opp)
-        elif category == "DEFI" and any(defi in symbol for defi in ['UNI', 'AAVE', 'COMP', 'MKR']):
-            filtered.append(opp)
-        elif category == "GAMING" and any(gaming in symbol for gaming in ['AXS', 'MANA', 'SAND', 'ENJ']):
-            filtered.append(opp)
-        elif category == "LAYER1" and any(layer1 in symbol for layer1 in ['AVAX', 'MATIC', 'ATOM', 'NEAR']):
-            filtered.append(opp)
-        elif category == "LAYER2" and any(layer2 in symbol for layer2 in ['ARB', 'OP', 'IMX']):
-            filtered.append(opp)
-        elif category == "AI" and any(ai in symbol for ai in ['FET', 'OCEAN', 'AGIX', 'RNDR']):
-            filtered.append(opp)
-        elif category == "EXCHANGE" and any(exchange in symbol for exchange in ['BNB', 'OKB', 'HT', 'KCS']):
-            filtered.append(opp)
-        elif category == "UTILITY" and any(utility in symbol for utility in ['LINK', 'BAT', 'ZRX']):
-            filtered.append(opp)
-        elif category == "MICRO_CAP" and opp.get('volume_24h', 0) < 10000000:  # 10M USDT altı
-            filtered.append(opp)
-    
-    return filtered
+    # Kategoriler sembol evreni yüklenirken bir kez hesaplanır; burada yalnızca kovaya bakılır
+    return coin_classifier.filter(opportunities, category)
 
 def determine_coin_type(symbol, price, volume):
     """Coin'in türünü belirler"""
-    
-    # Major coins (ana coinler)
-    major_coins = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'XRPUSDT', 'ADAUSDT', 'SOLUSDT', 'DOTUSDT', 'LINKUSDT', 'LTCUSDT', 'BCHUSDT']
-    
-    # Stablecoins (sabit coinler)
-    stablecoins = ['USDTUSDT', 'USDCUSDT', 'BUSDUSDT', 'DAIUSDT', 'TUSDUSDT', 'FRAXUSDT']
-    
-    # Meme coins (meme coinler) - genellikle düşük fiyatlı ve yüksek hacimli
-    meme_indicators = ['DOGE', 'SHIB', 'PEPE', 'FLOKI', 'BONK', 'WIF', 'MYRO', 'POPCAT', 'BOOK', 'TURBO']
-    
-    # DeFi tokens (DeFi tokenleri)
-    defi_indicators = ['UNI', 'AAVE', 'COMP', 'MKR', 'SUSHI', 'CRV', 'BAL', 'YFI', 'SNX', '1INCH']
-    
-    # Gaming tokens (oyun tokenleri)
-    gaming_indicators = ['AXS', 'MANA', 'SAND', 'ENJ', 'GALA', 'ILV', 'ALICE', 'HERO', 'TLM', 'ALPHA']
-    
-    # Layer 1 coins (katman 1 coinler)
-    layer1_indicators = ['AVAX', 'MATIC', 'ATOM', 'NEAR', 'FTM', 'ALGO', 'ICP', 'APT', 'SUI', 'SEI']
-    
-    # Layer 2 coins (katman 2 coinler)
-    layer2_indicators = ['ARB', 'OP', 'IMX', 'ZKSYNC', 'STARK', 'POLYGON', 'OPTIMISM']
-    
-    # AI tokens (yapay zeka tokenleri)
-    ai_indicators = ['FET', 'OCEAN', 'AGIX', 'RNDR', 'TAO', 'BITTENSOR', 'AI', 'GPT', 'NEURAL']
-    
-    # Exchange tokens (borsa tokenleri)
-    exchange_indicators = ['BNB', 'OKB', 'HT', 'KCS', 'GT', 'MX', 'BGB', 'CRO', 'FTT']
-    
-    # Utility tokens (fayda tokenleri)
-    utility_indicators = ['LINK', 'CHAINLINK', 'BAT', 'ZRX', 'REP', 'KNC', 'BAND', 'API3']
-    
-    # Coin türünü belirle
-    if symbol in major_coins:
-        return "Major Coin"
-    elif symbol in stablecoins:
-        return "Stablecoin"
-    elif any(meme in symbol for meme in meme_indicators):
-        return "Meme Coin"
-    elif any(defi in symbol for defi in defi_indicators):
-        return "DeFi Token"
-    elif any(gaming in symbol for gaming in gaming_indicators):
-        return "Gaming Token"
-    elif any(layer1 in symbol for layer1 in layer1_indicators):
-        return "Layer 1"
-    elif any(layer2 in symbol for layer2 in layer2_indicators):
-        return "Layer 2"
-    elif any(ai in symbol for ai in ai_indicators):
-        return "AI Token"
-    elif any(exchange in symbol for exchange in exchange_indicators):
-        return "Exchange Token"
-    elif any(utility in symbol for utility in utility_indicators):
-        return "Utility Token"
+    # Sembole bağlı tür indeksten gelir, fiyat/hacim kuralları anlık uygulanır
+    coin_type = coin_classifier.coin_type(symbol)
+    if coin_type is not None:
+        return coin_type
     elif price < 0.01:
         return "Micro Cap"
     elif volume < 1000000:
@@ -381,6 +306,34 @@ def main():
     # Crypto analyzer'ı al
     crypto_analyzer = st.session_state["crypto_analyzer"]
     
+    # Paylaşılan tarama oturumu (sekmeler aynı taramayı kullanır)
+    st.sidebar.header("🔁 Tarama")
+    if st.sidebar.button("🔄 Taramayı Yenile", key="refresh_scan_session"):
+        with st.spinner("🔄 USDT evreni yeniden taranıyor..."):
+            crypto_analyzer.get_scan_session(force_refresh=True)
+    
+    scan_session = crypto_analyzer.scan_session
+    if scan_session and scan_session.last_updated:
+        scan_time = datetime.fromisoformat(scan_session.last_updated).strftime('%H:%M:%S')
+        st.sidebar.write(f"🕒 Son tarama: {scan_time} ({len(scan_session.coin_data)} coin)")
+    else:
+        st.sidebar.info("📝 Henüz tarama yapılmadı")
+    
+    # Canlı WebSocket akışı (tamponlar REST beklemeden güncel kalır)
+    stream_enabled = st.sidebar.checkbox("📡 Canlı Akış", value=crypto_analyzer.kline_stream is not None,
+                                         key="live_kline_stream")
+    if stream_enabled and crypto_analyzer.kline_stream is None:
+        with st.spinner("📡 Canlı akış başlatılıyor..."):
+            try:
+                crypto_analyzer.start_stream()
+            except Exception as e:
+                st.sidebar.error(f"❌ Canlı akış başlatılamadı: {e}")
+    elif not stream_enabled and crypto_analyzer.kline_stream is not None:
+        crypto_analyzer.stop_stream()
+    
+    if crypto_analyzer.kline_stream is not None:
+        st.sidebar.write(f"🟢 Canlı: {len(crypto_analyzer.kline_stream.live_symbols)} coin")
+    
     # Coin türleri tanımla
     coin_categories = {
         "Tüm Coinler": "ALL",
@@ -796,6 +749,13 @@ def main():
             st.write(f"• Minimum Değişim: %{crypto_analyzer.min_price_change}")
             st.write(f"• Fırsat Eşiği: %{crypto_analyzer.opportunity_threshold}")
             st.write(f"• Cache Süresi: {crypto_analyzer.cache_duration} saniye")
+            st.write(f"• Tarama Oturumu Süresi: {crypto_analyzer.scan_session_duration} saniye")
+            cache_stats = crypto_analyzer.cache.stats()
+            st.write(f"• Cache: {cache_stats['entries']} kayıt, {cache_stats['bytes'] / 1024 / 1024:.1f} MB, "
+                     f"isabet oranı %{cache_stats['hit_rate'] * 100:.0f}")
+            limiter_status = binance_limiter.status()
+            st.write(f"• Binance Ağırlık: {limiter_status['used']}/{limiter_status['budget']} kullanıldı, "
+                     f"{limiter_status['remaining']} kalan")
         
         with col2:
             st.write("**Veri Kaynakları:**")
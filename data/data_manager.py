@@ -7,10 +7,180 @@ import json
 import os
 import sqlite3
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import warnings
 warnings.filterwarnings('ignore')
 
+from utils.sqlite_pool import SQLitePool
+from data.retention import RetentionJob
+
+# Şema sürümleri (PRAGMA user_version); her adım bir kez, sırayla ve tek işlemde uygulanır
+SCHEMA_MIGRATIONS = [
+    (1, "Sıcak sorgular için ikincil indeksler", [
+        "CREATE INDEX IF NOT EXISTS idx_stock_data_symbol_timestamp ON stock_data (symbol, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_news_data_symbol_timestamp ON news_data (symbol, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_analysis_results_symbol_type "
+        "ON analysis_results (symbol, analysis_type, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_virtual_portfolio_user_created ON virtual_portfolio (user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_virtual_transactions_user_created "
+        "ON virtual_transactions (user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_virtual_performance_user_status "
+        "ON virtual_performance (user_id, status, created_at)",
+    ]),
+    (2, "Günlük mum sütunları ve toplu yazma için tekil anahtarlar", [
+        "ALTER TABLE stock_data ADD COLUMN date TEXT",
+        "ALTER TABLE stock_data ADD COLUMN open REAL",
+        "ALTER TABLE stock_data ADD COLUMN high REAL",
+        "ALTER TABLE stock_data ADD COLUMN low REAL",
+        "ALTER TABLE stock_data ADD COLUMN close REAL",
+        # Anlık fiyat kayıtlarında date boştur; NULL değerler tekillik kısıtına takılmaz
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_stock_data_symbol_date ON stock_data (symbol, date)",
+        "DELETE FROM news_data WHERE url IS NOT NULL AND id NOT IN "
+        "(SELECT MAX(id) FROM news_data WHERE url IS NOT NULL GROUP BY symbol, url)",
+        "DROP INDEX IF EXISTS idx_news_data_symbol_url",
+        "CREATE UNIQUE INDEX idx_news_data_symbol_url ON news_data (symbol, url)",
+    ]),
+    (3, "Saklama politikası: özet tabloları ve eski kayıt indeksleri", [
+        '''CREATE TABLE IF NOT EXISTS stock_data_weekly (
+            symbol TEXT NOT NULL,
+            week_start TEXT NOT NULL,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL,
+            volume REAL,
+            PRIMARY KEY (symbol, week_start)
+        ) WITHOUT ROWID''',
+        '''CREATE TABLE IF NOT EXISTS news_daily (
+            symbol TEXT NOT NULL,
+            date TEXT NOT NULL,
+            news_count INTEGER NOT NULL,
+            sentiment_score REAL,
+            positive_count INTEGER DEFAULT 0,
+            negative_count INTEGER DEFAULT 0,
+            neutral_count INTEGER DEFAULT 0,
+            PRIMARY KEY (symbol, date)
+        ) WITHOUT ROWID''',
+        '''CREATE TABLE IF NOT EXISTS maintenance_log (
+            task TEXT PRIMARY KEY,
+            last_run TEXT NOT NULL
+        )''',
+        # Saklama işi en eski anlık kayıtları ve haberleri bulur
+        "CREATE INDEX IF NOT EXISTS idx_stock_data_snapshot_time ON stock_data (timestamp) WHERE date IS NULL",
+        "CREATE INDEX IF NOT EXISTS idx_news_data_timestamp ON news_data (timestamp)",
+    ]),
+    (4, "Haftalık mumların kapsadığı ilk ve son gün", [
+        "ALTER TABLE stock_data_weekly ADD COLUMN first_date TEXT",
+        "ALTER TABLE stock_data_weekly ADD COLUMN last_date TEXT",
+        # Kapsamı bilinmeyen eski haftalar tüm haftayı kapsamış sayılır (yeniden eklenmez)
+        "UPDATE stock_data_weekly SET first_date = week_start, last_date = date(week_start, '+6 days')",
+    ]),
+]
+
+# Toplu yazma: aynı (sembol, tarih) mumu ve aynı (sembol, url) haberi güncellenir;
+# değişmeyen mumlara dokunulmaz (yenilemelerde yalnızca son mumlar yazılır)
+STOCK_BARS_UPSERT = '''
+    INSERT INTO stock_data (symbol, date, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (symbol, date) DO UPDATE SET
+        open = excluded.open, high = excluded.high, low = excluded.low,
+        close = excluded.close, volume = excluded.volume, timestamp = CURRENT_TIMESTAMP
+    WHERE (open, high, low, close, volume) IS NOT (excluded.open, excluded.high, excluded.low,
+                                                  excluded.close, excluded.volume)
+'''
+
+NEWS_UPSERT = '''
+    INSERT INTO news_data (symbol, title, sentiment, sentiment_score, source, url, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    ON CONFLICT (symbol, url) DO UPDATE SET
+        title = excluded.title, sentiment = excluded.sentiment,
+        sentiment_score = excluded.sentiment_score, source = excluded.source
+'''
+
+STOCK_BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Sık çalışan sorgular (metotlar ve sorgu planı denetimi aynı metni kullanır)
+STOCK_BARS_QUERY = '''
+    SELECT date, open, high, low, close, volume
+    FROM stock_data 
+    WHERE symbol = ? AND date IS NOT NULL
+    ORDER BY date DESC
+    LIMIT ?
+'''
+
+USER_ID_QUERY = 'SELECT id FROM virtual_users WHERE username = ?'
+
+USER_PORTFOLIO_QUERY = '''
+    SELECT symbol, shares, avg_price, purchase_date
+    FROM virtual_portfolio 
+    WHERE user_id = ?
+    ORDER BY created_at DESC
+'''
+
+PORTFOLIO_POSITION_QUERY = '''
+    SELECT shares, avg_price FROM virtual_portfolio 
+    WHERE user_id = ? AND symbol = ?
+'''
+
+USER_TRANSACTIONS_QUERY = '''
+    SELECT symbol, transaction_type, shares, price, total_amount, transaction_date
+    FROM virtual_transactions 
+    WHERE user_id = ?
+    ORDER BY created_at DESC
+    LIMIT ?
+'''
+
+PERFORMANCE_SUMMARY_QUERY = '''
+    SELECT symbol, initial_investment, current_value, profit_loss, profit_loss_percent, tracking_start_date
+    FROM virtual_performance 
+    WHERE user_id = ? AND status = 'active'
+    ORDER BY profit_loss_percent DESC
+'''
+
+PERFORMANCE_TRACKING_QUERY = '''
+    SELECT symbol, initial_investment, current_value, profit_loss, profit_loss_percent, 
+           tracking_start_date, days_held, status
+    FROM virtual_performance 
+    WHERE user_id = ? AND status = 'active'
+    ORDER BY created_at DESC
+'''
+
+# Günlük performans takibi: gün sayısı ve 7 gün dolunca tamamlanma tek ifadede (tarih parametresi: bugün);
+# gün sayısı değişmeyen kayıtlar yeniden yazılmaz, aynı gün tekrar çalıştırmak bir şey yapmaz
+PERFORMANCE_TRACKING_DAYS = 7
+
+PERFORMANCE_TRACKING_UPDATE = f'''
+    UPDATE virtual_performance 
+    SET days_held = CAST(julianday(:today) - julianday(tracking_start_date) AS INTEGER),
+        status = CASE WHEN julianday(:today) - julianday(tracking_start_date) >= {PERFORMANCE_TRACKING_DAYS}
+                      THEN 'completed' ELSE status END,
+        tracking_end_date = CASE WHEN julianday(:today) - julianday(tracking_start_date) >= {PERFORMANCE_TRACKING_DAYS}
+                                 THEN :today ELSE tracking_end_date END
+    WHERE status = 'active'
+      AND days_held IS NOT CAST(julianday(:today) - julianday(tracking_start_date) AS INTEGER)
+'''
+
+NEWS_FOR_SYMBOL_QUERY = '''
+    SELECT title, sentiment, sentiment_score, source, url, timestamp
+    FROM news_data 
+    WHERE symbol = ?
+    ORDER BY timestamp DESC
+    LIMIT ?
+'''
+
+# Tablo büyüdükçe tam taramaya düşmemesi gereken sorgular ve örnek parametreleri
+HOT_QUERIES = {
+    'get_stock_data': (STOCK_BARS_QUERY, ('THYAO', 365)),
+    'user_id': (USER_ID_QUERY, ('gokhan',)),
+    'get_user_portfolio': (USER_PORTFOLIO_QUERY, (1,)),
+    'sell_stock': (PORTFOLIO_POSITION_QUERY, (1, 'THYAO')),
+    'get_user_transactions': (USER_TRANSACTIONS_QUERY, (1, 50)),
+    'get_performance_summary': (PERFORMANCE_SUMMARY_QUERY, (1,)),
+    'get_performance_tracking': (PERFORMANCE_TRACKING_QUERY, (1,)),
+    'get_news_for_symbol': (NEWS_FOR_SYMBOL_QUERY, ('THYAO', 10)),
+}
+
 class DataManager:
     def __init__(self, data_dir="data"):
         self.data_dir = data_dir
@@ -20,12 +190,18 @@ class DataManager:
         # Klasörleri oluştur
         os.makedirs(data_dir, exist_ok=True)
         
+        # İş parçacığı başına kalıcı bağlantılar (PRAGMA'lar bağlantı açılırken bir kez)
+        self.db = SQLitePool(self.db_path)
+        
+        # Kullanıcı adı -> id önbelleği (id değişmez; silinen/yeniden oluşturulan kullanıcıda geçersiz kılınır)
+        self._user_ids = {}
+        
         # Veritabanını başlat
         self.init_database()
         
     def init_database(self):
         """Veritabanı tablolarını oluşturur"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connection()
         cursor = conn.cursor()
         
         # Hisse verileri tablosu
@@ -131,14 +307,98 @@ class DataManager:
             ''')
         
         conn.commit()
-        conn.close()
+        
+        # Şema geçişlerini uygula (indeksler vb.)
+        self.migrate()
         
         # Varsayılan kullanıcıları oluştur
         self.create_default_users()
     
+    def migrate(self):
+        """Bekleyen şema geçişlerini sırayla uygular; uygulanan son sürümü döndürür (hata olursa RuntimeError)"""
+        conn = self.db.connection()
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        
+        for target, description, statements in SCHEMA_MIGRATIONS:
+            if target <= version:
+                continue
+            try:
+                # Aynı anda açılan başka süreç aynı adımı uygulamışsa atlanır
+                conn.execute('BEGIN IMMEDIATE')
+                version = conn.execute('PRAGMA user_version').fetchone()[0]
+                if target > version:
+                    for statement in statements:
+                        conn.execute(statement)
+                    conn.execute(f'PRAGMA user_version = {int(target)}')
+                    version = target
+                conn.commit()
+            except Exception as e:
+                # Sonraki kod bu sürümün tablolarına ve indekslerine dayanır: eski şemayla devam edilmez
+                conn.rollback()
+                print(f"Şema geçişi hatası (v{target} - {description}): {e}")
+                raise RuntimeError(f"Şema geçişi v{target} uygulanamadı ({description}); "
+                                   f"veritabanı v{version} sürümünde kaldı: {e}") from e
+        
+        return version
+    
+    def explain_hot_queries(self):
+        """Sıcak sorguların EXPLAIN QUERY PLAN çıktısı (sorgu adı -> plan satırları)"""
+        conn = self.db.connection()
+        plans = {}
+        for name, (query, params) in HOT_QUERIES.items():
+            rows = conn.execute(f'EXPLAIN QUERY PLAN {query}', params).fetchall()
+            plans[name] = [row[-1] for row in rows]
+        return plans
+    
+    def audit_query_plans(self):
+        """Tablo taramasına düşen sıcak sorgular (sorgu adı -> tarama satırları; boşsa sorun yok)"""
+        regressions = {}
+        for name, plan in self.explain_hot_queries().items():
+            scans = [detail for detail in plan if detail.startswith('SCAN ')]
+            if scans:
+                regressions[name] = scans
+        return regressions
+    
+    def run_retention(self, policy=None, max_batches=None):
+        """Saklama işini çalıştırır (bkz. data.retention); rapor sözlüğü döndürür"""
+        return RetentionJob(self, policy).run(max_batches=max_batches)
+    
+    def connection_stats(self):
+        """Veritabanı bağlantı havuzu istatistikleri"""
+        return self.db.status()
+    
+    def close(self):
+        """Tüm veritabanı bağlantılarını kapatır"""
+        self.db.close_all()
+    
+    def _user_id(self, conn, username):
+        """Kullanıcı id'si (önbellekten; yoksa veritabanından bir kez çözülür)"""
+        user_id = self._user_ids.get(username)
+        if user_id is None:
+            row = conn.execute(USER_ID_QUERY, (username,)).fetchone()
+            if row is None:
+                return None
+            user_id = self._user_ids[username] = row[0]
+        return user_id
+    
+    def _is_stale_user(self, conn, username, user_id):
+        """Önbellekteki id artık bu kullanıcıya ait değilse önbelleği temizler (yalnızca başarısız yolda)"""
+        row = conn.execute('SELECT 1 FROM virtual_users WHERE id = ? AND username = ?', (user_id, username)).fetchone()
+        if row is None:
+            self.invalidate_user_cache(username)
+            return True
+        return False
+    
+    def invalidate_user_cache(self, username=None):
+        """Kullanıcı id önbelleğini temizler (kullanıcı silindiğinde/yeniden oluşturulduğunda)"""
+        if username is None:
+            self._user_ids.clear()
+        else:
+            self._user_ids.pop(username, None)
+    
     def create_default_users(self):
         """Varsayılan sanal kullanıcıları oluştur"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             
             # Kullanıcıları kontrol et ve yoksa ekle
@@ -160,66 +420,89 @@ class DataManager:
         if not data or 'historical_data' not in data:
             return False
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            for record in data['historical_data']:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO stock_data 
-                    (symbol, date, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    symbol,
-                    record['Date'],
-                    record.get('Open'),
-                    record.get('High'),
-                    record.get('Low'),
-                    record.get('Close'),
-                    record.get('Volume', 0)
-                ))
-            
-            conn.commit()
-            return True
+        return self.save_stock_data_bulk({symbol: data['historical_data']}) > 0
+    
+    def save_stock_data_bulk(self, data):
+        """Birden çok hissenin günlük mumlarını tek işlemde kaydeder.
+        
+        `data` sembol -> DataFrame (tarih indeksli veya date sütunlu) / kayıt listesi
+        sözlüğü ya da symbol sütunlu tek bir DataFrame olabilir. Aynı (sembol, tarih)
+        mumu güncellenir. Yazılan satır sayısını döndürür.
+        """
+        try:
+            if isinstance(data, pd.DataFrame):
+                frame = data.rename(columns=str.lower)
+                data = {symbol: group for symbol, group in frame.groupby('symbol', sort=False)}
+            
+            rows = []
+            for symbol, records in data.items():
+                rows.extend(self._stock_rows(symbol, records))
+            if not rows:
+                return 0
+            
+            with self.db.connection() as conn:
+                conn.executemany(STOCK_BARS_UPSERT, rows)
+            return len(rows)
+        
+        except Exception as e:
+            print(f"Toplu hisse verisi kaydetme hatası: {e}")
+            return 0
+    
+    @staticmethod
+    def _stock_rows(symbol, records):
+        """Mum kayıtlarını (sembol, tarih, açılış, yüksek, düşük, kapanış, hacim) satırlarına çevirir"""
+        if not isinstance(records, pd.DataFrame):
+            records = pd.DataFrame(list(records))
+        if records.empty:
+            return []
+        
+        frame = records.rename(columns=str.lower)
+        dates = pd.DatetimeIndex(frame['date'] if 'date' in frame.columns else frame.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        
+        # Sütun bazlı numpy dönüşümü; satır başına sözlük oluşturulmaz (NaN SQLite'a NULL olarak yazılır)
+        length = len(frame)
+        columns = []
+        for name in STOCK_BAR_COLUMNS:
+            if name in frame.columns:
+                column = frame[name].to_numpy(dtype=float)
+                columns.append((np.nan_to_num(column) if name == 'volume' else column).tolist())
+            else:
+                columns.append([0.0 if name == 'volume' else None] * length)
+        return list(zip([symbol] * length, np.datetime_as_string(dates.values, unit='D').tolist(), *columns))
     
     def get_stock_data(self, symbol, days=365):
         """Hisse verilerini getir"""
-        with sqlite3.connect(self.db_path) as conn:
-            query = '''
-                SELECT date, open, high, low, close, volume
-                FROM stock_data 
-                WHERE symbol = ?
-                ORDER BY date DESC
-                LIMIT ?
-            '''
-            
-            df = pd.read_sql_query(query, conn, params=(symbol, days))
+        with self.db.connection() as conn:
+            df = pd.read_sql_query(STOCK_BARS_QUERY, conn, params=(symbol, days))
             return df.to_dict('records') if not df.empty else []
     
     def save_analysis_result(self, symbol, analysis_type, results):
         """Analiz sonuçlarını kaydet"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                INSERT INTO analysis_results (symbol, analysis_date, analysis_type, results)
-                VALUES (?, ?, ?, ?)
-            ''', (symbol, datetime.now().strftime('%Y-%m-%d'), analysis_type, json.dumps(results)))
+                INSERT INTO analysis_results (symbol, analysis_type, result)
+                VALUES (?, ?, ?)
+            ''', (symbol, analysis_type, json.dumps(results)))
             conn.commit()
     
     def get_analysis_results(self, symbol, analysis_type=None):
-        """Analiz sonuçlarını getir"""
-        with sqlite3.connect(self.db_path) as conn:
+        """Analiz sonuçlarını getir (en yeni önce)"""
+        with self.db.connection() as conn:
             if analysis_type:
                 query = '''
                     SELECT * FROM analysis_results 
                     WHERE symbol = ? AND analysis_type = ?
-                    ORDER BY created_at DESC
+                    ORDER BY timestamp DESC, id DESC
                 '''
                 df = pd.read_sql_query(query, conn, params=(symbol, analysis_type))
             else:
                 query = '''
                     SELECT * FROM analysis_results 
                     WHERE symbol = ?
-                    ORDER BY created_at DESC
+                    ORDER BY timestamp DESC, id DESC
                 '''
                 df = pd.read_sql_query(query, conn, params=(symbol,))
             
@@ -227,7 +510,7 @@ class DataManager:
     
     def get_user_balance(self, username):
         """Kullanıcı bakiyesini getir"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT balance FROM virtual_users WHERE username = ?', (username,))
             result = cursor.fetchone()
@@ -236,9 +519,7 @@ class DataManager:
     def update_user_balance(self, username, new_balance):
         """Kullanıcı bakiyesini güncelle"""
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False) as conn:
-                conn.execute('PRAGMA journal_mode=WAL')
-                conn.execute('PRAGMA synchronous=NORMAL')
+            with self.db.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     UPDATE virtual_users 
@@ -255,49 +536,49 @@ class DataManager:
         """Hisse satın al"""
         try:
             total_cost = shares * price
-            current_balance = self.get_user_balance(username)
-            
-            if current_balance < total_cost:
-                return False, "Yetersiz bakiye"
-            
-            with sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False) as conn:
-                conn.execute('PRAGMA journal_mode=WAL')
-                conn.execute('PRAGMA synchronous=NORMAL')
-                cursor = conn.cursor()
-                
-                # Kullanıcı ID'sini al
-                cursor.execute('SELECT id FROM virtual_users WHERE username = ?', (username,))
-                user_id = cursor.fetchone()[0]
-                
-                # Bakiyeyi doğrudan güncelle
-                cursor.execute('''
-                    UPDATE virtual_users 
-                    SET balance = balance - ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE username = ?
-                ''', (total_cost, username))
-                
-                # Portföye ekle
-                cursor.execute('''
-                    INSERT INTO virtual_portfolio (user_id, symbol, shares, avg_price, purchase_date)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (user_id, symbol, shares, price, datetime.now().strftime('%Y-%m-%d')))
-                
-                # İşlem geçmişine ekle
-                cursor.execute('''
-                    INSERT INTO virtual_transactions 
-                    (user_id, symbol, transaction_type, shares, price, total_amount, transaction_date)
-                    VALUES (?, ?, 'BUY', ?, ?, ?, ?)
-                ''', (user_id, symbol, shares, price, total_cost, datetime.now().strftime('%Y-%m-%d')))
-                
-                # Performans takibini başlat
-                cursor.execute('''
-                    INSERT INTO virtual_performance 
-                    (user_id, symbol, initial_investment, current_value, profit_loss, profit_loss_percent, tracking_start_date)
-                    VALUES (?, ?, ?, ?, 0, 0, ?)
-                ''', (user_id, symbol, total_cost, total_cost, datetime.now().strftime('%Y-%m-%d')))
-                
-                conn.commit()
-                return True, "Alım işlemi başarılı"
+            today = datetime.now().strftime('%Y-%m-%d')
+            
+            # Önbellekteki id geçersizse (kullanıcı yeniden oluşturulmuş) bir kez yeniden çözülür
+            for _ in range(2):
+                # Bakiye kontrolü, güncelleme ve kayıtlar tek işlemde (eşzamanlı alımlar bakiyeyi aşamaz)
+                with self.db.transaction() as conn:
+                    user_id = self._user_id(conn, username)
+                    if user_id is None:
+                        return False, "Kullanıcı bulunamadı"
+                    
+                    # Bakiyeyi kontrol ederek güncelle
+                    updated = conn.execute('''
+                        UPDATE virtual_users 
+                        SET balance = balance - ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ? AND username = ? AND balance >= ?
+                    ''', (total_cost, user_id, username, total_cost)).rowcount
+                    if not updated:
+                        if self._is_stale_user(conn, username, user_id):
+                            continue
+                        return False, "Yetersiz bakiye"
+                    
+                    # Portföye ekle
+                    conn.execute('''
+                        INSERT INTO virtual_portfolio (user_id, symbol, shares, avg_price, purchase_date)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (user_id, symbol, shares, price, today))
+                    
+                    # İşlem geçmişine ekle
+                    conn.execute('''
+                        INSERT INTO virtual_transactions 
+                        (user_id, symbol, transaction_type, shares, price, total_amount, transaction_date)
+                        VALUES (?, ?, 'BUY', ?, ?, ?, ?)
+                    ''', (user_id, symbol, shares, price, total_cost, today))
+                    
+                    # Performans takibini başlat
+                    conn.execute('''
+                        INSERT INTO virtual_performance 
+                        (user_id, symbol, initial_investment, current_value, profit_loss, profit_loss_percent, tracking_start_date)
+                        VALUES (?, ?, ?, ?, 0, 0, ?)
+                    ''', (user_id, symbol, total_cost, total_cost, today))
+                    
+                    return True, "Alım işlemi başarılı"
+            return False, "Kullanıcı bulunamadı"
         except Exception as e:
             print(f"Alım işlemi hatası: {e}")
             return False, f"Alım işlemi başarısız: {str(e)}"
@@ -305,99 +586,91 @@ class DataManager:
     def sell_stock(self, username, symbol, shares, price):
         """Hisse sat"""
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False) as conn:
-                conn.execute('PRAGMA journal_mode=WAL')
-                conn.execute('PRAGMA synchronous=NORMAL')
-                cursor = conn.cursor()
-                
-                # Kullanıcı ID'sini al
-                cursor.execute('SELECT id FROM virtual_users WHERE username = ?', (username,))
-                user_id = cursor.fetchone()[0]
-                
-                # Portföyde hisse var mı kontrol et
-                cursor.execute('''
-                    SELECT shares, avg_price FROM virtual_portfolio 
-                    WHERE user_id = ? AND symbol = ?
-                ''', (user_id, symbol))
-                
-                portfolio_result = cursor.fetchone()
-                if not portfolio_result:
-                    return False, "Portföyde bu hisse bulunmuyor"
-                
-                current_shares, avg_price = portfolio_result
-                
-                if shares > current_shares:
-                    return False, "Yetersiz hisse miktarı"
-                
-                total_revenue = shares * price
-                
-                # Bakiyeyi doğrudan güncelle
-                cursor.execute('''
-                    UPDATE virtual_users 
-                    SET balance = balance + ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE username = ?
-                ''', (total_revenue, username))
-                
-                # Portföyü güncelle
-                remaining_shares = current_shares - shares
-                if remaining_shares == 0:
-                    cursor.execute('''
-                        DELETE FROM virtual_portfolio 
-                        WHERE user_id = ? AND symbol = ?
-                    ''', (user_id, symbol))
-                else:
-                    cursor.execute('''
-                        UPDATE virtual_portfolio 
-                        SET shares = ? WHERE user_id = ? AND symbol = ?
-                    ''', (remaining_shares, user_id, symbol))
-                
-                # İşlem geçmişine ekle
-                cursor.execute('''
-                    INSERT INTO virtual_transactions 
-                    (user_id, symbol, transaction_type, shares, price, total_amount, transaction_date)
-                    VALUES (?, ?, 'SELL', ?, ?, ?, ?)
-                ''', (user_id, symbol, shares, price, total_revenue, datetime.now().strftime('%Y-%m-%d')))
-                
-                # Performans takibini güncelle
-                profit_loss = total_revenue - (shares * avg_price)
-                profit_loss_percent = (profit_loss / (shares * avg_price)) * 100 if shares * avg_price > 0 else 0
-                
-                cursor.execute('''
-                    UPDATE virtual_performance 
-                    SET current_value = current_value - ?, 
-                        profit_loss = profit_loss + ?,
-                        profit_loss_percent = ?,
-                        tracking_end_date = ?,
-                        status = 'completed'
-                    WHERE user_id = ? AND symbol = ? AND status = 'active'
-                ''', (shares * avg_price, profit_loss, profit_loss_percent, datetime.now().strftime('%Y-%m-%d'), user_id, symbol))
-                
-                conn.commit()
-                return True, f"Satım işlemi başarılı. Kar/Zarar: {profit_loss:+.2f} TL (%{profit_loss_percent:+.2f})"
+            today = datetime.now().strftime('%Y-%m-%d')
+            
+            for _ in range(2):
+                # Pozisyon kontrolü ve güncellemeler tek işlemde
+                with self.db.transaction() as conn:
+                    user_id = self._user_id(conn, username)
+                    if user_id is None:
+                        return False, "Kullanıcı bulunamadı"
+                    
+                    # Portföyde hisse var mı kontrol et
+                    portfolio_result = conn.execute(PORTFOLIO_POSITION_QUERY, (user_id, symbol)).fetchone()
+                    if not portfolio_result:
+                        if self._is_stale_user(conn, username, user_id):
+                            continue
+                        return False, "Portföyde bu hisse bulunmuyor"
+                    
+                    current_shares, avg_price = portfolio_result
+                    
+                    if shares > current_shares:
+                        return False, "Yetersiz hisse miktarı"
+                    
+                    total_revenue = shares * price
+                    
+                    # Bakiyeyi doğrudan güncelle
+                    updated = conn.execute('''
+                        UPDATE virtual_users 
+                        SET balance = balance + ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ? AND username = ?
+                    ''', (total_revenue, user_id, username)).rowcount
+                    if not updated:
+                        self.invalidate_user_cache(username)
+                        continue
+                    
+                    # Portföyü güncelle
+                    remaining_shares = current_shares - shares
+                    if remaining_shares == 0:
+                        conn.execute('''
+                            DELETE FROM virtual_portfolio 
+                            WHERE user_id = ? AND symbol = ?
+                        ''', (user_id, symbol))
+                    else:
+                        conn.execute('''
+                            UPDATE virtual_portfolio 
+                            SET shares = ? WHERE user_id = ? AND symbol = ?
+                        ''', (remaining_shares, user_id, symbol))
+                    
+                    # İşlem geçmişine ekle
+                    conn.execute('''
+                        INSERT INTO virtual_transactions 
+                        (user_id, symbol, transaction_type, shares, price, total_amount, transaction_date)
+                        VALUES (?, ?, 'SELL', ?, ?, ?, ?)
+                    ''', (user_id, symbol, shares, price, total_revenue, today))
+                    
+                    # Performans takibini güncelle
+                    profit_loss = total_revenue - (shares * avg_price)
+                    profit_loss_percent = (profit_loss / (shares * avg_price)) * 100 if shares * avg_price > 0 else 0
+                    
+                    conn.execute('''
+                        UPDATE virtual_performance 
+                        SET current_value = current_value - ?, 
+                            profit_loss = profit_loss + ?,
+                            profit_loss_percent = ?,
+                            tracking_end_date = ?,
+                            status = 'completed'
+                        WHERE user_id = ? AND symbol = ? AND status = 'active'
+                    ''', (shares * avg_price, profit_loss, profit_loss_percent, today, user_id, symbol))
+                    
+                    return True, f"Satım işlemi başarılı. Kar/Zarar: {profit_loss:+.2f} TL (%{profit_loss_percent:+.2f})"
+            return False, "Kullanıcı bulunamadı"
         except Exception as e:
             print(f"Satım işlemi hatası: {e}")
             return False, f"Satım işlemi başarısız: {str(e)}"
     
     def get_user_portfolio(self, username):
         """Kullanıcı portföyünü getir"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             
             # Kullanıcı ID'sini al
-            cursor.execute('SELECT id FROM virtual_users WHERE username = ?', (username,))
-            user_result = cursor.fetchone()
-            if not user_result:
+            user_id = self._user_id(conn, username)
+            if user_id is None:
                 return []
             
-            user_id = user_result[0]
-            
             # Portföyü getir
-            cursor.execute('''
-                SELECT symbol, shares, avg_price, purchase_date
-                FROM virtual_portfolio 
-                WHERE user_id = ?
-                ORDER BY created_at DESC
-            ''', (user_id,))
+            cursor.execute(USER_PORTFOLIO_QUERY, (user_id,))
             
             portfolio = []
             for row in cursor.fetchall():
@@ -412,25 +685,16 @@ class DataManager:
     
     def get_user_transactions(self, username, limit=50):
         """Kullanıcı işlem geçmişini getir"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             
             # Kullanıcı ID'sini al
-            cursor.execute('SELECT id FROM virtual_users WHERE username = ?', (username,))
-            user_result = cursor.fetchone()
-            if not user_result:
+            user_id = self._user_id(conn, username)
+            if user_id is None:
                 return []
             
-            user_id = user_result[0]
-            
             # İşlem geçmişini getir
-            cursor.execute('''
-                SELECT symbol, transaction_type, shares, price, total_amount, transaction_date
-                FROM virtual_transactions 
-                WHERE user_id = ?
-                ORDER BY created_at DESC
-                LIMIT ?
-            ''', (user_id, limit))
+            cursor.execute(USER_TRANSACTIONS_QUERY, (user_id, limit))
             
             transactions = []
             for row in cursor.fetchall():
@@ -446,69 +710,42 @@ class DataManager:
             return transactions
     
     def update_performance_tracking(self, username):
-        """Performans takibini güncelle (günlük)"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        """Performans takibini güncelle (günlük); güncellenen kayıt sayısını döndürür"""
+        with self.db.connection() as conn:
             # Kullanıcı ID'sini al
-            cursor.execute('SELECT id FROM virtual_users WHERE username = ?', (username,))
-            user_result = cursor.fetchone()
-            if not user_result:
-                return
-            
-            user_id = user_result[0]
-            
-            # Aktif performans kayıtlarını güncelle
-            cursor.execute('''
-                SELECT id, symbol, tracking_start_date FROM virtual_performance 
-                WHERE user_id = ? AND status = 'active'
-            ''', (user_id,))
-            
-            for row in cursor.fetchall():
-                perf_id, symbol, start_date = row
-                
-                # Gün sayısını hesapla
-                start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-                days_held = (datetime.now() - start_dt).days
-                
-                # 7 gün kontrolü
-                if days_held >= 7:
-                    cursor.execute('''
-                        UPDATE virtual_performance 
-                        SET status = 'completed', days_held = ?, tracking_end_date = ?
-                        WHERE id = ?
-                    ''', (days_held, datetime.now().strftime('%Y-%m-%d'), perf_id))
-                else:
-                    cursor.execute('''
-                        UPDATE virtual_performance 
-                        SET days_held = ?
-                        WHERE id = ?
-                    ''', (days_held, perf_id))
-            
-            conn.commit()
+            user_id = self._user_id(conn, username)
+            if user_id is None:
+                return 0
+            
+            # Aktif performans kayıtlarını tek ifadede güncelle
+            cursor = conn.execute(PERFORMANCE_TRACKING_UPDATE + ' AND user_id = :user_id',
+                                  {'today': datetime.now().strftime('%Y-%m-%d'), 'user_id': user_id})
+            return cursor.rowcount
+    
+    def update_all_performance_tracking(self):
+        """Tüm kullanıcıların performans takibini tek ifadede günceller (gece işi); güncellenen kayıt sayısını döndürür"""
+        try:
+            with self.db.connection() as conn:
+                cursor = conn.execute(PERFORMANCE_TRACKING_UPDATE, {'today': datetime.now().strftime('%Y-%m-%d')})
+                return cursor.rowcount
+        except Exception as e:
+            print(f"Performans takibi güncelleme hatası: {e}")
+            return 0
     
     def get_performance_summary(self, username):
         """Kullanıcının performans özetini getir"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self.db.connection() as conn:
             # Kullanıcı ID'sini al
-            cursor.execute('SELECT id FROM virtual_users WHERE username = ?', (username,))
-            user_id = cursor.fetchone()[0]
-            
-            query = '''
-                SELECT symbol, initial_investment, current_value, profit_loss, profit_loss_percent, tracking_start_date
-                FROM virtual_performance 
-                WHERE user_id = ? AND status = 'active'
-                ORDER BY profit_loss_percent DESC
-            '''
+            user_id = self._user_id(conn, username)
+            if user_id is None:
+                return []
             
-            df = pd.read_sql_query(query, conn, params=(user_id,))
+            df = pd.read_sql_query(PERFORMANCE_SUMMARY_QUERY, conn, params=(user_id,))
             return df.to_dict('records') if not df.empty else []
     
     def get_all_users(self):
         """Tüm kullanıcıları getir"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             query = 'SELECT username, balance FROM virtual_users ORDER BY username'
             df = pd.read_sql_query(query, conn)
             return df.to_dict('records') if not df.empty else []
@@ -516,7 +753,7 @@ class DataManager:
     # Watchlist fonksiyonları
     def add_to_watchlist(self, symbol, name=""):
         """Takip listesine hisse ekle"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             
             # Watchlist tablosunu oluştur
@@ -541,7 +778,7 @@ class DataManager:
     
     def remove_from_watchlist(self, symbol):
         """Takip listesinden hisse çıkar"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM watchlist WHERE symbol = ?', (symbol,))
             conn.commit()
@@ -549,7 +786,7 @@ class DataManager:
     
     def get_watchlist(self):
         """Takip listesini getir"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             
             # Watchlist tablosunu oluştur
@@ -568,30 +805,46 @@ class DataManager:
     
     def save_news_data(self, news_data):
         """Haber verilerini kaydet"""
-        # Bu fonksiyon şimdilik boş bırakılıyor
-        pass 
+        if not news_data:
+            return 0
+        return self.save_news_bulk({news_data['symbol']: news_data.get('news_list', [])})
+    
+    def save_news_bulk(self, news_by_symbol):
+        """Birden çok hissenin haberlerini tek işlemde kaydeder (aynı sembol ve url güncellenir)"""
+        try:
+            rows = []
+            for symbol, news_list in news_by_symbol.items():
+                for news in news_list:
+                    sentiment = news.get('sentiment')
+                    if isinstance(sentiment, dict):
+                        sentiment, score = sentiment.get('sentiment'), sentiment.get('score')
+                    else:
+                        score = news.get('sentiment_score')
+                    rows.append((symbol, news.get('title'), sentiment, score, news.get('source'),
+                                 news.get('url'), news.get('date')))
+            if not rows:
+                return 0
+            
+            with self.db.connection() as conn:
+                conn.executemany(NEWS_UPSERT, rows)
+            return len(rows)
+        
+        except Exception as e:
+            print(f"Toplu haber kaydetme hatası: {e}")
+            return 0
 
     def get_performance_tracking(self, username, days=7):
         """7 günlük performans takibi"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             
             # Kullanıcı ID'sini al
-            cursor.execute('SELECT id FROM virtual_users WHERE username = ?', (username,))
-            user_result = cursor.fetchone()
-            if not user_result:
+            user_id = self._user_id(conn, username)
+            if user_id is None:
                 return []
             
-            user_id = user_result[0]
-            
             # Performans verilerini getir
-            cursor.execute('''
-                SELECT symbol, initial_investment, current_value, profit_loss, profit_loss_percent, 
-                       tracking_start_date, days_held, status
-                FROM virtual_performance 
-                WHERE user_id = ? AND status = 'active'
-                ORDER BY created_at DESC
-            ''', (user_id,))
+            cursor.execute(PERFORMANCE_TRACKING_QUERY, (user_id,))
             
             performance = []
             for row in cursor.fetchall():
@@ -614,16 +867,10 @@ class DataManager:
     
     def get_news_for_symbol(self, symbol, limit=10):
         """Hisse için haber verilerini getir"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT title, sentiment, sentiment_score, source, url, timestamp
-                FROM news_data 
-                WHERE symbol = ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            ''', (symbol, limit))
+            cursor.execute(NEWS_FOR_SYMBOL_QUERY, (symbol, limit))
             
             news = []
             for row in cursor.fetchall():
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Sütunlu Hisse OHLCV Deposu
+Günlük mumları pazar/sembol bölümlerinde sütun başına bir .npy dosyası olarak saklar;
+okumalar bellek eşlemelidir ve yalnızca istenen sütunlar açılır, eklemeler eski
+parçalara dokunmadan yeni bir parça yazar
+"""
+
+import os
+import shutil
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Kaynak sütun adları (yfinance İngilizce, BIST entegrasyonu Türkçe) -> depo sütunu
+COLUMN_ALIASES = {
+    'date': 'date', 'tarih': 'date',
+    'open': 'open', 'açılış': 'open',
+    'high': 'high', 'yüksek': 'high',
+    'low': 'low', 'düşük': 'low',
+    'close': 'close', 'kapanış': 'close',
+    'volume': 'volume', 'hacim': 'volume',
+}
+
+SEGMENT_PREFIX = "seg-"
+
+
+class OHLCVStore:
+    """Pazar/sembol bölümlü, yalnızca ekleme yapılan sütunlu mum deposu"""
+
+    def __init__(self, data_dir: str = "data", dirname: str = "ohlcv"):
+        self.root = os.path.join(data_dir, dirname)
+        self.logger = logging.getLogger(__name__)
+        self._write_lock = threading.Lock()  # Aynı süreçteki eklemeler sıraya alınır
+
+    def _partition(self, market: str, symbol: str) -> str:
+        return os.path.join(self.root, market, symbol.replace(os.sep, '_'))
+
+    @staticmethod
+    def _segments(partition: str) -> List[str]:
+        """Bölümdeki tamamlanmış parçalar (sıralı); yarım kalan geçici parçalar atlanır"""
+        if not os.path.isdir(partition):
+            return []
+        return [os.path.join(partition, name) for name in sorted(os.listdir(partition))
+                if name.startswith(SEGMENT_PREFIX)]
+
+    @staticmethod
+    def _columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """DataFrame'i tarih (datetime64[D]) ve float64 OHLCV dizilerine çevirir"""
+        frame = df.rename(columns=lambda name: COLUMN_ALIASES.get(str(name).lower(), name))
+        dates = pd.DatetimeIndex(frame['date'] if 'date' in frame.columns else frame.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+
+        columns = {'date': dates.values.astype('datetime64[D]')}
+        for name in OHLCV_COLUMNS:
+            columns[name] = (frame[name].to_numpy(dtype=np.float64) if name in frame.columns
+                             else np.full(len(frame), np.nan))
+
+        return OHLCVStore._last_per_date(columns)
+
+    @staticmethod
+    def _last_per_date(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Tarihleri artan ve tekil yapar; aynı tarihte son satır geçerlidir (zaten sıralıysa kopyalamaz)"""
+        dates = columns['date']
+        if len(dates) > 1 and not (dates[1:] > dates[:-1]).all():
+            order = np.argsort(dates, kind='stable')
+            last = np.append(dates[order][1:] != dates[order][:-1], True)
+            columns = {name: values[order][last] for name, values in columns.items()}
+        return columns
+
+    def append(self, market: str, symbol: str, df: pd.DataFrame) -> int:
+        """Son saklanan tarihten yeni mumları yeni bir parça olarak ekler; yazılan satır sayısını döndürür.
+
+        Son saklanan günün mumu değişmişse (ör. kapanıştan sonra yeniden çekilen gün) o gün de
+        yeni parçaya yazılır ve okumalarda eski değerin yerine geçer; daha eski günler değişmez.
+        """
+        if df is None or len(df) == 0:
+            return 0
+
+        try:
+            columns = self._columns(df)
+            partition = self._partition(market, symbol)
+
+            with self._write_lock:
+                segments = self._segments(partition)
+                if segments:
+                    # Son parçanın son satırı saklanan en yeni gündür (okumada da o geçerlidir)
+                    stored = {name: np.load(os.path.join(segments[-1], f"{name}.npy"), mmap_mode='r')[-1:]
+                              for name in ['date'] + OHLCV_COLUMNS}
+                    last = stored['date'][0]
+                    keep = columns['date'] >= last  # Eski parçalar yeniden yazılmaz
+                    if keep.any() and columns['date'][keep][0] == last:
+                        # Son gün yalnızca değerleri değiştiyse yeniden yazılır
+                        row = np.flatnonzero(keep)[0]
+                        unchanged = all(
+                            np.array_equal(stored[name], columns[name][row:row + 1], equal_nan=True)
+                            for name in OHLCV_COLUMNS)
+                        if unchanged:
+                            keep[row] = False
+                    columns = {name: values[keep] for name, values in columns.items()}
+                if len(columns['date']) == 0:
+                    return 0
+
+                # Parça önce geçici klasöre yazılır, sonra tek adımda yerine taşınır
+                number = int(os.path.basename(segments[-1])[len(SEGMENT_PREFIX):]) + 1 if segments else 0
+                segment = os.path.join(partition, f"{SEGMENT_PREFIX}{number:06d}")
+                self._write_segment(segment, columns)
+
+            return len(columns['date'])
+
+        except Exception as e:
+            self.logger.error(f"{market}/{symbol} mumları eklenirken hata: {e}")
+            return 0
+
+    @staticmethod
+    def _write_segment(segment: str, columns: Dict[str, np.ndarray]):
+        temporary = os.path.join(os.path.dirname(segment), f".tmp-{os.path.basename(segment)}")
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+        for name, values in columns.items():
+            np.save(os.path.join(temporary, f"{name}.npy"), np.ascontiguousarray(values))
+        os.replace(temporary, segment)
+
+    def read(self, market: str, symbol: str, columns: Optional[Iterable[str]] = None,
+             start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Sembolün istenen sütunları ('date' her zaman döner).
+
+        Tek parçalı bölümlerde diziler dosyaya bellek eşlemeli, salt okunur görünümlerdir
+        (kopyalanmaz); birden çok parça birleştirilirken kopyalanır. `compact` parçaları
+        birleştirir. `start`/`end` kapalı tarih aralığıdır.
+        """
+        names = ['date'] + [name for name in (OHLCV_COLUMNS if columns is None else columns) if name != 'date']
+        partition = self._partition(market, symbol)
+
+        # Eşzamanlı bir sıkıştırma okunan parçayı silebilir; parçalar yeniden listelenip denenir
+        for attempt in range(10):
+            segments = self._segments(partition)
+            if not segments:
+                return {}
+            try:
+                parts = [{name: np.load(os.path.join(segment, f"{name}.npy"), mmap_mode='r') for name in names}
+                         for segment in segments]
+                break
+            except FileNotFoundError:
+                time.sleep(0.001 * 2 ** attempt)
+                continue
+            except Exception as e:
+                self.logger.error(f"{market}/{symbol} mumları okunurken hata: {e}")
+                return {}
+        else:
+            self.logger.error(f"{market}/{symbol} mumları okunurken parçalar sürekli değişti")
+            return {}
+
+        if len(parts) == 1:
+            data = parts[0]
+        else:
+            # Parçalar örtüşebilir (son günün yeniden yazımı, yarıda kalan ya da süren bir
+            # sıkıştırma); her tarih için en yeni parçadaki satır geçerlidir
+            data = self._last_per_date({name: np.concatenate([part[name] for part in parts]) for name in names})
+
+        if start is not None or end is not None:
+            dates = data['date']
+            low = np.searchsorted(dates, np.datetime64(start, 'D')) if start is not None else 0
+            high = np.searchsorted(dates, np.datetime64(end, 'D'), side='right') if end is not None else len(dates)
+            data = {name: values[low:high] for name, values in data.items()}
+        return data
+
+    def read_frame(self, market: str, symbol: str, columns: Optional[Iterable[str]] = None,
+                   start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """`read` sonucunu tarih indeksli DataFrame olarak döndürür"""
+        data = self.read(market, symbol, columns, start, end)
+        if not data:
+            return pd.DataFrame()
+        dates = data.pop('date')
+        return pd.DataFrame(data, index=pd.DatetimeIndex(dates.astype('datetime64[ns]'), name='date'))
+
+    def read_many(self, market: str, symbols: Optional[Iterable[str]] = None,
+                  columns: Optional[Iterable[str]] = None, start: Optional[str] = None,
+                  end: Optional[str] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """Pazardaki sembollerin (verilmezse tümü) istenen sütunları; tarayıcılar için"""
+        columns = list(columns) if columns is not None else None
+        result = {}
+        for symbol in (symbols if symbols is not None else self.symbols(market)):
+            data = self.read(market, symbol, columns, start, end)
+            if data:
+                result[symbol] = data
+        return result
+
+    def symbols(self, market: str) -> List[str]:
+        """Pazarda saklanan semboller"""
+        directory = os.path.join(self.root, market)
+        return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+    def markets(self) -> List[str]:
+        """Saklanan pazarlar"""
+        return sorted(os.listdir(self.root)) if os.path.isdir(self.root) else []
+
+    def bounds(self, market: str, symbol: str) -> Optional[Tuple[np.datetime64, np.datetime64, int]]:
+        """İlk ve son tarih ile mum sayısı"""
+        dates = self.read(market, symbol, columns=[]).get('date')
+        if dates is None or len(dates) == 0:
+            return None
+        return dates[0], dates[-1], len(dates)
+
+    def compact(self, market: str, symbol: str) -> int:
+        """Bölümün parçalarını tek parçada birleştirir (sıfır kopya okuma için); birleşen parça sayısını döndürür.
+
+        Birleşik parça önce tamamlanıp yerine taşınır, eski parçalar sonra kaldırılır. Arada okuyan
+        (ya da yarıda kalmış bir sıkıştırmadan sonra okuyan) taraf yinelenen tarihleri `read`
+        içinde eler. Eski parça silinemezse hata yükseltilir; sonraki sıkıştırma kalanları toplar.
+        """
+        partition = self._partition(market, symbol)
+        with self._write_lock:
+            # Önceki sıkıştırmadan silinemeden kalan eski parçalar toplanır
+            if os.path.isdir(partition):
+                for name in os.listdir(partition):
+                    if name.startswith(".old-"):
+                        shutil.rmtree(os.path.join(partition, name))
+            segments = self._segments(partition)
+            if len(segments) <= 1:
+                return len(segments)
+
+            data = self.read(market, symbol)
+            if not data:
+                raise IOError(f"{market}/{symbol} sıkıştırma için okunamadı")
+            number = int(os.path.basename(segments[-1])[len(SEGMENT_PREFIX):]) + 1
+            self._write_segment(os.path.join(partition, f"{SEGMENT_PREFIX}{number:06d}"),
+                                {name: np.array(values) for name, values in data.items()})
+            for segment in segments:
+                try:
+                    # Önce tek adımda gizli ada taşınır: okuyucu parçayı ya tam görür ya hiç görmez
+                    retired = os.path.join(partition, f".old-{os.path.basename(segment)}")
+                    os.replace(segment, retired)
+                    shutil.rmtree(retired)
+                except OSError as e:
+                    self.logger.error(f"{market}/{symbol} eski parça silinemedi ({segment}): {e}")
+                    raise
+            return len(segments)
+
+
+# Süreç genelinde paylaşılan depo
+ohlcv_store = OHLCVStore()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Veri Saklama ve Sıkıştırma İşi
+stocks.db tablolarını politikaya göre küçültür: eski anlık fiyatlar günlük muma, eski
+günlük mumlar haftalık özete, eski haberler günlük duygu özetine indirgenir; analiz
+geçmişi sembol ve tür başına sınırlanır. İş sınırlı parçalar halinde ilerler, yarıda
+kesilirse sonraki çalıştırma kaldığı yerden devam eder
+"""
+
+import os
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+# Varsayılan politika (None verilen süreler o adımı kapatır)
+DEFAULT_RETENTION_POLICY = {
+    'snapshot_days': 30,  # Anlık fiyat kayıtları (date boş) bu süreden sonra günlük muma indirgenir
+    'daily_bar_days': 730,  # Günlük mumlar bu süreden sonra haftalık özete indirgenir
+    'news_days': 90,  # Haberler bu süreden sonra günlük duygu özetine indirgenir
+    'analysis_keep': 20,  # Sembol ve analiz türü başına saklanan son analiz sayısı
+    'analysis_days': 180,  # Bundan eski analizler sayıdan bağımsız silinir
+    'batch_size': 5000,  # Analiz silmede tek işlemdeki en fazla satır
+    'vacuum_interval_days': 7,  # Boş sayfa varsa en az bu aralıkla VACUUM
+    'vacuum_free_ratio': 0.25,  # Boş sayfa oranı bunu aşarsa aralık beklenmeden VACUUM
+}
+
+# Bir günün anlık fiyatları -> günlük mum (aynı gün için gerçek mum varsa o korunur)
+SNAPSHOT_ROLLUP = '''
+    INSERT INTO stock_data (symbol, date, open, high, low, close, volume)
+    SELECT DISTINCT symbol, :day,
+           FIRST_VALUE(current_price) OVER w, MAX(current_price) OVER w, MIN(current_price) OVER w,
+           LAST_VALUE(current_price) OVER w, LAST_VALUE(volume) OVER w
+    FROM stock_data
+    WHERE date IS NULL AND timestamp >= :day AND timestamp < :next
+    WINDOW w AS (PARTITION BY symbol ORDER BY timestamp, id
+                 ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+    ON CONFLICT (symbol, date) DO NOTHING
+'''
+
+# Bir sembolün eski günlük mumları -> haftalık mumlar (hafta pazartesi başlar). Haftalık satır
+# kapsadığı ilk/son günü tutar: o aralıktaki günler (ör. yeniden çekilip kaydedilen, zaten
+# özetlenmiş günler) yeniden sayılmaz; aralık dışındaki günler tarih sırasına göre birleştirilir
+DAILY_BAR_ROLLUP = '''
+    INSERT INTO stock_data_weekly (symbol, week_start, open, high, low, close, volume, first_date, last_date)
+    SELECT DISTINCT d.symbol, d.week_start,
+           FIRST_VALUE(d.open) OVER w, MAX(d.high) OVER w, MIN(d.low) OVER w,
+           LAST_VALUE(d.close) OVER w, SUM(d.volume) OVER w, MIN(d.date) OVER w, MAX(d.date) OVER w
+    FROM (SELECT *, date(date, '-6 days', 'weekday 1') AS week_start FROM stock_data
+          WHERE symbol = :symbol AND date IS NOT NULL AND date < :cutoff) AS d
+    LEFT JOIN stock_data_weekly AS k ON k.symbol = d.symbol AND k.week_start = d.week_start
+    WHERE k.symbol IS NULL OR d.date < k.first_date OR d.date > k.last_date
+    WINDOW w AS (PARTITION BY d.week_start ORDER BY d.date
+                 ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+    ON CONFLICT (symbol, week_start) DO UPDATE SET
+        open = CASE WHEN excluded.first_date < stock_data_weekly.first_date
+                    THEN excluded.open ELSE stock_data_weekly.open END,
+        high = MAX(stock_data_weekly.high, excluded.high),
+        low = MIN(stock_data_weekly.low, excluded.low),
+        close = CASE WHEN excluded.last_date > stock_data_weekly.last_date
+                     THEN excluded.close ELSE stock_data_weekly.close END,
+        volume = stock_data_weekly.volume + excluded.volume,
+        first_date = MIN(stock_data_weekly.first_date, excluded.first_date),
+        last_date = MAX(stock_data_weekly.last_date, excluded.last_date)
+'''
+
+# Bir günün haberleri -> sembol başına günlük duygu özeti
+NEWS_ROLLUP = '''
+    INSERT INTO news_daily (symbol, date, news_count, sentiment_score, positive_count, negative_count,
+                            neutral_count)
+    SELECT symbol, :day, COUNT(*), AVG(COALESCE(sentiment_score, 0)),
+           SUM(sentiment = 'positive'), SUM(sentiment = 'negative'),
+           SUM(sentiment IS NULL OR sentiment NOT IN ('positive', 'negative'))
+    FROM news_data
+    WHERE timestamp >= :day AND timestamp < :next
+    GROUP BY symbol
+    ON CONFLICT (symbol, date) DO UPDATE SET
+        sentiment_score = (news_daily.sentiment_score * news_daily.news_count
+                           + excluded.sentiment_score * excluded.news_count)
+                          / (news_daily.news_count + excluded.news_count),
+        news_count = news_daily.news_count + excluded.news_count,
+        positive_count = news_daily.positive_count + excluded.positive_count,
+        negative_count = news_daily.negative_count + excluded.negative_count,
+        neutral_count = news_daily.neutral_count + excluded.neutral_count
+'''
+
+# Sembol ve tür başına en yeni `keep` analiz dışındakiler (ve süresi dolanlar), en fazla `batch` satır
+ANALYSIS_PRUNE = '''
+    DELETE FROM analysis_results WHERE id IN (
+        SELECT id FROM (
+            SELECT id, timestamp,
+                   ROW_NUMBER() OVER (PARTITION BY symbol, analysis_type ORDER BY timestamp DESC, id DESC) AS rank
+            FROM analysis_results
+        )
+        WHERE rank > :keep OR (:cutoff IS NOT NULL AND timestamp < :cutoff)
+        LIMIT :batch
+    )
+'''
+
+
+class RetentionJob:
+    """stocks.db için artımlı saklama, özetleme ve sıkıştırma işi"""
+
+    def __init__(self, manager, policy: Optional[Dict] = None):
+        self.db = manager.db
+        self.db_path = manager.db_path
+        self.policy = {**DEFAULT_RETENTION_POLICY, **(policy or {})}
+        self.logger = logging.getLogger(__name__)
+        self._pending_symbols = None  # Haftalık özetlenecek semboller (ilk kullanımda bulunur)
+
+    @staticmethod
+    def _cutoff(days: Optional[int], today: datetime) -> Optional[str]:
+        """`days` gün önceki günün başı (YYYY-MM-DD; zaman damgaları UTC)"""
+        if days is None:
+            return None
+        return (today - timedelta(days=days)).strftime('%Y-%m-%d')
+
+    @staticmethod
+    def _next_day(day: str) -> str:
+        return (datetime.strptime(day, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+    # ---- Tek parçalık adımlar (işlenen satır sayısını döndürür; 0: adım bitti) ----
+
+    def _rollup_snapshots(self, today: datetime) -> int:
+        """En eski günün anlık fiyat kayıtlarını günlük muma indirger"""
+        cutoff = self._cutoff(self.policy['snapshot_days'], today)
+        if cutoff is None:
+            return 0
+        oldest = self.db.connection().execute(
+            "SELECT MIN(timestamp) FROM stock_data WHERE date IS NULL").fetchone()[0]
+        if oldest is None or oldest >= cutoff:
+            return 0
+
+        day = oldest[:10]
+        params = {'day': day, 'next': self._next_day(day)}
+        with self.db.transaction() as conn:
+            conn.execute(SNAPSHOT_ROLLUP, params)
+            return conn.execute(
+                "DELETE FROM stock_data WHERE date IS NULL AND timestamp >= :day AND timestamp < :next", params
+            ).rowcount
+
+    def _rollup_daily_bars(self, today: datetime) -> int:
+        """Bir sembolün eski günlük mumlarını haftalık mumlara indirger"""
+        days = self.policy['daily_bar_days']
+        if days is None:
+            return 0
+        # Yalnızca tamamlanmış haftalar: kesim tarihi pazartesiye hizalanır
+        limit = today - timedelta(days=days)
+        cutoff = (limit - timedelta(days=limit.weekday())).strftime('%Y-%m-%d')
+
+        if self._pending_symbols is None:
+            self._pending_symbols = [row[0] for row in self.db.connection().execute(
+                "SELECT symbol FROM stock_data WHERE date IS NOT NULL GROUP BY symbol HAVING MIN(date) < ?",
+                (cutoff,)
+            )]
+        if not self._pending_symbols:
+            return 0
+
+        params = {'symbol': self._pending_symbols.pop(), 'cutoff': cutoff}
+        with self.db.transaction() as conn:
+            conn.execute(DAILY_BAR_ROLLUP, params)
+            return conn.execute(
+                "DELETE FROM stock_data WHERE symbol = :symbol AND date IS NOT NULL AND date < :cutoff", params
+            ).rowcount
+
+    def _rollup_news(self, today: datetime) -> int:
+        """En eski günün haberlerini günlük duygu özetine indirger"""
+        cutoff = self._cutoff(self.policy['news_days'], today)
+        if cutoff is None:
+            return 0
+        oldest = self.db.connection().execute("SELECT MIN(timestamp) FROM news_data").fetchone()[0]
+        if oldest is None or oldest >= cutoff:
+            return 0
+
+        day = oldest[:10]
+        params = {'day': day, 'next': self._next_day(day)}
+        with self.db.transaction() as conn:
+            conn.execute(NEWS_ROLLUP, params)
+            return conn.execute(
+                "DELETE FROM news_data WHERE timestamp >= :day AND timestamp < :next", params
+            ).rowcount
+
+    def _prune_analysis(self, today: datetime) -> int:
+        """Sınırı aşan ve süresi dolan analiz sonuçlarından bir parça siler"""
+        params = {
+            'keep': self.policy['analysis_keep'] if self.policy['analysis_keep'] is not None else -1,
+            'cutoff': self._cutoff(self.policy['analysis_days'], today),
+            'batch': self.policy['batch_size'],
+        }
+        if params['keep'] < 0 and params['cutoff'] is None:
+            return 0
+        if params['keep'] < 0:
+            params['keep'] = 2 ** 62  # Sayı sınırı yok, yalnızca süre
+        with self.db.transaction() as conn:
+            return conn.execute(ANALYSIS_PRUNE, params).rowcount
+
+    # ---- Bakım ----
+
+    def _database_bytes(self) -> int:
+        """Veritabanı ve WAL dosyalarının toplam boyutu"""
+        return sum(os.path.getsize(path) for path in (self.db_path, self.db_path + "-wal") if os.path.exists(path))
+
+    def _vacuum_due(self, conn, today: datetime) -> bool:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free == 0:
+            return False
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        if free / pages >= self.policy['vacuum_free_ratio']:
+            return True
+        row = conn.execute("SELECT last_run FROM maintenance_log WHERE task = 'vacuum'").fetchone()
+        return row is None or row[0] < self._cutoff(self.policy['vacuum_interval_days'], today)
+
+    def _record(self, conn, task: str):
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO maintenance_log (task, last_run) VALUES (?, datetime('now'))",
+                         (task,))
+
+    def run(self, max_batches: Optional[int] = None, vacuum: Optional[bool] = None) -> Dict:
+        """Saklama adımlarını sırayla çalıştırır.
+
+        `max_batches` verilirse en fazla o kadar parça işlenir ve iş sonraki çalıştırmada
+        kaldığı yerden sürer (`complete` False döner). `vacuum` None ise VACUUM politika ile,
+        True/False ise zorla açılır/kapatılır. Silinen satırlar, ANALYZE/VACUUM durumu ve
+        geri kazanılan bayt sayısı raporlanır.
+        """
+        start = time.perf_counter()
+        today = datetime.now(timezone.utc).replace(tzinfo=None)
+        steps = [
+            ('snapshots', self._rollup_snapshots),
+            ('daily_bars', self._rollup_daily_bars),
+            ('news', self._rollup_news),
+            ('analysis', self._prune_analysis),
+        ]
+        report = {'rows': {name: 0 for name, _ in steps}, 'batches': 0, 'complete': True,
+                  'analyzed': False, 'vacuumed': False, 'bytes_before': self._database_bytes()}
+
+        try:
+            for name, step in steps:
+                while True:
+                    if max_batches is not None and report['batches'] >= max_batches:
+                        report['complete'] = False
+                        break
+                    rows = step(today)
+                    if not rows:
+                        break
+                    report['rows'][name] += rows
+                    report['batches'] += 1
+                if not report['complete']:
+                    break
+
+            conn = self.db.connection()
+            if sum(report['rows'].values()):
+                conn.execute("ANALYZE")
+                conn.commit()
+                report['analyzed'] = True
+
+            if vacuum or (vacuum is None and self._vacuum_due(conn, today)):
+                if conn.in_transaction:
+                    conn.commit()
+                conn.execute("VACUUM")
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._record(conn, 'vacuum')
+                report['vacuumed'] = True
+
+        except Exception as e:
+            self.logger.error(f"Saklama işi hatası: {e}")
+            report['complete'] = False
+            report['error'] = str(e)
+
+        report['bytes_after'] = self._database_bytes()
+        report['bytes_reclaimed'] = max(0, report['bytes_before'] - report['bytes_after'])
+        report['duration'] = time.perf_counter() - start
+        self.logger.info(
+            f"Saklama işi: {report['rows']} satır, {report['batches']} parça, "
+            f"{report['bytes_reclaimed'] / 1024:.0f} KB geri kazanıldı ({report['duration']:.2f} sn)"
+        )
+        return report
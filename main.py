@@ -14,6 +14,7 @@ import json
 from scraper import StockScraper, NewsScraper, DataManager
 from analysis import TrendAnalyzer, TechnicalAnalyzer, RiskAnalyzer, OpportunityAnalyzer
 from visuals import ChartGenerator, ReportGenerator
+from utils.write_behind import WriteBehindQueue
 
 
 class StockAnalysisApp:
@@ -23,6 +24,13 @@ class StockAnalysisApp:
         self.news_scraper = NewsScraper()
         self.data_manager = DataManager()
         
+        # Kayıtlar arka planda toplu yazılır; analiz akışı SQLite yazımını beklemez
+        self.write_queue = WriteBehindQueue({
+            'stock': self.data_manager.save_stock_data_batch,
+            'news': self.data_manager.save_news_batch,
+            'analysis': self.data_manager.save_analysis_batch,
+        })
+        
         self.trend_analyzer = TrendAnalyzer()
         self.technical_analyzer = TechnicalAnalyzer()
         self.risk_analyzer = RiskAnalyzer()
@@ -132,15 +140,15 @@ class StockAnalysisApp:
             print(f"❌ {symbol} için veri çekilemedi.")
             return
         
-        # Verileri kaydet
-        self.data_manager.save_stock_data(stock_data)
+        # Verileri kaydet (arka planda)
+        self.write_queue.put('stock', stock_data)
         
         # 2. Haber sentiment analizi
         print("📰 Haber sentiment analizi yapılıyor...")
         news_sentiment = self.news_scraper.get_stock_news_sentiment(symbol, days)
         
         if news_sentiment:
-            self.data_manager.save_news_data(news_sentiment)
+            self.write_queue.put('news', news_sentiment)
         
         # 3. Trend analizi
         print("📈 Trend analizi yapılıyor...")
@@ -178,14 +186,14 @@ class StockAnalysisApp:
         )
         print(f"✅ Rapor kaydedildi: {report_path}")
         
-        # Analiz sonuçlarını kaydet
+        # Analiz sonuçlarını kaydet (arka planda)
         if risk_analysis:
-            self.data_manager.save_analysis_result(symbol, "risk", risk_analysis['recommendation'], 
-                                                 risk_analysis['overall_risk_score'])
+            self.write_queue.put('analysis', (symbol, "risk", risk_analysis['recommendation'], 
+                                              risk_analysis['overall_risk_score']))
         
         if opportunity_analysis:
-            self.data_manager.save_analysis_result(symbol, "opportunity", opportunity_analysis['recommendation'], 
-                                                 opportunity_analysis['overall_opportunity_score'])
+            self.write_queue.put('analysis', (symbol, "opportunity", opportunity_analysis['recommendation'], 
+                                              opportunity_analysis['overall_opportunity_score']))
     
     def analyze_watchlist(self, days=7):
         """
@@ -525,6 +533,11 @@ class StockAnalysisApp:
         print("0. ❌ Çıkış")
         print("=" * 40)
     
+    def shutdown(self):
+        """Bekleyen kayıtları yazar ve arka plan yazıcısını durdurur"""
+        if not self.write_queue.close():
+            print("⚠️ Bazı kayıtlar yazılamadı")
+    
     def run_interactive_mode(self):
         """Etkileşimli mod çalıştırır"""
         while True:
@@ -619,7 +632,10 @@ def main():
     """Ana fonksiyon"""
     try:
         app = StockAnalysisApp()
-        app.run_interactive_mode()
+        try:
+            app.run_interactive_mode()
+        finally:
+            app.shutdown()
     except Exception as e:
         print(f"❌ Uygulama başlatılırken hata oluştu: {str(e)}")
         sys.exit(1)
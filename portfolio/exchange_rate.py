@@ -9,12 +9,13 @@ import time
 from typing import Dict, Optional
 import logging
 
+from utils.ttl_cache import TTLCache
+
 class ExchangeRateService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.cache = {}
         self.cache_timeout = 300  # 5 dakika
-        self.last_update = 0
+        self.cache = TTLCache(ttl=self.cache_timeout, max_entries=16)
         
         # API endpoints
         self.apis = [
@@ -27,15 +28,15 @@ class ExchangeRateService:
         """USDT/TRY kurunu döndürür"""
         try:
             # Cache kontrolü
-            if self._is_cache_valid():
-                return self.cache.get('USDT_TRY', 30.0)
+            rate = self.cache.get('USDT_TRY')
+            if rate is not None:
+                return rate
             
             # API'lerden kur çekme
             rate = self._fetch_exchange_rate()
             
             # Cache'e kaydet
-            self.cache['USDT_TRY'] = rate
-            self.last_update = time.time()
+            self.cache.set('USDT_TRY', rate)
             
             self.logger.info(f"Güncel USDT/TRY kuru: {rate:.4f}")
             return rate
@@ -45,10 +46,6 @@ class ExchangeRateService:
             # Hata durumunda varsayılan kur
             return 30.0
     
-    def _is_cache_valid(self) -> bool:
-        """Cache'in geçerli olup olmadığını kontrol eder"""
-        return (time.time() - self.last_update) < self.cache_timeout
-    
     def _fetch_exchange_rate(self) -> float:
         """API'lerden döviz kuru çeker"""
         for api_url in self.apis:
@@ -82,8 +79,9 @@ class ExchangeRateService:
     def get_multiple_rates(self) -> Dict[str, float]:
         """Birden fazla döviz kurunu döndürür"""
         try:
-            if self._is_cache_valid():
-                return self.cache
+            rates = self.cache.get('rates')
+            if rates is not None:
+                return rates
             
             # Ana kurları çek
             usdt_try = self.get_usdt_to_try_rate()
@@ -96,7 +94,7 @@ class ExchangeRateService:
                 'ETH_TRY': usdt_try * 2500,   # Yaklaşık ETH/USD
             }
             
-            self.cache.update(rates)
+            self.cache.set('rates', rates)
             return rates
             
         except Exception as e:
@@ -1,18 +1,80 @@
 #!/usr/bin/env python3
 """
 Kullanıcı Yönetimi ve Portföy Sistemi
+Kullanıcılar, portföyler, takip listeleri ve işlemler data/portfolio.db içinde kayıt
+bazında saklanır; her alım/satım tek bir atomik işlemdir. Okumalar bellekte önbelleğe
+alınır, herhangi bir yazma (başka süreçlerdekiler dahil) önbelleği geçersiz kılar
 """
 
+import copy
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
 from .exchange_rate import exchange_rate_service
+from utils.sqlite_pool import SQLitePool, DEFAULT_PRAGMAS
+from utils.ttl_cache import TTLCache
+
+_MISSING = object()
+
+DEFAULT_BALANCE = 500000.0  # 500K USD
+DEFAULT_USERS = {"gokhan": "Gökhan", "ugur": "Uğur"}
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY,
+        name TEXT,
+        balance REAL NOT NULL DEFAULT 0,
+        created_at TEXT,
+        last_login TEXT
+    )''',
+    '''CREATE TABLE IF NOT EXISTS portfolios (
+        username TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        amount REAL NOT NULL,
+        avg_price REAL NOT NULL,
+        total_invested REAL NOT NULL,
+        UNIQUE (username, symbol)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS watchlists (
+        username TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (username, symbol)
+    ) WITHOUT ROWID''',
+    '''CREATE TABLE IF NOT EXISTS transactions (
+        username TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        type TEXT,
+        symbol TEXT,
+        timestamp TEXT,
+        data TEXT NOT NULL,
+        PRIMARY KEY (username, id)
+    ) WITHOUT ROWID''',
+    # Her yazma işleminde artan sayaç; önbellek bununla geçersiz kılınır
+    '''CREATE TABLE IF NOT EXISTS store_revision (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        revision INTEGER NOT NULL
+    )''',
+    "INSERT OR IGNORE INTO store_revision (id, revision) VALUES (0, 0)",
+]
+
+POSITION_QUERY = "SELECT amount, avg_price, total_invested FROM portfolios WHERE username = ? AND symbol = ?"
+POSITION_UPSERT = '''
+    INSERT INTO portfolios (username, symbol, amount, avg_price, total_invested) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (username, symbol) DO UPDATE SET
+        amount = excluded.amount, avg_price = excluded.avg_price, total_invested = excluded.total_invested
+'''
+
 
 class UserManager:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
+        self.db_path = os.path.join(data_dir, "portfolio.db")
+        # Eski JSON dosyaları yalnızca ilk açılışta içe aktarılır, değiştirilmez
         self.users_file = os.path.join(data_dir, "users.json")
         self.portfolios_file = os.path.join(data_dir, "portfolios.json")
         self.watchlists_file = os.path.join(data_dir, "watchlists.json")
@@ -21,86 +83,172 @@ class UserManager:
         # Logging
         self.logger = logging.getLogger(__name__)
         
-        # Dosyaları oluştur
-        self._initialize_files()
+        # Para işlemleri: her onay diske senkronlanır
+        os.makedirs(data_dir, exist_ok=True)
+        self.db = SQLitePool(self.db_path, pragmas={**DEFAULT_PRAGMAS, 'synchronous': 'FULL'})
         
-        # Varsayılan kullanıcıları oluştur
-        self._create_default_users()
-    
-    def _initialize_files(self):
-        """Gerekli dosyaları oluşturur"""
-        os.makedirs(self.data_dir, exist_ok=True)
+        # Okuma önbelleği (depo sürümü değişince temizlenir)
+        self._cache = TTLCache(ttl=None, max_entries=1024)
+        self._cache_revision = None
+        self._cache_lock = threading.Lock()
         
-        # Kullanıcılar dosyası
-        if not os.path.exists(self.users_file):
-            default_users = {
-                "gokhan": {
-                    "name": "Gökhan",
-                    "balance": 500000.0,  # 500K USD
-                    "created_at": datetime.now().isoformat(),
-                    "last_login": None
-                },
-                "ugur": {
-                    "name": "Uğur", 
-                    "balance": 500000.0,  # 500K USD
-                    "created_at": datetime.now().isoformat(),
-                    "last_login": None
-                }
-            }
-            self._save_json(self.users_file, default_users)
-        
-        # Portföyler dosyası
-        if not os.path.exists(self.portfolios_file):
-            default_portfolios = {
-                "gokhan": {},
-                "ugur": {}
-            }
-            self._save_json(self.portfolios_file, default_portfolios)
-        
-        # Takip listeleri dosyası
-        if not os.path.exists(self.watchlists_file):
-            default_watchlists = {
-                "gokhan": [],
-                "ugur": []
-            }
-            self._save_json(self.watchlists_file, default_watchlists)
-        
-        # İşlemler dosyası
-        if not os.path.exists(self.transactions_file):
-            default_transactions = {
-                "gokhan": [],
-                "ugur": []
-            }
-            self._save_json(self.transactions_file, default_transactions)
+        # Tabloları ve varsayılan kullanıcıları oluştur
+        self._initialize_store()
     
-    def _create_default_users(self):
-        """Varsayılan kullanıcıları oluşturur"""
-        users = self._load_json(self.users_file)
-        if not users:
-            self._initialize_files()
+    def _initialize_store(self):
+        """Tabloları oluşturur; depo boşsa eski JSON verisini ya da varsayılan kullanıcıları yükler"""
+        with self.db.transaction() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+                return
+            
+            users = self._load_json(self.users_file)
+            if users:
+                skipped = self._import_json(conn, users)
+                self.logger.info(f"JSON verisi {self.db_path} deposuna aktarıldı ({len(users)} kullanıcı"
+                                 f"{f', {skipped} bozuk kayıt atlandı' if skipped else ''})")
+            else:
+                now = datetime.now().isoformat()
+                conn.executemany(
+                    "INSERT INTO users (username, name, balance, created_at) VALUES (?, ?, ?, ?)",
+                    [(username, name, DEFAULT_BALANCE, now) for username, name in DEFAULT_USERS.items()]
+                )
+            self._touch(conn)
+    
+    def _import_json(self, conn, users: Dict) -> int:
+        """Eski JSON dosyalarındaki kayıtları tek işlemde depoya yazar; bozuk kayıtları atlayıp sayısını döndürür"""
+        skipped = 0
+        for username, user in users.items():
+            skipped += not self._import_record("kullanıcı", username, lambda: conn.execute(
+                "INSERT INTO users (username, name, balance, created_at, last_login) VALUES (?, ?, ?, ?, ?)",
+                (username, user.get('name'), float(user.get('balance', 0.0)), user.get('created_at'),
+                 user.get('last_login'))))
+        for username, portfolio in self._load_json(self.portfolios_file).items():
+            for symbol, position in (portfolio.items() if isinstance(portfolio, dict) else [(None, portfolio)]):
+                skipped += not self._import_record("pozisyon", f"{username}/{symbol}", lambda: self._write_position(
+                    conn, username, symbol, {name: float(position[name])
+                                             for name in ('amount', 'avg_price', 'total_invested')}))
+        for username, symbols in self._load_json(self.watchlists_file).items():
+            skipped += not self._import_record("takip listesi", username, lambda: conn.executemany(
+                "INSERT OR IGNORE INTO watchlists (username, symbol, position) VALUES (?, ?, ?)",
+                [(username, str(symbol), position) for position, symbol in enumerate(symbols)]))
+        for username, transactions in self._load_json(self.transactions_file).items():
+            if not isinstance(transactions, list):
+                transactions = [transactions]
+            # Yinelenen ya da geçersiz numaralı işlem kaybolmaz, sona yeni numarayla eklenir
+            used = set()
+            next_id = 1 + max([len(transactions)] + [t['id'] for t in transactions
+                                                     if isinstance(t, dict) and isinstance(t.get('id'), int)])
+            for number, transaction in enumerate(transactions, 1):
+                if isinstance(transaction, dict):
+                    transaction.setdefault('id', number)
+                    if not isinstance(transaction['id'], int) or transaction['id'] in used:
+                        self.logger.warning(f"JSON içe aktarımında {username} işleminin numarası "
+                                            f"({transaction['id']!r}) yinelenen ya da geçersiz; {next_id} verildi")
+                        transaction['id'] = next_id
+                        next_id += 1
+                    used.add(transaction['id'])
+                skipped += not self._import_record("işlem", f"{username}#{number}",
+                                                   lambda: self._write_transaction(conn, username, transaction))
+        return skipped
+    
+    def _import_record(self, kind: str, key: str, write) -> bool:
+        """Tek bir eski kaydı yazar; bozuksa (eksik alan, yanlış tür, çakışma) kaydı atlayıp uyarır"""
+        try:
+            write()
+            return True
+        except (sqlite3.Error, KeyError, TypeError, ValueError, AttributeError) as e:
+            self.logger.warning(f"JSON içe aktarımında bozuk {kind} kaydı atlandı ({key}): {e!r}")
+            return False
     
     def _load_json(self, file_path: str) -> Dict:
-        """JSON dosyasını yükler"""
+        """JSON dosyasını yükler (üst düzeyi sözlük olmayan dosya boş sayılır)"""
         try:
             if os.path.exists(file_path):
                 with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+                self.logger.error(f"JSON yükleme hatası {file_path}: üst düzey sözlük değil")
             return {}
         except Exception as e:
             self.logger.error(f"JSON yükleme hatası {file_path}: {e}")
             return {}
     
-    def _save_json(self, file_path: str, data: Dict):
-        """JSON dosyasına kaydeder"""
+    # ---- Depo yardımcıları ----
+    
+    @staticmethod
+    def _touch(conn):
+        """Depo sürümünü artırır (tüm süreçlerdeki okuma önbelleklerini geçersiz kılar)"""
+        conn.execute("UPDATE store_revision SET revision = revision + 1 WHERE id = 0")
+    
+    def _cached(self, key: tuple, loader):
+        """Önbellekteki değerin kopyası; depo sürümü değiştiyse önbellek temizlenip yeniden okunur"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            conn = self.db.connection()
+            revision = conn.execute("SELECT revision FROM store_revision WHERE id = 0").fetchone()[0]
+            with self._cache_lock:
+                if revision != self._cache_revision:
+                    self._cache.clear()
+                    self._cache_revision = revision
+            
+            value = self._cache.get(key, _MISSING)
+            if value is _MISSING:
+                # Sürüm ve veri aynı anlık görüntüden okunur
+                with self.db.transaction("DEFERRED") as conn:
+                    revision = conn.execute("SELECT revision FROM store_revision WHERE id = 0").fetchone()[0]
+                    value = loader(conn)
+                with self._cache_lock:
+                    if revision == self._cache_revision:
+                        self._cache.set(key, value)
+            return copy.deepcopy(value)
         except Exception as e:
-            self.logger.error(f"JSON kaydetme hatası {file_path}: {e}")
+            self.logger.error(f"Depo okuma hatası {key}: {e}")
+            return None
+    
+    @staticmethod
+    def _write_position(conn, username: str, symbol: str, position: Dict):
+        conn.execute(POSITION_UPSERT, (username, symbol, position['amount'], position['avg_price'],
+                                       position['total_invested']))
+    
+    @staticmethod
+    def _write_transaction(conn, username: str, transaction: Dict):
+        conn.execute(
+            "INSERT INTO transactions (username, id, type, symbol, timestamp, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (username, transaction['id'], transaction.get('type'), transaction.get('symbol'),
+             transaction.get('timestamp'), json.dumps(transaction, ensure_ascii=False))
+        )
+    
+    def _append_transaction(self, conn, username: str, transaction: Dict):
+        """İşleme zaman ve kullanıcıya göre sıra numarası verip ekler (geçmiş boyutundan bağımsız)"""
+        transaction['timestamp'] = datetime.now().isoformat()
+        transaction['id'] = conn.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM transactions WHERE username = ?", (username,)
+        ).fetchone()[0]
+        self._write_transaction(conn, username, transaction)
+    
+    def _set_balance(self, username: str, balance: float) -> bool:
+        try:
+            with self.db.transaction() as conn:
+                updated = conn.execute("UPDATE users SET balance = ? WHERE username = ?",
+                                       (balance, username)).rowcount
+                if updated:
+                    self._touch(conn)
+                return bool(updated)
+        except Exception as e:
+            self.logger.error(f"Bakiye kaydetme hatası {username}: {e}")
+            return False
+    
+    # ---- Kullanıcılar ----
     
     def get_users(self) -> Dict:
         """Tüm kullanıcıları döndürür"""
-        return self._load_json(self.users_file)
+        def load(conn):
+            return {username: {'name': name, 'balance': balance, 'created_at': created_at, 'last_login': last_login}
+                    for username, name, balance, created_at, last_login in conn.execute(
+                        "SELECT username, name, balance, created_at, last_login FROM users ORDER BY rowid")}
+        return self._cached(('users',), load) or {}
     
     def get_user(self, username: str) -> Optional[Dict]:
         """Belirli bir kullanıcıyı döndürür"""
@@ -114,131 +262,151 @@ class UserManager:
     
     def update_user_balance(self, username: str, new_balance: float):
         """Kullanıcı bakiyesini günceller"""
-        users = self.get_users()
-        if username in users:
-            users[username]['balance'] = new_balance
-            self._save_json(self.users_file, users)
+        if self._set_balance(username, new_balance):
             self.logger.info(f"{username} bakiyesi güncellendi: {new_balance:.2f} TL")
     
-    def reset_user_balance(self, username: str, balance: float = 500000.0):
+    def reset_user_balance(self, username: str, balance: float = DEFAULT_BALANCE):
         """Kullanıcı bakiyesini sıfırlar (varsayılan: 500K USD)"""
-        users = self.get_users()
-        if username in users:
-            users[username]['balance'] = balance
-            self._save_json(self.users_file, users)
+        if self._set_balance(username, balance):
             self.logger.info(f"{username} bakiyesi sıfırlandı: {balance:.2f} TL")
     
+    # ---- Portföy ----
+    
     def get_portfolio(self, username: str) -> Dict:
         """Kullanıcının portföyünü döndürür"""
-        portfolios = self._load_json(self.portfolios_file)
-        return portfolios.get(username, {})
+        def load(conn):
+            return {symbol: {'amount': amount, 'avg_price': avg_price, 'total_invested': total_invested}
+                    for symbol, amount, avg_price, total_invested in conn.execute(
+                        "SELECT symbol, amount, avg_price, total_invested FROM portfolios "
+                        "WHERE username = ? ORDER BY rowid", (username,))}
+        return self._cached(('portfolio', username), load) or {}
     
     def update_portfolio(self, username: str, portfolio: Dict):
-        """Kullanıcı portföyünü günceller"""
-        portfolios = self._load_json(self.portfolios_file)
-        portfolios[username] = portfolio
-        self._save_json(self.portfolios_file, portfolios)
+        """Kullanıcı portföyünü günceller (yalnızca değişen pozisyonlar yazılır)"""
+        try:
+            with self.db.transaction() as conn:
+                stored = {symbol: (amount, avg_price, total_invested)
+                          for symbol, amount, avg_price, total_invested in conn.execute(
+                              "SELECT symbol, amount, avg_price, total_invested FROM portfolios WHERE username = ?",
+                              (username,))}
+                removed = [(username, symbol) for symbol in stored if symbol not in portfolio]
+                conn.executemany("DELETE FROM portfolios WHERE username = ? AND symbol = ?", removed)
+                changed = 0
+                for symbol, position in portfolio.items():
+                    if stored.get(symbol) != (position['amount'], position['avg_price'], position['total_invested']):
+                        self._write_position(conn, username, symbol, position)
+                        changed += 1
+                if removed or changed:
+                    self._touch(conn)
+        except Exception as e:
+            self.logger.error(f"Portföy kaydetme hatası {username}: {e}")
+    
+    # ---- Takip listesi ----
     
     def get_watchlist(self, username: str) -> List[str]:
         """Kullanıcının takip listesini döndürür"""
-        watchlists = self._load_json(self.watchlists_file)
-        return watchlists.get(username, [])
+        def load(conn):
+            return [symbol for (symbol,) in conn.execute(
+                "SELECT symbol FROM watchlists WHERE username = ? ORDER BY position", (username,))]
+        return self._cached(('watchlist', username), load) or []
     
     def add_to_watchlist(self, username: str, symbol: str):
         """Takip listesine coin ekler"""
-        watchlists = self._load_json(self.watchlists_file)
-        if username not in watchlists:
-            watchlists[username] = []
-        
-        if symbol not in watchlists[username]:
-            watchlists[username].append(symbol)
-            self._save_json(self.watchlists_file, watchlists)
+        try:
+            with self.db.transaction() as conn:
+                added = conn.execute('''
+                    INSERT OR IGNORE INTO watchlists (username, symbol, position)
+                    SELECT ?, ?, COALESCE(MAX(position) + 1, 0) FROM watchlists WHERE username = ?
+                ''', (username, symbol, username)).rowcount
+                if added:
+                    self._touch(conn)
+        except Exception as e:
+            self.logger.error(f"Takip listesi kaydetme hatası {username}: {e}")
+            return
+        if added:
             self.logger.info(f"{username} takip listesine {symbol} eklendi")
     
     def remove_from_watchlist(self, username: str, symbol: str):
         """Takip listesinden coin çıkarır"""
-        watchlists = self._load_json(self.watchlists_file)
-        if username in watchlists and symbol in watchlists[username]:
-            watchlists[username].remove(symbol)
-            self._save_json(self.watchlists_file, watchlists)
+        try:
+            with self.db.transaction() as conn:
+                removed = conn.execute("DELETE FROM watchlists WHERE username = ? AND symbol = ?",
+                                       (username, symbol)).rowcount
+                if removed:
+                    self._touch(conn)
+        except Exception as e:
+            self.logger.error(f"Takip listesi kaydetme hatası {username}: {e}")
+            return
+        if removed:
             self.logger.info(f"{username} takip listesinden {symbol} çıkarıldı")
     
+    # ---- İşlemler ----
+    
     def get_transactions(self, username: str) -> List[Dict]:
         """Kullanıcının işlem geçmişini döndürür"""
-        transactions = self._load_json(self.transactions_file)
-        return transactions.get(username, [])
+        def load(conn):
+            return [json.loads(data) for (data,) in conn.execute(
+                "SELECT data FROM transactions WHERE username = ? ORDER BY id", (username,))]
+        return self._cached(('transactions', username), load) or []
     
     def add_transaction(self, username: str, transaction: Dict):
         """İşlem geçmişine yeni işlem ekler"""
-        transactions = self._load_json(self.transactions_file)
-        if username not in transactions:
-            transactions[username] = []
-        
-        # İşlem tarihini ekle
-        transaction['timestamp'] = datetime.now().isoformat()
-        transaction['id'] = len(transactions[username]) + 1
-        
-        transactions[username].append(transaction)
-        self._save_json(self.transactions_file, transactions)
+        try:
+            with self.db.transaction() as conn:
+                self._append_transaction(conn, username, transaction)
+                self._touch(conn)
+        except Exception as e:
+            self.logger.error(f"İşlem kaydetme hatası {username}: {e}")
+            return
         self.logger.info(f"{username} için yeni işlem eklendi: {transaction['type']} {transaction['symbol']}")
     
     def buy_crypto(self, username: str, symbol: str, amount_usdt: float, price: float) -> bool:
-        """Kripto para satın alma işlemi"""
+        """Kripto para satın alma işlemi (bakiye, pozisyon ve işlem kaydı tek işlemde)"""
         try:
-            user = self.get_user(username)
-            if not user:
-                return False
-            
-            current_balance = user['balance']
-            # Bakiye USD olduğu için doğrudan USDT miktarını kullan
-            total_cost_usd = amount_usdt
-            
-            if total_cost_usd > current_balance:
-                self.logger.warning(f"{username} yetersiz bakiye: {current_balance:.2f} USD, gerekli: {total_cost_usd:.2f} USD")
-                return False
-            
-            # Bakiyeyi güncelle
-            new_balance = current_balance - total_cost_usd
-            self.update_user_balance(username, new_balance)
-            
-            # Portföyü güncelle
-            portfolio = self.get_portfolio(username)
-            if symbol not in portfolio:
-                portfolio[symbol] = {
-                    'amount': 0.0,
-                    'avg_price': 0.0,
-                    'total_invested': 0.0
+            with self.db.transaction() as conn:
+                row = conn.execute("SELECT balance FROM users WHERE username = ?", (username,)).fetchone()
+                if not row:
+                    return False
+                
+                current_balance = row[0]
+                # Bakiye USD olduğu için doğrudan USDT miktarını kullan
+                total_cost_usd = amount_usdt
+                
+                if total_cost_usd > current_balance:
+                    self.logger.warning(f"{username} yetersiz bakiye: {current_balance:.2f} USD, gerekli: {total_cost_usd:.2f} USD")
+                    return False
+                
+                # Bakiyeyi güncelle
+                new_balance = current_balance - total_cost_usd
+                conn.execute("UPDATE users SET balance = ? WHERE username = ?", (new_balance, username))
+                
+                # Ortalama fiyat hesapla (USD bazında)
+                current_amount, current_avg_price, current_invested = (
+                    conn.execute(POSITION_QUERY, (username, symbol)).fetchone() or (0.0, 0.0, 0.0))
+                
+                # Coin miktarını hesapla (USDT / fiyat)
+                coin_amount = amount_usdt / price
+                new_amount = current_amount + coin_amount
+                new_invested = current_invested + total_cost_usd
+                new_avg_price = new_invested / new_amount if new_amount > 0 else 0
+                
+                self._write_position(conn, username, symbol, {
+                    'amount': new_amount,
+                    'avg_price': new_avg_price,
+                    'total_invested': new_invested
+                })
+                
+                # İşlem kaydı ekle
+                transaction = {
+                    'type': 'BUY',
+                    'symbol': symbol,
+                    'amount': coin_amount,
+                    'price': price,
+                    'total_cost': total_cost_usd,
+                    'balance_after': new_balance
                 }
-            
-            # Ortalama fiyat hesapla (USD bazında)
-            current_amount = portfolio[symbol]['amount']
-            current_avg_price = portfolio[symbol]['avg_price']
-            current_invested = portfolio[symbol]['total_invested']
-            
-            # Coin miktarını hesapla (USDT / fiyat)
-            coin_amount = amount_usdt / price
-            new_amount = current_amount + coin_amount
-            new_invested = current_invested + total_cost_usd
-            new_avg_price = new_invested / new_amount if new_amount > 0 else 0
-            
-            portfolio[symbol] = {
-                'amount': new_amount,
-                'avg_price': new_avg_price,
-                'total_invested': new_invested
-            }
-            
-            self.update_portfolio(username, portfolio)
-            
-            # İşlem kaydı ekle
-            transaction = {
-                'type': 'BUY',
-                'symbol': symbol,
-                'amount': coin_amount,
-                'price': price,
-                'total_cost': total_cost_usd,
-                'balance_after': new_balance
-            }
-            self.add_transaction(username, transaction)
+                self._append_transaction(conn, username, transaction)
+                self._touch(conn)
             
             self.logger.info(f"{username} {coin_amount:.6f} {symbol} satın aldı: ${price:.6f} (${total_cost_usd:.2f})")
             return True
@@ -248,61 +416,56 @@ class UserManager:
             return False
     
     def sell_crypto(self, username: str, symbol: str, amount_usdt: float, price: float) -> bool:
-        """Kripto para satma işlemi"""
+        """Kripto para satma işlemi (bakiye, pozisyon ve işlem kaydı tek işlemde)"""
         try:
-            user = self.get_user(username)
-            if not user:
-                return False
-            
-            portfolio = self.get_portfolio(username)
-            if symbol not in portfolio or portfolio[symbol]['amount'] < amount_usdt:
-                self.logger.warning(f"{username} yetersiz {symbol} miktarı")
-                return False
-            
-            current_balance = user['balance']
-            # Bakiye USD olduğu için doğrudan USDT miktarını kullan
-            total_revenue_usd = amount_usdt * price
-            
-            # Bakiyeyi güncelle
-            new_balance = current_balance + total_revenue_usd
-            self.update_user_balance(username, new_balance)
-            
-            # Portföyü güncelle
-            current_amount = portfolio[symbol]['amount']
-            current_invested = portfolio[symbol]['total_invested']
-            
-            new_amount = current_amount - amount_usdt
-            sold_ratio = amount_usdt / current_amount
-            sold_invested = current_invested * sold_ratio
-            new_invested = current_invested - sold_invested
-            
-            if new_amount > 0:
-                new_avg_price = new_invested / new_amount
-            else:
-                new_avg_price = 0
-            
-            portfolio[symbol] = {
-                'amount': new_amount,
-                'avg_price': new_avg_price,
-                'total_invested': new_invested
-            }
-            
-            # Miktar 0 ise portföyden çıkar
-            if new_amount <= 0:
-                del portfolio[symbol]
-            
-            self.update_portfolio(username, portfolio)
-            
-            # İşlem kaydı ekle
-            transaction = {
-                'type': 'SELL',
-                'symbol': symbol,
-                'amount': amount_usdt,
-                'price': price,
-                'total_revenue': total_revenue_usd,
-                'balance_after': new_balance
-            }
-            self.add_transaction(username, transaction)
+            with self.db.transaction() as conn:
+                row = conn.execute("SELECT balance FROM users WHERE username = ?", (username,)).fetchone()
+                if not row:
+                    return False
+                
+                position = conn.execute(POSITION_QUERY, (username, symbol)).fetchone()
+                if position is None or position[0] < amount_usdt:
+                    self.logger.warning(f"{username} yetersiz {symbol} miktarı")
+                    return False
+                
+                current_balance = row[0]
+                # Bakiye USD olduğu için doğrudan USDT miktarını kullan
+                total_revenue_usd = amount_usdt * price
+                
+                # Bakiyeyi güncelle
+                new_balance = current_balance + total_revenue_usd
+                conn.execute("UPDATE users SET balance = ? WHERE username = ?", (new_balance, username))
+                
+                # Portföyü güncelle
+                current_amount, _, current_invested = position
+                
+                new_amount = current_amount - amount_usdt
+                sold_ratio = amount_usdt / current_amount
+                sold_invested = current_invested * sold_ratio
+                new_invested = current_invested - sold_invested
+                
+                if new_amount > 0:
+                    new_avg_price = new_invested / new_amount
+                    self._write_position(conn, username, symbol, {
+                        'amount': new_amount,
+                        'avg_price': new_avg_price,
+                        'total_invested': new_invested
+                    })
+                else:
+                    # Miktar 0 ise portföyden çıkar
+                    conn.execute("DELETE FROM portfolios WHERE username = ? AND symbol = ?", (username, symbol))
+                
+                # İşlem kaydı ekle
+                transaction = {
+                    'type': 'SELL',
+                    'symbol': symbol,
+                    'amount': amount_usdt,
+                    'price': price,
+                    'total_revenue': total_revenue_usd,
+                    'balance_after': new_balance
+                }
+                self._append_transaction(conn, username, transaction)
+                self._touch(conn)
             
             self.logger.info(f"{username} {amount_usdt:.6f} {symbol} sattı: ${price:.6f} (${total_revenue_usd:.2f})")
             return True
@@ -10,6 +10,14 @@ from datetime import datetime
 import pandas as pd
 
 
+# Aynı (sembol, url) haberi tekrar yazılmaz; tekil indeks yoksa da çalışır
+NEWS_INSERT = '''
+    INSERT INTO news_data (symbol, title, sentiment, sentiment_score, source, url)
+    SELECT ?, ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (SELECT 1 FROM news_data WHERE symbol = ? AND url = ?)
+'''
+
+
 class DataManager:
     def __init__(self, data_dir="data"):
         self.data_dir = data_dir
@@ -69,67 +77,96 @@ class DataManager:
             )
         ''')
         
+        # Haber tekrar kontrolü için (sembol, url) indeksi
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_news_data_symbol_url ON news_data (symbol, url)
+        ''')
+        
         conn.commit()
         conn.close()
     
     def save_stock_data(self, stock_data):
         """Hisse verilerini veritabanına kaydeder"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO stock_data 
-            (symbol, current_price, daily_change, yearly_change, volume, volume_ratio, high_52w, low_52w)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        self.save_stock_data_batch([stock_data])
+    
+    def save_stock_data_batch(self, stock_list):
+        """Birden çok hissenin anlık verilerini tek işlemde kaydeder"""
+        # Kaynağa göre bulunmayan alanlar (ör. StockScraper çıktısında günlük değişim) boş yazılır
+        rows = [(
             stock_data['symbol'],
             stock_data['current_price'],
-            stock_data['daily_change'],
-            stock_data['yearly_change'],
-            stock_data['current_volume'],
-            stock_data['volume_ratio'],
-            stock_data['high_52w'],
-            stock_data['low_52w']
-        ))
+            stock_data.get('daily_change'),
+            stock_data.get('yearly_change', stock_data.get('change_365d')),
+            stock_data.get('current_volume'),
+            stock_data.get('volume_ratio'),
+            stock_data.get('high_52w'),
+            stock_data.get('low_52w')
+        ) for stock_data in stock_list]
+        if not rows:
+            return 0
         
-        conn.commit()
-        conn.close()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT INTO stock_data 
+                    (symbol, current_price, daily_change, yearly_change, volume, volume_ratio, high_52w, low_52w)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+        finally:
+            conn.close()
+        
+        return len(rows)
     
     def save_news_data(self, news_data):
         """Haber verilerini veritabanına kaydeder"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.save_news_batch([news_data])
+    
+    def save_news_batch(self, news_data_list):
+        """Birden çok hissenin haberlerini tek işlemde kaydeder (aynı sembol ve url atlanır)"""
+        rows = [(
+            news_data['symbol'],
+            news['title'],
+            news['sentiment']['sentiment'],
+            news['sentiment']['score'],
+            news['source'],
+            news['url'],
+            news_data['symbol'],
+            news['url']
+        ) for news_data in news_data_list for news in news_data.get('news_list', [])]
+        if not rows:
+            return 0
         
-        for news in news_data.get('news_list', []):
-            cursor.execute('''
-                INSERT INTO news_data 
-                (symbol, title, sentiment, sentiment_score, source, url)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                news_data['symbol'],
-                news['title'],
-                news['sentiment']['sentiment'],
-                news['sentiment']['score'],
-                news['source'],
-                news['url']
-            ))
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.executemany(NEWS_INSERT, rows)
+        finally:
+            conn.close()
         
-        conn.commit()
-        conn.close()
+        return len(rows)
     
     def save_analysis_result(self, symbol, analysis_type, result, confidence=0.0):
         """Analiz sonuçlarını veritabanına kaydeder"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.save_analysis_batch([(symbol, analysis_type, result, confidence)])
+    
+    def save_analysis_batch(self, results):
+        """(sembol, tür, sonuç, güven) analiz sonuçlarını tek işlemde kaydeder"""
+        if not results:
+            return 0
         
-        cursor.execute('''
-            INSERT INTO analysis_results 
-            (symbol, analysis_type, result, confidence)
-            VALUES (?, ?, ?, ?)
-        ''', (symbol, analysis_type, result, confidence))
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT INTO analysis_results 
+                    (symbol, analysis_type, result, confidence)
+                    VALUES (?, ?, ?, ?)
+                ''', results)
+        finally:
+            conn.close()
         
-        conn.commit()
-        conn.close()
+        return len(results)
     
     def get_watchlist(self):
         """Takip listesini yükler"""
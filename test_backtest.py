@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Geriye Dönük Test Testleri
+Vektörel backtest motorunun tek tek skorlama ile aynı sinyalleri ürettiğini ve
+tarihsel veri önbelleğini ağ bağlantısı olmadan test eder
+"""
+
+import sys
+import os
+import time
+import sqlite3
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from crypto.backtest import Backtester, history_features, simulate_exits, KLINES_PAGE_LIMIT
+from crypto.candles import Candles
+from crypto.indicator_panel import score_24h_features, score_1h_features, ONE_HOUR_RECOMMENDATIONS
+from crypto.param_sweep import ParameterSweep, grid, random_search, DEFAULT_SPACE
+from test_crypto_scan import make_random_klines, new_analyzer
+
+HOUR_MS = 3_600_000
+
+
+def test_signals_match_scorers():
+    """Her mumdaki backtest skorlarının o ana kadarki 168 mumla yapılan analizle aynı olduğunu test eder"""
+    print("🔁 Backtest Sinyal Testi Başlıyor...")
+
+    rng = np.random.default_rng(3)
+    klines = {f"COIN{i}USDT": make_random_klines(rng, limit=260) for i in range(6)}
+    history = {symbol: Candles.from_rows(rows) for symbol, rows in klines.items()}
+
+    def stack(column):
+        return np.vstack([history[symbol].array(column) for symbol in klines])
+
+    close, high, low = stack('close'), stack('high'), stack('low')
+    features = history_features(close, high, low, stack('volume'), stack('quote_asset_volume'))
+    scored_24h = score_24h_features(features)
+    scored_1h = score_1h_features(features)
+
+    checked = 0
+    for t in (167, 180, 211, 259):
+        # Tarama t anında yalnızca son 168 mumu görür
+        analyzer = new_analyzer()
+        analyzer.min_volume_usdt = 0
+        analyzer.fetcher.get_json = lambda url, params=None, t=t: klines[params['symbol']][t - 167:t + 1]
+        for row, symbol in enumerate(klines):
+            coin_data = analyzer.get_coin_data(symbol)
+            expected_24h = analyzer.analyze_24h_profit_potential(coin_data)
+            expected_1h = analyzer.analyze_1h_profit_potential(coin_data)
+
+            assert np.isclose(scored_24h['profit_score'][row, t], expected_24h['profit_score']), (symbol, t)
+            assert np.isclose(scored_24h['target_price'][row, t], expected_24h['target_price'])
+            assert np.isclose(scored_1h['opportunity_score'][row, t], expected_1h['opportunity_score'])
+            assert ONE_HOUR_RECOMMENDATIONS[scored_1h['rec_code'][row, t]] == expected_1h['recommendation']
+            checked += 1
+
+    print(f"✅ {checked} tarama anı tek tek skorlama ile aynı")
+    print("\n✅ Backtest sinyal testi tamamlandı!")
+
+
+def test_simulated_exits():
+    """Hedef fiyat ve süre sonu çıkışlarını elle hesaplanmış örnekle test eder"""
+    print("🎯 Çıkış Simülasyonu Testi Başlıyor...")
+
+    close = np.array([[100.0, 101.0, 99.0, 104.0, 103.0]])
+    high = close + 2
+    low = close - 3
+    target = np.array([[105.0, 100.0, 100.0, 100.0, 100.0]])
+
+    exits = simulate_exits(close, high, low, target, horizon=3)
+
+    # t=0: hedef 105, 3. mumda (yüksek 106) ulaşılır; en düşük 96
+    assert exits['hit'][0, 0] and exits['return'][0, 0] == 5.0
+    assert exits['drawdown'][0, 0] == -4.0
+    # t=1: hedef yok -> 3 mum sonraki kapanış (103) ile çıkılır
+    assert exits['hit'][0, 1] and np.isclose(exits['return'][0, 1], 2 / 101 * 100)
+    # Sondaki mumlar için pencere tamamlanmadı
+    assert exits['complete'].tolist() == [[True, True, False, False, False]]
+
+    print("✅ Hedef ve süre sonu çıkışları doğru")
+    print("\n✅ Çıkış simülasyonu testi tamamlandı!")
+
+
+class PagedKlineServer:
+    """startTime/endTime ile sayfalı yanıt veren sahte /klines sunucusu"""
+
+    def __init__(self, first_open, now_ms):
+        self.first_open = first_open
+        self.now_ms = now_ms
+        self.requests = []
+
+    def get_json(self, url, params=None):
+        self.requests.append(dict(params))
+        start = max(params['startTime'], self.first_open)
+        start += -start % HOUR_MS
+        end = min(params['endTime'], self.now_ms)
+        opens = range(start, end + 1, HOUR_MS)[:params['limit']]
+        return [[t, "1", "2", "0.5", str(1 + (t // HOUR_MS) % 7), "10", t + HOUR_MS - 1, "100", 1, "5", "50", "0"]
+                for t in opens]
+
+
+def test_history_cache():
+    """Geçmiş verinin yerel depoya yazıldığını ve sonraki yüklemede yalnızca eksik mumların çekildiğini test eder"""
+    print("💾 Geçmiş Veri Önbelleği Testi Başlıyor...")
+
+    now_ms = 1_700_000_000_000 + HOUR_MS // 2
+    server = PagedKlineServer(first_open=now_ms - 200 * 86_400_000, now_ms=now_ms)
+    analyzer = new_analyzer()
+    analyzer.fetcher.get_json = server.get_json
+    backtester = Backtester(analyzer, data_dir=analyzer.symbol_universe.data_dir)
+
+    first = backtester.load_history(["BTCUSDT"], days=90, end_ms=now_ms)["BTCUSDT"]
+    pages = len(server.requests)
+    assert len(first) == 90 * 24 and pages == 3
+    assert analyzer.candle_store.bounds("BTCUSDT", "1h")[2] == 90 * 24
+    print(f"✅ 90 günlük geçmiş {pages} sayfada çekildi ({KLINES_PAGE_LIMIT} mum/sayfa)")
+
+    # İki saat sonra yalnızca son mumdan itibaren istenir
+    server.now_ms += 2 * HOUR_MS
+    second = backtester.load_history(["BTCUSDT"], days=90, end_ms=server.now_ms)["BTCUSDT"]
+    assert len(server.requests) == pages + 1
+    assert server.requests[-1]['startTime'] == int(first.open_time[-1])
+    assert len(second) == 90 * 24 and second.open_time[-1] == first.open_time[-1] + 2 * HOUR_MS
+    assert (np.diff(second.open_time) == HOUR_MS).all()
+
+    # Daha uzun geçmiş istendiğinde baştan çekilir
+    longer = backtester.load_history(["BTCUSDT"], days=120, end_ms=server.now_ms)["BTCUSDT"]
+    assert len(longer) == 120 * 24 and server.requests[-1]['startTime'] > server.requests[-2]['startTime']
+
+    # Aradaki eksik mumlar tespit edilip yalnızca o aralık çekilir
+    hole_start = int(longer.open_time[1000])
+    conn = sqlite3.connect(analyzer.candle_store.db_path)
+    conn.execute("DELETE FROM candles WHERE open_time BETWEEN ? AND ?", (hole_start, hole_start + 9 * HOUR_MS))
+    conn.commit()
+    conn.close()
+    assert analyzer.candle_store.gaps("BTCUSDT", "1h", int(longer.open_time[0]), int(longer.open_time[-1])) == \
+        [(hole_start, hole_start + 10 * HOUR_MS - 1)]
+    requests_before = len(server.requests)
+    filled = backtester.load_history(["BTCUSDT"], days=120, end_ms=server.now_ms)["BTCUSDT"]
+    gap_request = server.requests[requests_before]
+    assert (gap_request['startTime'], gap_request['endTime']) == (hole_start, hole_start + 10 * HOUR_MS - 1)
+    assert len(server.requests) == requests_before + 2  # boşluk + kuyruk
+    assert (filled.close == longer.close).all()
+
+    # Listeleme öncesi boş aralık bir kez istenir, sonra işaretlenip atlanır
+    backtester.load_history(["BTCUSDT"], days=250, end_ms=server.now_ms)
+    requests_before = len(server.requests)
+    backtester.load_history(["BTCUSDT"], days=250, end_ms=server.now_ms)
+    assert len(server.requests) == requests_before + 1  # yalnızca kuyruk
+
+    print("\n✅ Geçmiş veri önbelleği testi tamamlandı!")
+
+
+def test_backtest_speed():
+    """Bir yıllık saatlik veride yüz sembolün birkaç saniyede test edildiğini doğrular"""
+    print("⏱️ Backtest Hız Testi Başlıyor...")
+
+    rng = np.random.default_rng(5)
+    length = 365 * 24
+    open_time = 1_700_000_000_000 + np.arange(length) * HOUR_MS
+    history = {}
+    for i in range(100):
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+        volume = rng.uniform(100, 1000, length)
+        history[f"COIN{i}USDT"] = Candles(
+            open_time=open_time, open=close, high=close * 1.01, low=close * 0.99, close=close,
+            volume=volume, close_time=open_time + HOUR_MS - 1, quote_asset_volume=volume * close * 1000,
+        )
+
+    backtester = Backtester(new_analyzer())
+    start = time.time()
+    reports = backtester.run(history, min_volume=0)
+    elapsed = time.time() - start
+    print(f"✅ 100 sembol x {length} mum: {elapsed:.2f} sn")
+    print(reports['24h'])
+
+    assert elapsed < 15
+    evaluated = length - 167 - 24
+    assert reports['24h']['signals'].sum() == 100 * evaluated
+    assert reports['1h']['signals'].sum() == 100 * (length - 167 - 1)
+    assert set(reports['24h'].index) == {"KESİNLİKLE AL", "GÜÇLÜ AL", "AL", "İZLE", "BEKLE"}
+
+    print("\n✅ Backtest hız testi tamamlandı!")
+
+
+def make_history(rng, count, length):
+    """Rastgele yürüyüşle aynı uzunlukta sahte mum geçmişi üretir"""
+    open_time = 1_700_000_000_000 + np.arange(length) * HOUR_MS
+    history = {}
+    for i in range(count):
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.015, length)))
+        volume = rng.uniform(100, 1000, length)
+        history[f"COIN{i}USDT"] = Candles(
+            open_time=open_time, open=close, high=close * 1.01, low=close * 0.99, close=close,
+            volume=volume, close_time=open_time + HOUR_MS - 1, quote_asset_volume=volume * close * rng.uniform(10, 1000),
+        )
+    return history
+
+
+def test_parameter_sweep():
+    """Parametre taramasının süreç havuzunda tek süreçle aynı, backtest ile tutarlı sonuç verdiğini test eder"""
+    print("🎛️ Parametre Taraması Testi Başlıyor...")
+
+    analyzer = new_analyzer()
+    backtester = Backtester(analyzer, data_dir=analyzer.symbol_universe.data_dir)
+
+    # Geçmiş yerel mum deposuna yazılır, tarama yalnızca depodan okur
+    for symbol, candles in make_history(np.random.default_rng(9), 12, 1200).items():
+        analyzer.candle_store.write(symbol, "1h", candles)
+
+    def offline(url, params=None):
+        raise AssertionError("Parametre taraması ağ isteği yapmamalı")
+    analyzer.fetcher.get_json = offline
+    history = backtester.load_cached([f"COIN{i}USDT" for i in range(12)])
+    assert len(history) == 12
+
+    space = {'rsi_oversold_24h': [20, 25, 30], 'profit_tiers': [(70, 50, 30, 15), (80, 60, 40, 20)],
+             'min_volume_usdt': [0, 20_000_000]}
+    param_sets = grid(space)
+    assert len(param_sets) == 12
+    assert len(random_search(DEFAULT_SPACE, 20, seed=1)) == 20
+    assert len(random_search(space, 50, seed=1)) == 12  # Uzaydan büyük örnek istenemez
+
+    output_path = os.path.join(backtester.history_dir, "sweep.csv")
+    start = time.time()
+    parallel = ParameterSweep(backtester, max_processes=2, min_signals=10).run(history, param_sets, output_path)
+    print(f"✅ {len(param_sets)} parametre seti 2 süreçte {time.time() - start:.2f} sn")
+    sequential = ParameterSweep(backtester, max_processes=1, min_signals=10).run(history, param_sets)
+
+    assert os.path.exists(output_path)
+    assert parallel.drop(columns='profit_tiers').equals(sequential.drop(columns='profit_tiers'))
+    assert list(parallel['rank']) == list(range(1, 13))
+    enough = parallel[parallel['signals_24h'] >= 10]['avg_return_24h']
+    assert enough.is_monotonic_decreasing
+
+    # Varsayılan eşikli set, backtest raporundaki "AL" ve üstü kademelerle aynı olmalı
+    default = parallel[(parallel['rsi_oversold_24h'] == 25) & (parallel['min_volume_usdt'] == 0)
+                       & (parallel['profit_tiers'] == (70, 50, 30, 15))].iloc[0]
+    report = backtester.run(history, min_volume=0)['24h'].loc[["KESİNLİKLE AL", "GÜÇLÜ AL", "AL"]]
+    assert default['signals_24h'] == report['signals'].sum()
+    expected_return = (report['avg_return'] * report['signals']).sum() / report['signals'].sum()
+    assert np.isclose(default['avg_return_24h'], expected_return)
+
+    # Hacim eşiği 1h ve fırsat sinyallerini azaltır, 24h sinyallerini etkilemez
+    strict = parallel[(parallel['rsi_oversold_24h'] == 25) & (parallel['min_volume_usdt'] == 20_000_000)
+                      & (parallel['profit_tiers'] == (70, 50, 30, 15))].iloc[0]
+    assert strict['signals_24h'] == default['signals_24h']
+    assert strict['signals_1h'] < default['signals_1h']
+
+    # En iyi set canlı analizöre uygulanır
+    best = parallel.iloc[0]
+    ParameterSweep.apply(analyzer, best.to_dict())
+    assert analyzer.scoring_params['rsi_oversold_24h'] == best['rsi_oversold_24h']
+    assert analyzer.min_volume_usdt == best['min_volume_usdt']
+    print(f"✅ En iyi set: RSI<{best['rsi_oversold_24h']}, kademeler {best['profit_tiers']}, "
+          f"24h ortalama getiri %{best['avg_return_24h']:.3f}")
+
+    print("\n✅ Parametre taraması testi tamamlandı!")
+
+
+if __name__ == "__main__":
+    test_signals_match_scorers()
+    test_simulated_exits()
+    test_history_cache()
+    test_backtest_speed()
+    test_parameter_sweep()
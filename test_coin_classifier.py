@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Coin Sınıflandırma İndeksi Testleri
+İndeksin eski alt dize taramalarıyla aynı sonucu verdiğini ve sembol evreniyle
+birlikte saklandığını test eder
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto.coin_classifier import (CoinClassifier, COIN_TYPE_INDICATORS, CATEGORY_INDICATORS, MAJOR_COINS,
+                                    STABLECOINS, TokenMatcher)
+from crypto.symbol_universe import SymbolUniverse
+
+
+def reference_coin_type(symbol):
+    """Eski determine_coin_type zincirinin fiyat/hacimden bağımsız kısmı"""
+    if symbol in MAJOR_COINS:
+        return "Major Coin"
+    if symbol in STABLECOINS:
+        return "Stablecoin"
+    for coin_type, indicators in COIN_TYPE_INDICATORS:
+        if any(indicator in symbol for indicator in indicators):
+            return coin_type
+    return None
+
+
+def reference_in_category(symbol, category):
+    """Eski filter_opportunities_by_category koşulları"""
+    if category == "ALTCOIN":
+        return not any(major in symbol for major in CATEGORY_INDICATORS['MAJOR'])
+    return any(indicator in symbol for indicator in CATEGORY_INDICATORS[category])
+
+
+def make_symbols(count=3000, seed=7):
+    """Göstergeleri rastgele parçalarla birleştiren sahte sembol evreni"""
+    rng = random.Random(seed)
+    tokens = [token for _, indicators in COIN_TYPE_INDICATORS for token in indicators]
+    tokens += [token for indicators in CATEGORY_INDICATORS.values() for token in indicators]
+    letters = "ABCDEFGHIKLMNOPRSTUXYZ1"
+    symbols = set(MAJOR_COINS) | set(STABLECOINS)
+    while len(symbols) < count:
+        parts = [rng.choice(tokens) if rng.random() < 0.5 else
+                 ''.join(rng.choice(letters) for _ in range(rng.randint(1, 4)))
+                 for _ in range(rng.randint(1, 3))]
+        symbols.add(''.join(parts) + "USDT")
+    return sorted(symbols)
+
+
+def test_matches_substring_scan():
+    """İndeksin eski any(x in symbol) taramalarıyla birebir aynı olduğunu test eder"""
+    print("🏷️ Sınıflandırma Eşdeğerlik Testi Başlıyor...")
+
+    symbols = make_symbols()
+    classifier = CoinClassifier()
+    classifier.build({symbol: {} for symbol in symbols})
+
+    for symbol in symbols:
+        assert classifier.coin_type(symbol) == reference_coin_type(symbol), symbol
+        for category in list(CATEGORY_INDICATORS) + ["ALTCOIN"]:
+            assert classifier.in_category(symbol, category) == reference_in_category(symbol, category), \
+                (symbol, category)
+
+    # Örtüşen ve önek olan göstergeler kaybolmaz
+    matcher = TokenMatcher({'a': ['OP'], 'b': ['OPTIMISM'], 'c': ['TIM']})
+    assert matcher.labels("XOPTIMISMUSDT") == {'a', 'b', 'c'}
+    assert classifier.coin_type("BNBUSDT") == "Major Coin"
+    assert classifier.in_category("BNBUSDT", "MAJOR") and classifier.in_category("BNBUSDT", "EXCHANGE")
+
+    # Evrende olmayan sembol ilk kullanımda eklenir
+    assert "NEWPEPEUSDT" not in classifier.index
+    assert classifier.coin_type("NEWPEPEUSDT") == "Meme Coin"
+    assert classifier.in_category("NEWPEPEUSDT", "MEME")
+
+    opportunities = [{'symbol': symbol, 'volume_24h': (i % 4) * 5_000_000} for i, symbol in enumerate(symbols)]
+    assert classifier.filter(opportunities, "ALL") is opportunities
+    micro = classifier.filter(opportunities, "MICRO_CAP")
+    assert micro == [opp for opp in opportunities if opp['volume_24h'] < 10_000_000]
+
+    start = time.perf_counter()
+    for _ in range(20):
+        for category in CATEGORY_INDICATORS:
+            classifier.filter(opportunities, category)
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(20):
+        for category in CATEGORY_INDICATORS:
+            [opp for opp in opportunities if reference_in_category(opp['symbol'], category)]
+    scanned = time.perf_counter() - start
+    print(f"✅ {len(symbols)} sembol: kova {indexed:.3f} sn, alt dize taraması {scanned:.3f} sn")
+
+    print("\n✅ Sınıflandırma eşdeğerlik testi tamamlandı!")
+
+
+def test_persisted_with_universe():
+    """Sınıflandırmanın evren anlık görüntüsüne yazıldığını ve yeniden hesaplanmadığını test eder"""
+    print("💾 Sınıflandırma Kalıcılık Testi Başlıyor...")
+
+    symbols = ['DOGEUSDT', 'UNIUSDT', 'BTCUSDT', 'FOOUSDT']
+
+    class FakeFetcher:
+        def get_json(self, url, params=None):
+            return {'symbols': [{'symbol': s, 'status': 'TRADING', 'baseAsset': s[:-4], 'quoteAsset': 'USDT'}
+                                for s in symbols]}
+
+    with tempfile.TemporaryDirectory(prefix="coin_classifier_test_") as data_dir:
+        classifier = CoinClassifier()
+        universe = SymbolUniverse(FakeFetcher(), "https://api.binance.com/api/v3/exchangeInfo",
+                                  data_dir=data_dir, classifier=classifier)
+        assert universe.refresh()
+        assert classifier.coin_type('DOGEUSDT') == "Meme Coin"
+        assert classifier.buckets['DEFI'] == {'UNIUSDT'}
+
+        with open(universe.cache_path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        assert snapshot['symbols']['UNIUSDT']['coin_type'] == "DeFi Token"
+        assert snapshot['symbols']['FOOUSDT']['coin_type'] is None
+
+        # Yeni süreç: sınıflandırma diskten gelir, hiçbiri yeniden hesaplanmaz
+        warm_classifier = CoinClassifier()
+        warm = SymbolUniverse(FakeFetcher(), universe.exchange_info_url, data_dir=data_dir,
+                              classifier=warm_classifier)
+        calls = []
+        original = warm_classifier.classify
+        warm_classifier.classify = lambda symbol: calls.append(symbol) or original(symbol)
+        assert warm.load()
+        assert calls == []
+        assert warm_classifier.coin_type('BTCUSDT') == "Major Coin"
+        assert warm_classifier.in_category('BTCUSDT', 'MAJOR')
+
+        # Kural sürümü değişmişse yeniden hesaplanıp kaydedilir
+        snapshot['classifier_version'] = 0
+        with open(universe.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        assert warm.load()
+        assert sorted(calls) == sorted(symbols)
+
+    print("\n✅ Sınıflandırma kalıcılık testi tamamlandı!")
+
+
+if __name__ == "__main__":
+    test_matches_substring_scan()
+    test_persisted_with_universe()
@@ -0,0 +1,836 @@
+#!/usr/bin/env python3
+"""
+Kripto Tarama Testleri
+Ağ bağlantısı olmadan sahte Binance yanıtlarıyla tarama altyapısını test eder
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import sqlite3
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from crypto.crypto_analyzer import CryptoAnalyzer
+from crypto.indicator_panel import IndicatorPanel
+from crypto.candles import Candles
+from crypto.parallel_scan import ShardedScanner
+from crypto.resample import resample_candles
+
+FAKE_LATENCY = 0.2  # Sahte istek gecikmesi (saniye)
+
+# Testler data/ klasörüne yazmaz; her analizör kendi geçici klasörünü kullanır
+TEST_DATA_DIR = tempfile.TemporaryDirectory(prefix="crypto_scan_test_")
+
+
+def new_analyzer(**kwargs):
+    """Geçici veri klasörüyle CryptoAnalyzer oluşturur"""
+    return CryptoAnalyzer(data_dir=tempfile.mkdtemp(dir=TEST_DATA_DIR.name), **kwargs)
+
+
+def make_fake_klines(symbol, limit=168, start_ms=1_700_000_000_000):
+    """Sembole göre deterministik sahte mum verisi üretir"""
+    seed = sum(ord(c) for c in symbol)
+    rows = []
+    price = 1.0 + seed % 50
+    for i in range(limit):
+        price *= 1 + (((seed * (i + 7)) % 13) - 6) / 400
+        open_time = start_ms + i * 3_600_000
+        rows.append([
+            open_time, f"{price:.6f}", f"{price * 1.01:.6f}", f"{price * 0.99:.6f}", f"{price:.6f}",
+            "1000.0", open_time + 3_599_999, f"{price * 1000 * (1 + seed % 5):.2f}", 100, "500.0", "500.0", "0"
+        ])
+    return rows
+
+
+class FakeKlineServer:
+    """startTime/limit destekleyen, saati ilerletilebilen sahte /klines sunucusu"""
+
+    HOUR_MS = 3_600_000
+
+    def __init__(self, now_ms=1_700_000_000_000 + 200 * 3_600_000 + 1_800_000):
+        self.now_ms = now_ms
+        self.requests = []
+        self.rows_served = []
+
+    def candle(self, open_time):
+        """Açılış zamanına göre deterministik mum (açık mumun kapanışı saate bağlı)"""
+        base = 100 + (open_time // self.HOUR_MS) % 17
+        close = base + (self.now_ms % self.HOUR_MS) / self.HOUR_MS if open_time + self.HOUR_MS > self.now_ms else base + 0.5
+        return [open_time, str(base), str(base + 2), str(base - 2), str(close), "10.0",
+                open_time + self.HOUR_MS - 1, str(close * 10), 5, "5.0", "50.0", "0"]
+
+    def get_json(self, url, params=None):
+        self.requests.append(dict(params))
+        limit = params.get('limit', 500)
+        last_open = self.now_ms - self.now_ms % self.HOUR_MS
+        if 'startTime' in params:
+            first = params['startTime'] - params['startTime'] % self.HOUR_MS
+            last = min(last_open, params.get('endTime', last_open))
+            opens = range(first, last + 1, self.HOUR_MS)[:limit]
+        else:
+            opens = range(last_open - (limit - 1) * self.HOUR_MS, last_open + 1, self.HOUR_MS)
+        self.rows_served.append(len(opens))
+        return [self.candle(t) for t in opens]
+
+
+def make_fake_ticker(symbol, index):
+    """Sembol için sahte 24 saatlik ticker kaydı üretir"""
+    return {
+        'symbol': symbol,
+        'lastPrice': "1.0",
+        'priceChangePercent': f"{(index % 7) - 3:.2f}",
+        'quoteVolume': f"{(index + 1) * 500_000:.2f}",
+    }
+
+
+def make_fake_get_json(symbols, calls=None):
+    """ConcurrentFetcher.get_json yerine geçen sahte fonksiyon"""
+    def fake_get_json(url, params=None):
+        time.sleep(FAKE_LATENCY)
+        if calls is not None:
+            calls.append((url.rsplit('/', 1)[-1], dict(params or {})))
+        if url.endswith('/exchangeInfo'):
+            return {'symbols': [{'symbol': s, 'status': 'TRADING'} for s in symbols]}
+        if url.endswith('/ticker/24hr') and not params:
+            return [make_fake_ticker(s, i) for i, s in enumerate(symbols)]
+        if url.endswith('/klines'):
+            return make_fake_klines(params['symbol'], params.get('limit', 168))
+        raise ValueError(f"Beklenmeyen URL: {url}")
+    return fake_get_json
+
+
+def test_parallel_scan():
+    """Paralel taramanın sıralı tarama ile aynı sonucu daha hızlı verdiğini test eder"""
+    print("🪙 Eşzamanlı Veri Çekme Testi Başlıyor...")
+
+    symbols = [f"COIN{i}USDT" for i in range(20)]
+
+    parallel = new_analyzer(max_workers=20)
+    parallel.fetcher.get_json = make_fake_get_json(symbols)
+
+    sequential = new_analyzer(max_workers=1)
+    sequential.fetcher.get_json = make_fake_get_json(symbols)
+
+    start = time.time()
+    parallel_data = parallel.get_multiple_coin_data(symbols)
+    parallel_time = time.time() - start
+    print(f"✅ Paralel çekim: {len(parallel_data)} coin, {parallel_time:.2f} sn")
+
+    start = time.time()
+    sequential_data = sequential.get_multiple_coin_data(symbols)
+    sequential_time = time.time() - start
+    print(f"✅ Sıralı çekim: {len(sequential_data)} coin, {sequential_time:.2f} sn")
+
+    assert list(parallel_data.keys()) == symbols
+    assert parallel_time < sequential_time / 4
+
+    for symbol in symbols:
+        assert parallel_data[symbol]['current_price'] == sequential_data[symbol]['current_price']
+        assert parallel_data[symbol]['volume_24h'] == sequential_data[symbol]['volume_24h']
+
+    # Tarama metotları aynı coin_data sözlüklerini kullanmalı
+    parallel_results = parallel.find_24h_profit_opportunities(min_score=0, max_results=50)
+    sequential_results = sequential.find_24h_profit_opportunities(min_score=0, max_results=50)
+    assert [r['symbol'] for r in parallel_results] == [r['symbol'] for r in sequential_results]
+    print(f"✅ {len(parallel_results)} sonuç iki modda da aynı sırada")
+
+    print("\n✅ Eşzamanlı veri çekme testi tamamlandı!")
+
+
+def test_ticker_prefilter():
+    """Toplu ticker ön filtresinin yalnızca kalan çiftler için mum verisi çektiğini test eder"""
+    print("🔎 Ticker Ön Filtre Testi Başlıyor...")
+
+    symbols = [f"COIN{i}USDT" for i in range(20)] + ['USDCUSDT', 'FDUSDUSDT']
+    calls = []
+
+    analyzer = new_analyzer(max_workers=20)
+    analyzer.fetcher.get_json = make_fake_get_json(symbols, calls)
+    analyzer.min_volume_usdt = 5_000_000
+
+    pairs = analyzer.prefilter_pairs(symbols, min_volume=analyzer.min_volume_usdt)
+    print(f"✅ {len(symbols)} çiftten {len(pairs)} tanesi ön filtreden geçti")
+
+    # Hacme göre azalan sırada, stablecoin yok, eşik * slack üstü
+    assert 'USDCUSDT' not in pairs and 'FDUSDUSDT' not in pairs
+    assert pairs[0] == 'COIN19USDT'
+    assert len(pairs) == 13  # (i + 1) * 500K >= 4M -> i >= 7
+
+    filtered = analyzer.prefilter_pairs(symbols, min_abs_change=2.0)
+    assert all(abs((symbols.index(p) % 7) - 3) >= 2 for p in filtered)
+
+    calls.clear()
+    analyzer.find_opportunities(min_score=0, max_results=50)
+    kline_calls = [c for c in calls if c[0] == 'klines']
+    ticker_calls = [c for c in calls if c[0] == '24hr']
+    print(f"✅ Tarama: {len(ticker_calls)} toplu ticker, {len(kline_calls)} mum isteği")
+    assert len(ticker_calls) == 1
+    assert len(kline_calls) == len(pairs)  # Yalnızca hacim eşiğini geçenler
+
+    print("\n✅ Ticker ön filtre testi tamamlandı!")
+
+
+def test_incremental_kline_cache():
+    """Süresi dolan önbelleğin yalnızca yeni mumları çektiğini test eder"""
+    print("🧱 Artımlı Mum Önbelleği Testi Başlıyor...")
+
+    server = FakeKlineServer()
+    analyzer = new_analyzer()
+    analyzer.fetcher.get_json = server.get_json
+    analyzer.cache_duration = 0  # Her çağrıda yenile
+
+    first = analyzer.get_coin_data("BTCUSDT")
+    assert len(first['data']) == 168
+    assert 'startTime' not in server.requests[-1]
+
+    # Aynı saat içinde: yalnızca açık mum güncellenir
+    server.now_ms += 600_000
+    second = analyzer.get_coin_data("BTCUSDT")
+    assert server.requests[-1]['startTime'] == int(first['data']['open_time'].iloc[-1].value // 1_000_000)
+    assert len(second['data']) == 168
+    assert second['data']['open_time'].iloc[-1] == first['data']['open_time'].iloc[-1]
+    assert second['current_price'] != first['current_price']
+
+    # İki saat sonra: iki yeni mum eklenir, en eskiler düşer
+    server.now_ms += 2 * FakeKlineServer.HOUR_MS
+    third = analyzer.get_coin_data("BTCUSDT")
+    fresh_server = FakeKlineServer(server.now_ms)
+    fresh = new_analyzer()
+    fresh.fetcher.get_json = fresh_server.get_json
+    expected = fresh.get_coin_data("BTCUSDT")
+
+    payload = sum(server.rows_served[1:])
+    print(f"✅ Yenilemelerde toplam {payload} mum çekildi (tam çekim: 168)")
+    assert payload == 4  # açık mum + (açık mum güncellemesi + 2 yeni mum)
+    assert (third['data']['close'].to_numpy() == expected['data']['close'].to_numpy()).all()
+    assert (third['data']['open_time'] == expected['data']['open_time']).all()
+    assert third['change_7d'] == expected['change_7d']
+
+    # Limitten büyük boşlukta tam yeniden çekim yapılır
+    server.now_ms += 400 * FakeKlineServer.HOUR_MS
+    gap = analyzer.get_coin_data("BTCUSDT")
+    assert 'startTime' not in server.requests[-1]
+    assert gap['data']['open_time'].is_monotonic_increasing and len(gap['data']) == 168
+
+    print("\n✅ Artımlı mum önbelleği testi tamamlandı!")
+
+
+def test_persistent_candle_store():
+    """Yeniden başlatılan analizörün mumları yerel depodan alıp yalnızca eksikleri çektiğini test eder"""
+    print("🗄️ Yerel Mum Deposu Testi Başlıyor...")
+
+    server = FakeKlineServer()
+    data_dir = tempfile.mkdtemp(dir=TEST_DATA_DIR.name)
+    first = CryptoAnalyzer(data_dir=data_dir)
+    first.fetcher.get_json = server.get_json
+    before = first.get_coin_data("BTCUSDT")
+    assert first.candle_store.bounds("BTCUSDT", "1h")[2] == 168
+
+    # Yeni süreç iki saat sonra: tam çekim yerine son saklanan mumdan itibaren istenir
+    server.now_ms += 2 * FakeKlineServer.HOUR_MS
+    restarted = CryptoAnalyzer(data_dir=data_dir)
+    restarted.fetcher.get_json = server.get_json
+    served = len(server.rows_served)
+    after = restarted.get_coin_data("BTCUSDT")
+    assert server.requests[-1]['startTime'] == int(before['data'].open_time[-1])
+    assert sum(server.rows_served[served:]) == 3
+
+    fresh = new_analyzer()
+    fresh.fetcher.get_json = FakeKlineServer(server.now_ms).get_json
+    expected = fresh.get_coin_data("BTCUSDT")
+    assert (after['data'].open_time == expected['data'].open_time).all()
+    assert (after['data'].close == expected['data'].close).all()
+
+    # Depodaki boşluk soğuk başlangıçta yalnızca eksik aralık çekilerek doldurulur
+    store = restarted.candle_store
+    open_times = after['data'].open_time
+    conn = sqlite3.connect(store.db_path)
+    conn.execute("DELETE FROM candles WHERE open_time BETWEEN ? AND ?", (int(open_times[50]), int(open_times[51])))
+    conn.commit()
+    conn.close()
+    assert len(store.read("BTCUSDT", "1h", limit=168)) == 168  # Boşluk nedeniyle daha eskiye uzanır
+
+    gap_filled = CryptoAnalyzer(data_dir=data_dir)
+    gap_filled.fetcher.get_json = server.get_json
+    requests_before = len(server.requests)
+    result = gap_filled.get_coin_data("BTCUSDT")
+    gap_request = server.requests[requests_before]
+    assert (gap_request['startTime'], gap_request['endTime']) == (int(open_times[50]), int(open_times[52]) - 1)
+    assert (result['data'].close == expected['data'].close).all()
+    print(f"✅ Yeniden başlatmada {sum(server.rows_served[served:])} mum çekildi (tam çekim: 168)")
+
+    print("\n✅ Yerel mum deposu testi tamamlandı!")
+
+
+def test_shared_scan_session():
+    """Üç taramanın tek bir ağ taramasını paylaştığını test eder"""
+    print("🔁 Paylaşılan Tarama Oturumu Testi Başlıyor...")
+
+    symbols = [f"COIN{i}USDT" for i in range(15)]
+    calls = []
+
+    analyzer = new_analyzer(max_workers=15)
+    analyzer.fetcher.get_json = make_fake_get_json(symbols, calls)
+
+    opportunities = analyzer.find_opportunities(min_score=0, max_results=None)
+    profit_1h = analyzer.find_1h_profit_opportunities(min_score=0, max_results=None)
+
+    # Hacim eşikli skorlayıcılar için eşiğin altındaki coinin (COIN0, 500K) mumu çekilmez
+    assert [c[0] for c in calls].count('klines') == len(symbols) - 1
+    assert all(params.get('symbol') != "COIN0USDT" for _, params in calls)
+
+    # 24 saat skorlayıcısı eşiksizdir: eksik coin bir kez eklenir, ticker yeniden istenmez
+    profit_24h = analyzer.find_24h_profit_opportunities(min_score=0, max_results=None)
+    analyzer.find_24h_profit_opportunities(min_score=0, max_results=None)
+
+    endpoints = [c[0] for c in calls]
+    print(f"✅ Üç tarama için {len(endpoints)} istek yapıldı")
+    assert endpoints.count('exchangeInfo') == 1
+    assert endpoints.count('24hr') == 1
+    assert endpoints.count('klines') == len(symbols)
+    assert len(profit_24h) == len(symbols)
+
+    # Oturum sonuçları skorlayıcıların tek tek çalıştırılmasıyla aynı olmalı
+    session = analyzer.get_scan_session()
+    for symbol, coin_data in session.coin_data.items():
+        expected = analyzer.analyze_24h_profit_potential(coin_data)
+        actual = next(item for item in profit_24h if item['symbol'] == symbol)
+        assert actual['profit_score'] == expected['profit_score']
+    assert len(opportunities) == len(profit_1h) == len(symbols) - 1
+
+    # Parametre değişimi ağ isteği olmadan yeniden skorlar
+    calls.clear()
+    analyzer.min_volume_usdt = 10 ** 12
+    assert analyzer.find_opportunities(min_score=1) == []
+    assert calls == []
+
+    # Zorla yenileme yeni tarama yapar (sembol evreni diskteki anlık görüntüden gelir)
+    analyzer.get_scan_session(force_refresh=True)
+    assert [c[0] for c in calls] == ['24hr']  # Mum verisi 60 sn önbellekte
+
+    print("\n✅ Paylaşılan tarama oturumu testi tamamlandı!")
+
+
+def make_random_klines(rng, limit=168, start_ms=1_700_000_000_000):
+    """Rastgele yürüyüşle sahte mum verisi üretir (hacim sıçramaları ve sabit seriler dahil)"""
+    kind = rng.integers(0, 6)
+    steps = rng.normal(0, 0.02, limit)
+    if kind == 0:
+        steps[-30:] -= 0.01  # Güçlü düşüş -> aşırı satım
+    elif kind == 1:
+        steps[:] = 0.0       # Sabit fiyat -> RSI tanımsız
+    elif kind == 2:
+        steps[-24:] = np.abs(steps[-24:])  # Kayıpsız yükseliş
+    closes = 10 * np.exp(np.cumsum(steps))
+    volumes = rng.uniform(100, 1000, limit)
+    if kind == 3:
+        volumes[-24:] *= 3   # Hacim artışı
+    rows = []
+    for i in range(limit):
+        open_time = start_ms + i * 3_600_000
+        close = float(closes[i])
+        rows.append([
+            open_time, str(close * 0.999), str(close * 1.01), str(close * 0.99), str(close),
+            str(float(volumes[i])), open_time + 3_599_999, str(float(volumes[i]) * close * rng.uniform(50, 5000)),
+            100, "500.0", "500.0", "0"
+        ])
+    return rows
+
+
+def assert_same_result(actual, expected, path=""):
+    """Panel ve tek tek skorlama sonuçlarını karşılaştırır (ondalıklar toleranslı)"""
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected), f"{path}: {set(actual) ^ set(expected)}"
+        for key in expected:
+            if key != 'last_updated':
+                assert_same_result(actual[key], expected[key], f"{path}.{key}")
+    elif isinstance(expected, (float, np.floating)) and not isinstance(expected, bool):
+        assert np.isclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True), f"{path}: {actual} != {expected}"
+    else:
+        assert actual == expected, f"{path}: {actual!r} != {expected!r}"
+
+
+def test_indicator_panel():
+    """Vektörel panel skorlamasının tek tek skorlama ile aynı sonucu verdiğini test eder"""
+    print("🧮 Vektörel Gösterge Paneli Testi Başlıyor...")
+
+    rng = np.random.default_rng(42)
+    symbols = [f"COIN{i}USDT" for i in range(300)]
+    klines = {symbol: make_random_klines(rng) for symbol in symbols}
+    klines['SHORTUSDT'] = make_random_klines(rng, limit=30)  # Panele girmez
+
+    analyzer = new_analyzer(max_workers=20)
+    analyzer.fetcher.get_json = lambda url, params=None: klines[params['symbol']][-params.get('limit', 168):]
+    coin_data_map = analyzer.get_multiple_coin_data(list(klines))
+
+    panel, fallback = IndicatorPanel.from_coin_data(coin_data_map)
+    assert len(panel) == len(symbols)
+    assert fallback == ['SHORTUSDT']
+
+    start = time.time()
+    panel_results = {
+        'opportunities': panel.score_opportunity(analyzer.min_volume_usdt, analyzer.opportunity_threshold),
+        '24h': panel.score_24h_profit(),
+        '1h': panel.score_1h_profit(analyzer.min_volume_usdt),
+    }
+    panel_time = time.time() - start
+
+    start = time.time()
+    scorers = {
+        'opportunities': analyzer.analyze_coin_opportunity,
+        '24h': analyzer.analyze_24h_profit_potential,
+        '1h': analyzer.analyze_1h_profit_potential,
+    }
+    expected_results = {key: [scorer(coin_data_map[s]) for s in symbols] for key, scorer in scorers.items()}
+    single_time = time.time() - start
+    print(f"✅ {len(symbols)} coin: panel {panel_time:.3f} sn, tek tek {single_time:.3f} sn")
+
+    for key, expected in expected_results.items():
+        assert len(panel_results[key]) == len(expected)
+        for actual, single in zip(panel_results[key], expected):
+            assert_same_result(actual, single, f"{key}[{single['symbol']}]")
+
+    # Değiştirilen skorlama eşikleri panel ve tek tek skorlamada aynı uygulanır
+    params = {'rsi_oversold_24h': 30, 'rsi_low_1h': 50, 'rsi_oversold_opportunity': 40,
+              'profit_tiers': (60, 45, 25, 10)}
+    analyzer.scoring_params = {**analyzer.scoring_params, **params}
+    tuned = panel.score_24h_profit(params) + panel.score_1h_profit(analyzer.min_volume_usdt, params) + \
+        panel.score_opportunity(analyzer.min_volume_usdt, analyzer.opportunity_threshold, params)
+    expected = [analyzer.analyze_24h_profit_potential(coin_data_map[s]) for s in symbols] + \
+        [analyzer.analyze_1h_profit_potential(coin_data_map[s]) for s in symbols] + \
+        [analyzer.analyze_coin_opportunity(coin_data_map[s]) for s in symbols]
+    for actual, single in zip(tuned, expected):
+        assert_same_result(actual, single, f"ayarlı[{single['symbol']}]")
+    assert [r['recommendation'] for r in tuned[:len(symbols)]] != \
+        [r['recommendation'] for r in panel_results['24h']]
+
+    # Oturum kısa geçmişli coini tek tek skorlayarak ekler
+    session_analyzer = new_analyzer()
+    session_analyzer.get_multiple_coin_data = lambda pairs, *args, **kwargs: coin_data_map
+    session_analyzer.get_all_usdt_pairs = lambda: list(klines)
+    session_analyzer.prefilter_pairs = lambda pairs, **kwargs: pairs
+    results = session_analyzer.get_scan_session().results
+    assert all(len(items) == len(klines) for items in results.values())
+    print(f"✅ Skor dağılımı: en yüksek 24h skoru {results['24h'][0]['profit_score']:.1f}")
+
+    print("\n✅ Vektörel gösterge paneli testi tamamlandı!")
+
+
+def kline_frame(server, symbol, open_time):
+    """Sahte sunucunun mumundan Binance birleşik akış kline mesajı üretir"""
+    row = server.candle(open_time)
+    return json.dumps({'stream': f"{symbol.lower()}@kline_1h", 'data': {
+        'e': 'kline', 'E': server.now_ms, 's': symbol, 'k': {
+            't': row[0], 'T': row[6], 's': symbol, 'i': '1h', 'o': row[1], 'h': row[2], 'l': row[3],
+            'c': row[4], 'v': row[5], 'q': row[7], 'n': row[8], 'V': row[9], 'Q': row[10],
+            'x': row[6] < server.now_ms,
+        }}})
+
+
+class ReplayStreamServer:
+    """Bağlantı başına kayıtlı mesajları tekrar oynatan yerel WebSocket sunucusu"""
+
+    def __init__(self, sessions):
+        from websockets.sync.server import serve
+
+        self.sessions = sessions  # Her bağlantı için mesaj üreten fonksiyon listesi
+        self.subscriptions = []
+        self.server = serve(self.handler, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self.server.socket.getsockname()[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def handler(self, websocket):
+        index = len(self.subscriptions)
+        request = json.loads(websocket.recv())
+        self.subscriptions.append(request['params'])
+        websocket.send(json.dumps({'result': None, 'id': request['id']}))
+
+        if index < len(self.sessions):
+            for frame in self.sessions[index]():
+                websocket.send(frame)
+            if index < len(self.sessions) - 1:
+                return  # Bağlantıyı kopar, istemci yeniden bağlanmalı
+
+        for _ in websocket:  # Son bağlantı istemci kapatana kadar açık kalır
+            pass
+
+    def close(self):
+        self.server.shutdown()
+
+
+def wait_until(condition, timeout=5.0):
+    """Koşul sağlanana kadar bekler"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_live_kline_stream():
+    """Canlı akışın tamponları güncel tuttuğunu, kopmada boşluğu REST ile tamamladığını test eder"""
+    print("📡 Canlı Kline Akışı Testi Başlıyor...")
+
+    hour = FakeKlineServer.HOUR_MS
+    rest = FakeKlineServer()
+    first_open = rest.now_ms - rest.now_ms % hour
+    symbols = ['BTCUSDT', 'ETHUSDT']
+
+    def first_session():
+        # Açık mum kapanır, yeni mum açılır; ardından tüm piyasa mini ticker
+        rest.now_ms = first_open + hour + 60_000
+        frames = [kline_frame(rest, s, t) for t in (first_open, first_open + hour) for s in symbols]
+        frames.append(json.dumps({'stream': '!miniTicker@arr', 'data': [
+            {'e': '24hrMiniTicker', 's': s, 'o': '100', 'c': '110', 'h': '111', 'l': '99',
+             'v': '1000', 'q': '5000000'} for s in symbols]}))
+        # Bağlantı yokken saat ilerler ve iki mum kaçırılır
+        rest.now_ms = first_open + 3 * hour + 60_000
+        return frames
+
+    def second_session():
+        # Yeniden bağlanınca REST tamamlar; akış içindeki boşluk da REST ile doldurulur
+        wait_until(lambda: analyzer.kline_stream.live_symbols == set(symbols))
+        frames = [kline_frame(rest, s, first_open + 3 * hour) for s in symbols]
+        rest.now_ms = first_open + 5 * hour + 60_000
+        frames += [kline_frame(rest, s, first_open + 5 * hour) for s in symbols]
+        return frames
+
+    replay = ReplayStreamServer([first_session, second_session])
+    analyzer = new_analyzer()
+    analyzer.fetcher.get_json = rest.get_json
+
+    try:
+        stream = analyzer.start_stream(symbols, url=replay.url, reconnect_delay=0.05)
+        assert len(rest.requests) == len(symbols)  # Başlangıç doldurması
+        # Boşluk tamamlaması tamponu son muma getirdikten sonra akıştaki mum da işlenmiş olmalı
+        assert wait_until(lambda: all(
+            analyzer.candle_buffers[(s, '1h')].last_open_time == first_open + 5 * hour for s in symbols
+        ) and stream.live_symbols == set(symbols) and stream.stats['klines'] == 4 * len(symbols))
+
+        print(f"✅ {stream.stats['messages']} mesaj, {stream.stats['reconnects']} yeniden bağlanma, "
+              f"{stream.stats['backfills']} REST tamamlama")
+        assert replay.subscriptions[0] == ['btcusdt@kline_1h', 'ethusdt@kline_1h', '!miniTicker@arr']
+        assert stream.stats['reconnects'] == 1
+        assert stream.stats['klines'] == 4 * len(symbols)
+        assert stream.stats['backfills'] == 3 * len(symbols)  # başlangıç + yeniden bağlanma + akış boşluğu
+
+        # Akış tamponu sıfırdan REST ile çekilen veriyle aynı olmalı
+        fresh = new_analyzer()
+        fresh.fetcher.get_json = FakeKlineServer(rest.now_ms).get_json
+        expected = fresh.get_coin_data('BTCUSDT')
+
+        request_count = len(rest.requests)
+        live = analyzer.get_coin_data('BTCUSDT')
+        tickers = analyzer.get_all_tickers()
+        assert len(rest.requests) == request_count  # Skorlayıcılar ağ isteği yapmaz
+        assert (live['data']['close'].to_numpy() == expected['data']['close'].to_numpy()).all()
+        assert (live['data']['open_time'] == expected['data']['open_time']).all()
+        assert live['change_24h'] == expected['change_24h']
+        assert list(tickers['price_change_percent']) == [10.0, 10.0]
+    finally:
+        analyzer.stop_stream()
+        replay.close()
+
+    assert analyzer.kline_stream is None
+    print("\n✅ Canlı kline akışı testi tamamlandı!")
+
+
+def legacy_kline_frame(rows):
+    """Önceki get_coin_data ayrıştırması: 12 sütunlu DataFrame ve sütun sütun dönüşüm"""
+    import pandas as pd
+
+    df = pd.DataFrame(rows, columns=[
+        'open_time', 'open', 'high', 'low', 'close', 'volume',
+        'close_time', 'quote_asset_volume', 'number_of_trades',
+        'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
+    ])
+    for col in ['open', 'high', 'low', 'close', 'volume', 'quote_asset_volume']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
+    df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+    return df
+
+
+def test_compact_candles():
+    """Kompakt mum dizisinin eski DataFrame ayrıştırmasından küçük ve hızlı olduğunu test eder"""
+    print("📦 Kompakt Mum Verisi Testi Başlıyor...")
+
+    responses = [make_fake_klines(f"COIN{i}USDT") for i in range(400)]
+
+    start = time.time()
+    legacy = [legacy_kline_frame(rows) for rows in responses]
+    legacy_time = time.time() - start
+
+    start = time.time()
+    compact = [Candles.from_rows(rows) for rows in responses]
+    compact_time = time.time() - start
+
+    legacy_bytes = sum(int(df.memory_usage(deep=True).sum()) for df in legacy)
+    compact_bytes = sum(candles.nbytes for candles in compact)
+    print(f"✅ 400 coin ayrıştırma: DataFrame {legacy_time:.3f} sn, kompakt {compact_time:.3f} sn")
+    print(f"✅ Bellek: DataFrame {legacy_bytes / 1024:.0f} KB, kompakt {compact_bytes / 1024:.0f} KB")
+    assert compact_time < legacy_time
+    assert compact_bytes * 3 < legacy_bytes
+
+    # Değerler ve sütun erişimi eski DataFrame ile aynı
+    candles, df = compact[7], legacy[7]
+    for column in ['open', 'high', 'low', 'close', 'volume', 'quote_asset_volume']:
+        assert (candles[column].to_numpy() == df[column].to_numpy()).all()
+    assert (candles['open_time'] == df['open_time']).all()
+    assert (candles.to_dataframe()['close_time'] == df['close_time']).all()
+
+    # DataFrame yalnızca grafik istendiğinde oluşturulur
+    analyzer = new_analyzer()
+    analyzer.fetcher.get_json = make_fake_get_json(['BTCUSDT'])
+    coin_data = analyzer.get_coin_data('BTCUSDT')
+    assert isinstance(coin_data['data'], Candles) and coin_data['data']._frame is None
+    indicators = analyzer.calculate_technical_indicators(coin_data['data'])
+    assert indicators['rsi'] == analyzer.calculate_technical_indicators(coin_data['data'].to_dataframe())['rsi']
+    chart = analyzer.get_chart_data('BTCUSDT')
+    assert chart is coin_data['data'].to_dataframe() and list(chart.columns) == candles.columns
+
+    print("\n✅ Kompakt mum verisi testi tamamlandı!")
+
+
+def test_symbol_universe_warm_start():
+    """Sembol evreninin diske kaydedildiğini ve yeni süreçte ağ beklemeden kullanıldığını test eder"""
+    print("🌐 Sembol Evreni Testi Başlıyor...")
+
+    symbols = [f"COIN{i}USDT" for i in range(10)] + ['ETHBTC']
+    data_dir = tempfile.mkdtemp(dir=TEST_DATA_DIR.name)
+
+    def exchange_info(halted=()):
+        return {'symbols': [{
+            'symbol': s, 'status': 'HALT' if s in halted else 'TRADING',
+            'baseAsset': s[:-4], 'quoteAsset': s[-4:],
+            'filters': [{'filterType': 'PRICE_FILTER', 'tickSize': '0.00010000'},
+                        {'filterType': 'LOT_SIZE', 'stepSize': '0.10000000', 'minQty': '0.10000000'},
+                        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000'}]} for s in symbols]}
+
+    calls = []
+
+    def fake_get_json(url, params=None):
+        calls.append(url.rsplit('/', 1)[-1])
+        time.sleep(FAKE_LATENCY)
+        return exchange_info(halted={'COIN3USDT'} if len(calls) > 1 else ())
+
+    # Soğuk başlangıç: anlık görüntü yok, bir kez çekilip diske yazılır
+    cold = CryptoAnalyzer(data_dir=data_dir)
+    cold.fetcher.get_json = fake_get_json
+    pairs = cold.get_all_usdt_pairs()
+    assert pairs == [s for s in symbols if s.endswith('USDT')]
+    assert cold.get_all_usdt_pairs() == pairs and calls == ['exchangeInfo']
+    assert os.path.exists(os.path.join(data_dir, 'crypto_symbols.json'))
+    assert cold.symbol_universe.get_info('COIN1USDT')['min_notional'] == 5.0
+
+    # Yeni süreç: diskten anında yüklenir, ağ isteği yapılmaz
+    warm = CryptoAnalyzer(data_dir=data_dir)
+    warm.fetcher.get_json = fake_get_json
+    start = time.time()
+    assert warm.get_all_usdt_pairs() == pairs
+    print(f"✅ Sıcak başlangıç {time.time() - start:.3f} sn, istek sayısı {len(calls)}")
+    assert calls == ['exchangeInfo']
+
+    # Süresi dolan anlık görüntü hemen döner, yenileme arka planda yapılır
+    warm.symbol_universe.ttl = 0
+    start = time.time()
+    assert warm.get_all_usdt_pairs() == pairs
+    assert time.time() - start < FAKE_LATENCY
+    warm.symbol_universe._refresh_thread.join()
+    warm.symbol_universe.ttl = 3600
+    assert 'COIN3USDT' not in warm.get_all_usdt_pairs()
+    assert calls == ['exchangeInfo', 'exchangeInfo']
+
+    # Aynı dosyaya eşzamanlı yazan süreçler/iş parçacıkları karışık anlık görüntü yayımlamaz
+    cache_path = warm.symbol_universe.cache_path
+    snapshots = [cold.symbol_universe.symbols, warm.symbol_universe.symbols]
+    assert snapshots[0] != snapshots[1]
+    seen = []
+
+    def save_repeatedly(universe):
+        for _ in range(100):
+            universe._save()
+
+    def read_repeatedly():
+        for _ in range(200):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                seen.append(json.load(f)['symbols'])
+
+    threads = [threading.Thread(target=save_repeatedly, args=(cold.symbol_universe,)),
+               threading.Thread(target=save_repeatedly, args=(warm.symbol_universe,)),
+               threading.Thread(target=read_repeatedly)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(seen) == 200 and all(snapshot in snapshots for snapshot in seen)
+
+    # Yarıda kalan yazım geçici dosya bırakmaz, mevcut anlık görüntü değişmez
+    warm.symbol_universe._save()
+    warm.symbol_universe.symbols = {'BROKENUSDT': {'unserializable': object()}}
+    try:
+        warm.symbol_universe._save()
+        assert False, "Yazılamayan anlık görüntü hata vermeliydi"
+    except TypeError:
+        pass
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        assert json.load(f)['symbols'] == snapshots[1]
+    assert not [name for name in os.listdir(data_dir) if name.endswith('.tmp')]
+
+    print("\n✅ Sembol evreni testi tamamlandı!")
+
+
+def worker_analyzer_storage():
+    """İşçi süreçteki analizörün disk bağlantıları (süreç havuzunda çalıştırılır)"""
+    from crypto import parallel_scan
+    analyzer = parallel_scan._get_worker_analyzer()
+    return analyzer.candle_store, analyzer.symbol_universe.cache_path
+
+
+def test_sharded_scan():
+    """Süreç havuzlu parçalı taramanın tek süreçli skorlama ile aynı sonucu verdiğini test eder"""
+    print("🧩 Parçalı Tarama Testi Başlıyor...")
+
+    rng = np.random.default_rng(7)
+    klines = {f"COIN{i}USDT": make_random_klines(rng) for i in range(240)}
+    klines['SHORTUSDT'] = make_random_klines(rng, limit=30)
+
+    analyzer = new_analyzer(max_workers=20)
+    analyzer.fetcher.get_json = lambda url, params=None: klines[params['symbol']][-params.get('limit', 168):]
+    coin_data_map = analyzer.get_multiple_coin_data(list(klines))
+    symbols, fallback = IndicatorPanel.partition(coin_data_map)
+    assert fallback == ['SHORTUSDT']
+
+    panel, _ = IndicatorPanel.from_coin_data(coin_data_map)
+    expected = {
+        'opportunities': panel.score_opportunity(analyzer.min_volume_usdt, analyzer.opportunity_threshold),
+        '24h': panel.score_24h_profit(),
+        '1h': panel.score_1h_profit(analyzer.min_volume_usdt),
+    }
+
+    scanner = ShardedScanner(max_processes=3, min_shard_size=50)
+    try:
+        for use_panel in (True, False):
+            start = time.time()
+            results = scanner.score(coin_data_map, symbols, analyzer.min_volume_usdt,
+                                    analyzer.opportunity_threshold, use_panel=use_panel)
+            mode = "panel" if use_panel else "tek tek"
+            print(f"✅ {len(symbols)} coin, 3 süreç ({mode}): {time.time() - start:.3f} sn")
+            for key in expected:
+                assert [r['symbol'] for r in results[key]] == symbols
+                for actual, single in zip(results[key], expected[key]):
+                    assert_same_result(actual, single, f"{key}[{single['symbol']}]")
+
+        # İşçi analizörü diskte mum deposu ya da sembol dosyası açmaz
+        assert scanner._get_executor().submit(worker_analyzer_storage).result() == (None, None)
+    finally:
+        scanner.shutdown()
+
+    # Oturum, eşik üstünde süreç havuzunu kullanır ve kısa geçmişli coini ayrıca skorlar
+    analyzer.scan_processes = 2
+    analyzer.sharded_scan_min_symbols = 100
+    analyzer.get_multiple_coin_data = lambda pairs, *args, **kwargs: coin_data_map
+    analyzer.get_all_usdt_pairs = lambda: list(klines)
+    analyzer.prefilter_pairs = lambda pairs, **kwargs: pairs
+    try:
+        session = analyzer.get_scan_session(force_refresh=True)
+        assert analyzer.sharded_scanner is not None
+        assert all(len(items) == len(klines) for items in session.results.values())
+        top = max(expected['24h'], key=lambda r: r['profit_score'])['profit_score']
+        assert session.results['24h'][0]['profit_score'] == top
+    finally:
+        analyzer.sharded_scanner.shutdown()
+
+    print("\n✅ Parçalı tarama testi tamamlandı!")
+
+
+def pandas_resample(candles, rule, offset="0h"):
+    """Referans: pandas resample ile aynı toplama (başı eksik ilk kova atılır)"""
+    frame = candles.to_dataframe().set_index('open_time')
+    grouped = frame.resample(rule, origin='epoch', offset=offset, label='left', closed='left')
+    result = grouped.agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last',
+                          'volume': 'sum', 'quote_asset_volume': 'sum'})
+    counts = grouped['open'].count()
+    result = result[counts > 0]
+    if frame.index[0] != result.index[0]:
+        result = result.iloc[1:]
+    return result
+
+
+def test_multi_timeframe_resample():
+    """4h/1d/1w mumlarının 1h tampondan doğru türetildiğini ve ek istek gerektirmediğini test eder"""
+    print("🕰️ Çoklu Zaman Dilimi Testi Başlıyor...")
+
+    rng = np.random.default_rng(11)
+    # 2023-11-14 22:00 UTC'den başlayan 1000 saatlik seri (kovaların ortasında başlar)
+    base = Candles.from_rows(make_random_klines(rng, limit=1000))
+
+    for interval, rule, offset in (('4h', '4h', '0h'), ('1d', '24h', '0h'), ('1w', '168h', '96h')):
+        derived = resample_candles(base, '1h', interval)
+        expected = pandas_resample(base, rule, offset)
+        assert len(derived) == len(expected)
+        assert (derived['open_time'].to_numpy() == expected.index.to_numpy()).all()
+        for column in ('open', 'high', 'low', 'close', 'volume', 'quote_asset_volume'):
+            assert np.allclose(derived.array(column), expected[column].to_numpy()), (interval, column)
+        print(f"✅ {interval}: {len(derived)} mum pandas resample ile aynı")
+
+    # Haftalık mumlar Pazartesi açılır
+    weekly = resample_candles(base, '1h', '1w')
+    assert (weekly['open_time'].dt.dayofweek == 0).all()
+    assert (weekly.close_time - weekly.open_time == 7 * 86_400_000 - 1).all()
+
+    # Analizör: 1h taramasından sonra 4h/1d görünümleri ağ isteği yapmaz
+    server = FakeKlineServer()
+    analyzer = new_analyzer()
+    analyzer.fetcher.get_json = server.get_json
+    analyzer.get_coin_data("BTCUSDT", "1h", 400)
+    requests_after_scan = len(server.requests)
+
+    four_hour = analyzer.get_coin_data("BTCUSDT", "4h", 42)
+    daily = analyzer.get_coin_data("BTCUSDT", "1d", 7)
+    assert len(server.requests) == requests_after_scan
+    assert len(four_hour['data']) == 42 and len(daily['data']) == 7
+    assert four_hour['current_price'] == daily['current_price']
+    assert (np.diff(four_hour['data'].open_time) == 4 * FakeKlineServer.HOUR_MS).all()
+    print(f"✅ 4h ve 1d görünümleri {requests_after_scan} tarama isteğiyle karşılandı")
+
+    # Tampon değişmedikçe türetilmiş mumlar yeniden hesaplanmaz
+    analyzer.cache.clear()
+    assert analyzer.get_coin_data("BTCUSDT", "4h", 42)['data'] is four_hour['data']
+
+    # Saat ilerleyince yalnızca taban aralık artımlı yenilenir
+    analyzer.cache_duration = 0
+    server.now_ms += FakeKlineServer.HOUR_MS
+    refreshed = analyzer.get_coin_data("BTCUSDT", "4h", 42)
+    assert server.requests[-1].get('startTime') is not None
+    assert refreshed['data'] is not four_hour['data']
+    assert {request['interval'] for request in server.requests} == {'1h'}
+
+    # 3d ve taban sınırını aşan limitler doğrudan istenir
+    analyzer.get_coin_data("BTCUSDT", "3d", 10)
+    assert server.requests[-1]['interval'] == '3d'
+    analyzer.get_coin_data("BTCUSDT", "1w", 52)
+    assert server.requests[-1]['interval'] == '1w'
+
+    print("\n✅ Çoklu zaman dilimi testi tamamlandı!")
+
+
+if __name__ == "__main__":
+    test_parallel_scan()
+    test_ticker_prefilter()
+    test_incremental_kline_cache()
+    test_persistent_candle_store()
+    test_shared_scan_session()
+    test_indicator_panel()
+    test_live_kline_stream()
+    test_compact_candles()
+    test_symbol_universe_warm_start()
+    test_sharded_scan()
+    test_multi_timeframe_resample()
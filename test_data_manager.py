@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Veri Yöneticisi Testleri
+Sanal alım-satım işlemlerini ve SQLite bağlantı havuzunu geçici veritabanıyla test eder
+"""
+
+import sys
+import os
+import tempfile
+import time
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data.data_manager import DataManager, SCHEMA_MIGRATIONS
+
+# Testler data/ klasörüne yazmaz; her yönetici kendi geçici klasörünü kullanır
+TEST_DATA_DIR = tempfile.TemporaryDirectory(prefix="data_manager_test_")
+
+
+def new_manager():
+    """Geçici veri klasörüyle DataManager oluşturur"""
+    return DataManager(data_dir=tempfile.mkdtemp(dir=TEST_DATA_DIR.name))
+
+
+def test_virtual_trading():
+    """Alım, satım, portföy ve işlem geçmişinin tutarlı olduğunu test eder"""
+    print("💼 Sanal Alım-Satım Testi Başlıyor...")
+
+    manager = new_manager()
+    assert manager.get_user_balance("gokhan") == 300000.0
+
+    success, _ = manager.buy_stock("gokhan", "THYAO", 100, 250.0)
+    assert success
+    assert manager.get_user_balance("gokhan") == 275000.0
+    assert manager.get_user_portfolio("gokhan")[0]['shares'] == 100
+
+    success, message = manager.buy_stock("gokhan", "GARAN", 10_000, 100.0)
+    assert not success and message == "Yetersiz bakiye"
+
+    success, _ = manager.sell_stock("gokhan", "THYAO", 40, 300.0)
+    assert success
+    assert manager.get_user_balance("gokhan") == 287000.0
+    assert manager.get_user_portfolio("gokhan")[0]['shares'] == 60
+    assert sorted(t['type'] for t in manager.get_user_transactions("gokhan")) == ['BUY', 'SELL']
+
+    success, message = manager.sell_stock("gokhan", "THYAO", 100, 300.0)
+    assert not success and message == "Yetersiz hisse miktarı"
+
+    assert manager.add_to_watchlist("ASELS", "Aselsan")
+    assert not manager.add_to_watchlist("ASELS", "Aselsan")
+    assert [item['symbol'] for item in manager.get_watchlist()] == ["ASELS"]
+    assert manager.remove_from_watchlist("ASELS")
+
+    print("\n✅ Sanal alım-satım testi tamamlandı!")
+
+
+def test_connection_pool():
+    """Bağlantıların iş parçacığı başına bir kez açılıp yeniden kullanıldığını test eder"""
+    print("🔌 Bağlantı Havuzu Testi Başlıyor...")
+
+    manager = new_manager()
+    for _ in range(50):
+        manager.get_user_balance("yilmaz")
+        manager.get_watchlist()
+
+    stats = manager.connection_stats()
+    print(f"✅ {stats['opened']} bağlantı açıldı, {stats['reused']} kez yeniden kullanıldı "
+          f"(%{stats['reuse_rate']:.1f})")
+    assert stats['opened'] == 1 and stats['reused'] >= 100
+
+    # PRAGMA'lar bağlantı açılırken uygulanmış olmalı
+    conn = manager.db.connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16000
+
+    # Her iş parçacığı kendi bağlantısını alır; eşzamanlı alımlar kaybolmaz
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(5):
+                success, message = manager.buy_stock("yilmaz", "ASELS", 1, 10.0)
+                assert success, message
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    assert manager.get_user_balance("yilmaz") == 300000.0 - 20 * 10.0
+    stats = manager.connection_stats()
+    assert stats['opened'] == 5
+    assert stats['open_connections'] == 1  # Sonlanan iş parçacıklarının bağlantıları kapatıldı
+
+    # Bağlantıda yarım kalan iş başka bir atomik blokta onaylanmaz: geri alınır ve hata verilir
+    conn = manager.db.connection()
+    conn.execute("UPDATE virtual_users SET balance = 0 WHERE username = 'yilmaz'")
+    try:
+        with manager.db.transaction():
+            assert False, "Açık işlem varken transaction() hata vermeliydi"
+    except sqlite3.ProgrammingError:
+        pass
+    assert not conn.in_transaction
+    assert manager.get_user_balance("yilmaz") == 300000.0 - 20 * 10.0
+
+    manager.close()
+    assert manager.connection_stats()['open_connections'] == 0
+    assert manager.get_user_balance("yilmaz") == 300000.0 - 20 * 10.0  # Kapatınca yeniden açılır
+
+    print("\n✅ Bağlantı havuzu testi tamamlandı!")
+
+
+def test_migrations_and_query_plans():
+    """Şema geçişlerinin bir kez uygulandığını ve sıcak sorguların indeks kullandığını test eder"""
+    print("🗂️ Şema Geçişi ve Sorgu Planı Testi Başlıyor...")
+
+    manager = new_manager()
+    latest = SCHEMA_MIGRATIONS[-1][0]
+    conn = manager.db.connection()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == latest
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'idx_news_data_symbol_timestamp' in indexes
+    assert 'idx_virtual_transactions_user_created' in indexes
+
+    # İndekssiz eski veritabanı açılışta yükseltilir; ikinci açılış bir şey yapmaz
+    old_dir = tempfile.mkdtemp(dir=TEST_DATA_DIR.name)
+    old = sqlite3.connect(os.path.join(old_dir, "stocks.db"))
+    old.execute("CREATE TABLE news_data (id INTEGER PRIMARY KEY, symbol TEXT, title TEXT, sentiment TEXT, "
+                "sentiment_score REAL, source TEXT, url TEXT, timestamp DATETIME)")
+    old.execute("INSERT INTO news_data (symbol, title) VALUES ('THYAO', 'eski haber')")
+    old.commit()
+    old.close()
+    upgraded = DataManager(data_dir=old_dir)
+    assert upgraded.migrate() == latest
+    assert upgraded.get_news_for_symbol('THYAO')[0]['title'] == 'eski haber'
+    upgraded.close()
+
+    # Başarısız geçiş geri alınır ve açılışı durdurur; şema sürümü değişmez
+    broken_dir = tempfile.mkdtemp(dir=TEST_DATA_DIR.name)
+    DataManager(data_dir=broken_dir).close()
+    SCHEMA_MIGRATIONS.append((latest + 1, "Bozuk geçiş", [
+        "CREATE TABLE half_applied (x INTEGER)",
+        "CREATE INDEX idx_missing ON missing_table (x)",
+    ]))
+    try:
+        try:
+            DataManager(data_dir=broken_dir)
+            assert False, "Başarısız şema geçişi hata vermeliydi"
+        except RuntimeError as e:
+            assert f"v{latest + 1}" in str(e) and isinstance(e.__cause__, sqlite3.OperationalError)
+    finally:
+        SCHEMA_MIGRATIONS.pop()
+    broken = sqlite3.connect(os.path.join(broken_dir, "stocks.db"))
+    assert broken.execute("PRAGMA user_version").fetchone()[0] == latest
+    assert broken.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'half_applied'").fetchone()[0] == 0
+    broken.close()
+
+    # Tablolar büyükken sıcak sorgular tam tarama yapmamalı
+    with manager.db.connection() as conn:
+        conn.executemany(
+            "INSERT INTO news_data (symbol, title, sentiment, sentiment_score, source, url, timestamp) "
+            "VALUES (?, ?, 'neutral', 0, 'test', ?, datetime('now', ?))",
+            [(f"SYM{i % 500}", f"haber {i}", f"https://example.com/{i}", f"-{i} minutes") for i in range(50_000)]
+        )
+        conn.executemany(
+            "INSERT INTO virtual_transactions (user_id, symbol, transaction_type, shares, price, "
+            "total_amount, transaction_date) VALUES (?, 'THYAO', 'BUY', 1, 1, 1, datetime('now'))",
+            [(i % 50 + 10,) for i in range(50_000)]
+        )
+    conn.execute("ANALYZE")
+
+    regressions = manager.audit_query_plans()
+    assert regressions == {}, regressions
+
+    start = time.perf_counter()
+    for _ in range(200):
+        assert len(manager.get_news_for_symbol("SYM7", limit=10)) == 10
+        manager.get_user_transactions("gokhan")
+    elapsed = time.perf_counter() - start
+    print(f"✅ 400 sıcak sorgu {elapsed * 1000:.1f} ms")
+
+    print("\n✅ Şema geçişi ve sorgu planı testi tamamlandı!")
+
+
+def test_bulk_ingest():
+    """Toplu mum ve haber yazımının tek işlemde ve tekrarsız yapıldığını test eder"""
+    print("📥 Toplu Veri Yazma Testi Başlıyor...")
+
+    manager = new_manager()
+    dates = pd.date_range("2024-01-01", periods=500, freq="D")
+    rng = np.random.default_rng(3)
+    bars = {
+        f"SYM{i}": pd.DataFrame({'Open': rng.random(500), 'High': 2.0, 'Low': 0.5,
+                                 'Close': rng.random(500), 'Volume': 1e6}, index=dates)
+        for i in range(200)
+    }
+
+    start = time.perf_counter()
+    assert manager.save_stock_data_bulk(bars) == 100_000
+    elapsed = time.perf_counter() - start
+    print(f"✅ 100000 mum {elapsed:.2f} sn ({100_000 / elapsed:,.0f} mum/sn)")
+
+    # Aynı (sembol, tarih) tekrar yazılınca satır eklenmez, değer güncellenir
+    frame = pd.concat([df.assign(symbol=symbol) for symbol, df in bars.items()]).rename_axis("Date").reset_index()
+    frame.loc[frame['Date'] == dates[-1], 'Close'] = 99.0
+    assert manager.save_stock_data_bulk(frame) == 100_000
+    conn = manager.db.connection()
+    assert conn.execute("SELECT COUNT(*) FROM stock_data").fetchone()[0] == 100_000
+    latest = manager.get_stock_data("SYM7", days=2)
+    assert [bar['date'] for bar in latest] == ["2025-05-14", "2025-05-13"]
+    assert latest[0]['close'] == 99.0
+
+    # Eski tek hisse arayüzü de aynı yoldan yazar
+    assert manager.save_stock_data("THYAO", {'historical_data': [{'Date': "2024-01-02", 'Open': 1, 'Close': 2}]})
+    assert manager.get_stock_data("THYAO")[0]['close'] == 2.0
+
+    news = {
+        symbol: [{'title': f"{symbol} haberi", 'sentiment': {'sentiment': 'positive', 'score': 0.5},
+                  'source': "test", 'url': f"https://example.com/{symbol}/{i}"} for i in range(3)]
+        for symbol in ("THYAO", "GARAN")
+    }
+    assert manager.save_news_bulk(news) == 6
+    assert manager.save_news_data({'symbol': "THYAO", 'news_list': news["THYAO"]}) == 3
+    assert conn.execute("SELECT COUNT(*) FROM news_data").fetchone()[0] == 6
+    assert manager.get_news_for_symbol("GARAN")[0]['sentiment'] == 'positive'
+    assert manager.audit_query_plans() == {}
+
+    manager.close()
+
+    print("\n✅ Toplu veri yazma testi tamamlandı!")
+
+
+def test_trade_transactions():
+    """Alım-satımın önbellekli kullanıcı id'siyle tek işlemde ve yarışsız yapıldığını test eder"""
+    print("🔒 Tek İşlemli Alım-Satım Testi Başlıyor...")
+
+    manager = new_manager()
+    assert manager.buy_stock("gokhan", "THYAO", 10, 100.0)[0]
+
+    # Önbellek dolduktan sonra alım kullanıcı adı sorgusu yapmaz
+    statements = []
+    conn = manager.db.connection()
+    conn.set_trace_callback(statements.append)
+    assert manager.buy_stock("gokhan", "THYAO", 10, 100.0)[0]
+    assert manager.sell_stock("gokhan", "THYAO", 5, 120.0)[0]
+    conn.set_trace_callback(None)
+    assert not any("WHERE username = ?" in sql and "SELECT id" in sql for sql in statements)
+    assert sum(sql.startswith("BEGIN IMMEDIATE") for sql in statements) == 2
+    print(f"✅ Alım + satım: {len(statements)} ifade")
+
+    # Bakiye yetmeyince hiçbir kayıt yazılmaz
+    balance = manager.get_user_balance("gokhan")
+    assert manager.buy_stock("gokhan", "GARAN", 1, balance + 1) == (False, "Yetersiz bakiye")
+    assert manager.get_user_balance("gokhan") == balance
+    assert len(manager.get_user_transactions("gokhan")) == 3
+
+    # Ayrı oturumlar (ayrı yöneticiler) aynı bakiyeyi aynı anda harcayamaz
+    sessions = [DataManager(data_dir=manager.data_dir) for _ in range(4)]
+    start_balance = manager.get_user_balance("yilmaz")
+    price = start_balance / 10
+    results = []
+
+    def session_worker(session):
+        for _ in range(5):
+            results.append(session.buy_stock("yilmaz", "ASELS", 1, price)[0])
+
+    threads = [threading.Thread(target=session_worker, args=(session,)) for session in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count(True) == 10 and results.count(False) == 10
+    assert abs(manager.get_user_balance("yilmaz")) < 1e-6
+
+    # Kullanıcı silinip yeniden oluşturulursa önbellekteki eski id kullanılmaz
+    with manager.db.connection() as conn:
+        conn.execute("DELETE FROM virtual_users WHERE username = 'gokhan'")
+        conn.execute("INSERT INTO virtual_users (username, balance) VALUES ('gokhan', 1000.0)")
+    assert manager.buy_stock("gokhan", "EREGL", 1, 100.0)[0]
+    assert manager.get_user_balance("gokhan") == 900.0
+    assert [item['symbol'] for item in manager.get_user_portfolio("gokhan")] == ["EREGL"]
+    assert manager.buy_stock("ayse", "EREGL", 1, 100.0) == (False, "Kullanıcı bulunamadı")
+
+    for session in sessions:
+        session.close()
+    manager.close()
+
+    print("\n✅ Tek işlemli alım-satım testi tamamlandı!")
+
+
+def test_performance_tracking_update():
+    """Küme tabanlı performans güncellemesinin eski satır satır döngüyle aynı sonucu verdiğini test eder"""
+    print("📅 Performans Takibi Güncelleme Testi Başlıyor...")
+
+    manager = new_manager()
+    today = datetime.now()
+    rows = [(user_id, f"SYM{i}", 1000.0, 1000.0, (today - timedelta(days=i % 12)).strftime('%Y-%m-%d'))
+            for user_id in range(1, 201) for i in range(500)]
+    with manager.db.connection() as conn:
+        conn.executemany(
+            "INSERT INTO virtual_performance (user_id, symbol, initial_investment, current_value, "
+            "profit_loss, profit_loss_percent, tracking_start_date) VALUES (?, ?, ?, ?, 0, 0, ?)", rows
+        )
+        conn.execute("UPDATE virtual_performance SET status = 'completed', days_held = -1 WHERE id % 97 = 0")
+
+    # Tek kullanıcı: yalnızca o kullanıcının aktif kayıtları
+    gokhan_id = manager.db.connection().execute(
+        "SELECT id FROM virtual_users WHERE username = 'gokhan'").fetchone()[0]
+    changed = manager.db.connection().execute(
+        "SELECT COUNT(*) FROM virtual_performance WHERE user_id = ? AND status = 'active' "
+        "AND tracking_start_date < ?", (gokhan_id, today.strftime('%Y-%m-%d'))).fetchone()[0]
+    assert manager.update_performance_tracking("gokhan") == changed
+    assert manager.update_performance_tracking("ayse") == 0
+
+    start = time.perf_counter()
+    updated = manager.update_all_performance_tracking()
+    elapsed = time.perf_counter() - start
+    print(f"✅ {updated} kayıt tek ifadede {elapsed * 1000:.1f} ms")
+
+    # Eski döngünün sonucu: gün sayısı Python'da, 7 gün dolunca tamamlandı
+    expected_completed = 0
+    for perf_id, start_date, status, days_held, end_date in manager.db.connection().execute(
+            "SELECT id, tracking_start_date, status, days_held, tracking_end_date FROM virtual_performance"):
+        if perf_id % 97 == 0:
+            assert (status, days_held) == ('completed', -1)  # Tamamlanmış kayıtlara dokunulmaz
+            continue
+        expected = (today - datetime.strptime(start_date, '%Y-%m-%d')).days
+        assert days_held == expected, (start_date, days_held, expected)
+        if expected >= 7:
+            expected_completed += 1
+            assert status == 'completed' and end_date == today.strftime('%Y-%m-%d')
+        else:
+            assert status == 'active' and end_date is None
+    assert expected_completed > 0
+    assert manager.update_all_performance_tracking() == 0  # Aynı gün tekrar: değişen kayıt yok
+
+    print("\n✅ Performans takibi güncelleme testi tamamlandı!")
+
+
+def test_retention():
+    """Saklama işinin özetleyip sildiğini, parça sınırıyla kaldığı yerden sürdüğünü ve yer kazandırdığını test eder"""
+    print("🧹 Saklama İşi Testi Başlıyor...")
+
+    manager = new_manager()
+    with manager.db.connection() as conn:
+        # 40 gün x 6 saatlik anlık fiyat, 200 günlük haber, 60 analiz (50 sembol)
+        conn.executemany(
+            "INSERT INTO stock_data (symbol, current_price, volume, timestamp) "
+            "VALUES (?, ?, ?, datetime('now', 'start of day', ?, ?))",
+            [(f"SYM{s}", 100.0 + day + hour, 1000.0 * hour, f"-{day} days", f"+{hour * 3} hours")
+             for s in range(50) for day in range(40) for hour in range(6)]
+        )
+        conn.executemany(
+            "INSERT INTO news_data (symbol, title, sentiment, sentiment_score, url, timestamp) "
+            "VALUES (?, 'haber', ?, ?, ?, datetime('now', 'start of day', ?, '+12 hours'))",
+            [(f"SYM{s}", 'positive' if i % 3 else 'negative', 0.9 if i % 3 else -0.6, f"u{s}-{i}-{k}", f"-{i} days")
+             for s in range(50) for i in range(200) for k in range(2)]
+        )
+        conn.executemany(
+            "INSERT INTO analysis_results (symbol, analysis_type, result, timestamp) "
+            "VALUES (?, 'risk', ?, datetime('now', ?))",
+            [(f"SYM{s}", "x" * 2000, f"-{i} hours") for s in range(50) for i in range(60)]
+        )
+    dates = pd.bdate_range(end=datetime.now() - timedelta(days=1), periods=1000)
+    manager.save_stock_data_bulk({"ASELS": pd.DataFrame(
+        {'Open': 10.0, 'High': 12.0, 'Low': 9.0, 'Close': np.arange(1000.0), 'Volume': 100.0}, index=dates)})
+    # Aynı gün için gerçek mum varsa anlık fiyat özeti onu ezmez
+    real_day = (datetime.now(timezone.utc) - timedelta(days=35)).strftime('%Y-%m-%d')
+    manager.save_stock_data_bulk({"SYM0": pd.DataFrame({'Close': [1.0]}, index=pd.DatetimeIndex([real_day]))})
+
+    policy = {'snapshot_days': 30, 'daily_bar_days': 730, 'news_days': 90, 'analysis_keep': 20,
+              'analysis_days': None, 'batch_size': 500}
+    partial = manager.run_retention(policy, max_batches=3)
+    assert partial['batches'] == 3 and not partial['complete']
+    assert partial['rows']['snapshots'] > 0 and partial['rows']['analysis'] == 0
+
+    report = manager.run_retention(policy)
+    assert report['complete'] and report['analyzed'] and report['vacuumed']
+    assert report['bytes_reclaimed'] > 0
+    print(f"✅ {report['rows']} satır, {report['bytes_reclaimed'] / 1024:.0f} KB geri kazanıldı")
+
+    conn = manager.db.connection()
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).strftime('%Y-%m-%d')
+    assert conn.execute("SELECT COUNT(*) FROM stock_data WHERE date IS NULL AND timestamp < ?",
+                        (cutoff,)).fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM stock_data WHERE date IS NULL").fetchone()[0] > 0
+
+    # Günlük mum: ilk/son/en yüksek/en düşük fiyat ve günün son hacmi
+    day = (datetime.now(timezone.utc) - timedelta(days=33)).strftime('%Y-%m-%d')
+    assert conn.execute("SELECT open, high, low, close, volume FROM stock_data WHERE symbol = 'SYM1' AND date = ?",
+                        (day,)).fetchone() == (133.0, 138.0, 133.0, 138.0, 5000.0)
+    assert conn.execute("SELECT close, open FROM stock_data WHERE symbol = 'SYM0' AND date = ?",
+                        (real_day,)).fetchone() == (1.0, None)
+
+    # Haftalık mumlar: eski günlük mumların tamamı haftalara dağıtılır
+    weekly = conn.execute("SELECT COUNT(*), SUM(volume), MIN(low), MAX(high) FROM stock_data_weekly").fetchone()
+    remaining = conn.execute("SELECT COUNT(*) FROM stock_data WHERE symbol = 'ASELS'").fetchone()[0]
+    assert weekly[0] > 0 and weekly[1] == (1000 - remaining) * 100.0 and weekly[2:] == (9.0, 12.0)
+    assert conn.execute("SELECT COUNT(*) FROM stock_data_weekly "
+                        "WHERE strftime('%w', week_start) != '1'").fetchone()[0] == 0
+
+    # Haber özeti: sayı ve ağırlıklı duygu skoru korunur
+    news = conn.execute("SELECT SUM(news_count), SUM(positive_count), SUM(negative_count) FROM news_daily").fetchone()
+    left = conn.execute("SELECT COUNT(*) FROM news_data").fetchone()[0]
+    assert news[0] + left == 50 * 200 * 2 and news[0] == news[1] + news[2]
+    assert left == 50 * 2 * len([i for i in range(200) if i <= 90])
+    score, count = conn.execute("SELECT sentiment_score, news_count FROM news_daily WHERE symbol = 'SYM0' "
+                                "ORDER BY date LIMIT 1").fetchone()
+    assert count == 2 and score in (0.9, -0.6)
+
+    # Analiz geçmişi: sembol başına en yeni 20 kayıt
+    assert conn.execute("SELECT COUNT(*) FROM analysis_results").fetchone()[0] == 50 * 20
+    assert manager.get_analysis_results("SYM3", "risk")[0]["result"] == "x" * 2000
+
+    # İkinci çalıştırma: yapılacak iş yok
+    again = manager.run_retention(policy)
+    assert sum(again['rows'].values()) == 0 and not again['analyzed'] and not again['vacuumed']
+
+    # Özetlenmiş günler yeniden kaydedilirse (kısa saklama, uzun indirme penceresi) haftalık
+    # mumlar değişmez; yeniden eklenen eski günler yalnızca silinir
+    weeks = conn.execute("SELECT * FROM stock_data_weekly WHERE symbol = 'ASELS' ORDER BY week_start").fetchall()
+    manager.save_stock_data_bulk({"ASELS": pd.DataFrame(
+        {'Open': 1.0, 'High': 50.0, 'Low': 0.5, 'Close': -np.arange(1000.0), 'Volume': 7.0}, index=dates)})
+    resaved = manager.run_retention(policy)
+    assert resaved['rows']['daily_bars'] == 1000 - remaining
+    assert conn.execute("SELECT * FROM stock_data_weekly WHERE symbol = 'ASELS' "
+                        "ORDER BY week_start").fetchall() == weeks
+
+    # Yarım haftaya sonradan gelen günler tarih sırasıyla birleşir: açılış en erken, kapanış en geç günden
+    monday = (datetime.now() - timedelta(days=800)).date()
+    monday -= timedelta(days=monday.weekday())
+    week = pd.DatetimeIndex([monday + timedelta(days=i) for i in range(5)])
+    bars = pd.DataFrame({'Open': [1.0, 2.0, 3.0, 4.0, 5.0], 'High': [10.0, 20.0, 30.0, 40.0, 50.0],
+                         'Low': [1.0, 2.0, 3.0, 4.0, 5.0], 'Close': [1.5, 2.5, 3.5, 4.5, 5.5],
+                         'Volume': 100.0}, index=week)
+    manager.save_stock_data_bulk({"THYAO": bars.iloc[1:3]})
+    manager.run_retention(policy)
+    manager.save_stock_data_bulk({"THYAO": bars.iloc[[0, 3, 4]]})
+    manager.run_retention(policy)
+    manager.save_stock_data_bulk({"THYAO": bars})  # Tümü zaten özetlendi: yeniden sayılmaz
+    manager.run_retention(policy)
+    assert conn.execute("SELECT week_start, open, high, low, close, volume, first_date, last_date "
+                        "FROM stock_data_weekly WHERE symbol = 'THYAO'").fetchall() == [
+        (str(week[0].date()), 1.0, 50.0, 1.0, 5.5, 500.0, str(week[0].date()), str(week[4].date()))]
+    assert conn.execute("SELECT COUNT(*) FROM stock_data WHERE symbol = 'THYAO'").fetchone()[0] == 0
+
+    print("\n✅ Saklama işi testi tamamlandı!")
+
+
+if __name__ == "__main__":
+    test_virtual_trading()
+    test_connection_pool()
+    test_migrations_and_query_plans()
+    test_bulk_ingest()
+    test_trade_transactions()
+    test_performance_tracking_update()
+    test_retention()
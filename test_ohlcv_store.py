@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Sütunlu OHLCV Deposu Testleri
+Eklemelerin eski parçaları yeniden yazmadığını, okumaların bellek eşlemeli ve
+sütun seçimli olduğunu geçici klasörde test eder
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from data.ohlcv_store import OHLCVStore
+
+
+def make_bars(dates, rng):
+    """Rastgele günlük mumlar (yfinance sütun adlarıyla)"""
+    close = 100 + rng.standard_normal(len(dates)).cumsum()
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Volume': rng.integers(1_000, 1_000_000, len(dates)).astype(float)}, index=dates)
+
+
+def test_append_and_read():
+    """Ekleme, sütun seçimi, tarih aralığı ve birleştirmeyi test eder"""
+    print("🗃️ Sütunlu Depo Testi Başlıyor...")
+
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range("2025-01-01", periods=300)
+    bars = make_bars(dates, rng)
+
+    with tempfile.TemporaryDirectory(prefix="ohlcv_store_test_") as data_dir:
+        store = OHLCVStore(data_dir)
+        assert store.append("BIST", "ASELS", bars.iloc[:200]) == 200
+
+        first_segment = os.path.join(store.root, "BIST", "ASELS", "seg-000000")
+        written = {name: os.stat(os.path.join(first_segment, name)).st_mtime_ns
+                   for name in os.listdir(first_segment)}
+
+        # Örtüşen ekleme: yalnızca yeni günler yeni parçaya yazılır, eski parça değişmez
+        assert store.append("BIST", "ASELS", bars.iloc[150:]) == 100
+        assert store.append("BIST", "ASELS", bars.iloc[150:]) == 0
+        assert {name: os.stat(os.path.join(first_segment, name)).st_mtime_ns
+                for name in os.listdir(first_segment)} == written
+
+        data = store.read("BIST", "ASELS", columns=["close", "volume"])
+        assert sorted(data) == ["close", "date", "volume"]
+        np.testing.assert_allclose(data['close'], bars['Close'].to_numpy())
+        assert store.bounds("BIST", "ASELS") == (np.datetime64("2025-01-01"), np.datetime64(dates[-1].date()), 300)
+
+        frame = store.read_frame("BIST", "ASELS", columns=["close"], start="2025-03-03", end="2025-03-07")
+        assert list(frame.columns) == ["close"] and len(frame) == 5
+        assert frame.index[0] == pd.Timestamp("2025-03-03")
+
+        # Birleştirilen bölüm kopyasız, salt okunur bellek eşlemesiyle okunur
+        assert store.compact("BIST", "ASELS") == 2
+        data = store.read("BIST", "ASELS", columns=["close"])
+        assert isinstance(data['close'], np.memmap) and not data['close'].flags.writeable
+        np.testing.assert_allclose(data['close'], bars['Close'].to_numpy())
+
+        # BIST entegrasyonunun Türkçe sütunları ve sırasız, tekrarlı tarihler
+        turkish = pd.DataFrame({'Tarih': ["2025-01-03", "2025-01-02", "2025-01-03"],
+                                'Kapanış': [11.0, 10.0, 12.0], 'Hacim': [5.0, 4.0, 6.0]})
+        assert store.append("BIST", "GARAN", turkish) == 2
+        garan = store.read_frame("BIST", "GARAN")
+        assert garan['close'].tolist() == [10.0, 12.0]
+        assert garan['open'].isna().all()
+
+        assert store.markets() == ["BIST"] and store.symbols("BIST") == ["ASELS", "GARAN"]
+        assert store.read("US", "AAPL") == {} and store.read_frame("US", "AAPL").empty
+
+    print("\n✅ Sütunlu depo testi tamamlandı!")
+
+
+def test_last_day_update_and_compaction():
+    """Son günün yeniden yazılmasını ve sıkıştırma sırasında okumaların yinelenmediğini test eder"""
+    print("🔁 Son Gün ve Sıkıştırma Testi Başlıyor...")
+
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2025-01-01", periods=100)
+    bars = make_bars(dates, rng)
+
+    with tempfile.TemporaryDirectory(prefix="ohlcv_store_test_") as data_dir:
+        store = OHLCVStore(data_dir)
+        assert store.append("BIST", "THYAO", bars.iloc[:50]) == 50
+
+        # Kapanıştan sonra yeniden çekilen son gün: yeni değer eskisinin yerine geçer
+        final = bars.iloc[49:51].copy()
+        final.iloc[0, final.columns.get_loc('Close')] += 5.0
+        assert store.append("BIST", "THYAO", final) == 2
+        assert store.append("BIST", "THYAO", final) == 0  # Değişmeyen son gün yeniden yazılmaz
+        frame = store.read_frame("BIST", "THYAO")
+        assert len(frame) == 51 and frame.index.is_unique
+        assert frame['close'].iloc[49] == bars['Close'].iloc[49] + 5.0
+        assert store.bounds("BIST", "THYAO")[2] == 51
+
+        # Yarıda kalan sıkıştırma: birleşik parça yazılmış, eski parçalar duruyor
+        partition = os.path.join(store.root, "BIST", "THYAO")
+        merged = {name: np.array(values) for name, values in store.read("BIST", "THYAO").items()}
+        store._write_segment(os.path.join(partition, "seg-000005"), merged)
+        assert len(os.listdir(partition)) == 3
+        np.testing.assert_array_equal(store.read("BIST", "THYAO")['close'], merged['close'])
+
+        # Sıkıştırma sürerken okuyan iş parçacığı hiçbir zaman yinelenen ya da eksik satır görmez
+        for day in range(51, 100):
+            store.append("BIST", "THYAO", bars.iloc[day:day + 1])
+        expected = store.read("BIST", "THYAO")['close'].copy()
+        assert len(expected) == 100
+
+        seen, stop = [], threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                seen.append(len(store.read("BIST", "THYAO", columns=["close"])['close']))
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        try:
+            for attempt in range(20):
+                store.compact("BIST", "THYAO")
+                store.append("BIST", "THYAO", bars.iloc[99:100].assign(Close=100.0 + attempt))
+        finally:
+            stop.set()
+            thread.join()
+        assert seen and set(seen) == {100}
+        assert len(os.listdir(partition)) == 2
+
+        # Eski parça silinemezse sıkıştırma hatayı gizlemez
+        original_rmtree = shutil.rmtree
+
+        def failing_rmtree(path, *args, **kwargs):
+            raise PermissionError(path)
+
+        shutil.rmtree = failing_rmtree
+        try:
+            store.compact("BIST", "THYAO")
+            assert False, "Silinemeyen parça hata vermeliydi"
+        except PermissionError:
+            pass
+        finally:
+            shutil.rmtree = original_rmtree
+        assert len(store.read("BIST", "THYAO")['close']) == 100
+        assert store.compact("BIST", "THYAO") == 2 and len(os.listdir(partition)) == 1
+
+    print("\n✅ Son gün ve sıkıştırma testi tamamlandı!")
+
+
+def test_screener_load():
+    """500 BIST + 500 ABD sembolünün bir yıllık kapanış/hacim verisinin hızlı yüklendiğini test eder"""
+    print("⏱️ Sütunlu Depo Yükleme Testi Başlıyor...")
+
+    rng = np.random.default_rng(9)
+    dates = pd.bdate_range("2025-01-01", periods=252)
+
+    with tempfile.TemporaryDirectory(prefix="ohlcv_store_test_") as data_dir:
+        store = OHLCVStore(data_dir)
+        for market in ("BIST", "US"):
+            for i in range(500):
+                store.append(market, f"{market}{i}", make_bars(dates, rng))
+
+        start = time.perf_counter()
+        universe = {market: store.read_many(market, columns=["close", "volume"]) for market in store.markets()}
+        elapsed = time.perf_counter() - start
+
+        assert sum(len(symbols) for symbols in universe.values()) == 1000
+        assert all(len(data['close']) == 252 and 'open' not in data
+                   for symbols in universe.values() for data in symbols.values())
+        print(f"✅ 1000 sembol x 252 gün (kapanış + hacim) {elapsed:.3f} sn")
+        assert elapsed < 1.0
+
+    print("\n✅ Sütunlu depo yükleme testi tamamlandı!")
+
+
+if __name__ == "__main__":
+    test_append_and_read()
+    test_last_day_update_and_compaction()
+    test_screener_load()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Binance Ağırlık Sınırlayıcı Testleri
+Uç nokta ağırlıklarını, dakikalık tavanı, başlık eşitlemesini ve 429 geri çekilmesini
+sahte saatle test eder
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto.rate_limiter import RequestWeightLimiter, endpoint_weight
+from crypto.fetcher import ConcurrentFetcher
+from testing_helpers import FakeClock
+
+BASE_URL = "https://api.binance.com/api/v3"
+
+
+def test_endpoint_weights():
+    """Uç nokta ağırlıklarının Binance tablosuyla uyumlu olduğunu test eder"""
+    print("⚖️ Uç Nokta Ağırlığı Testi Başlıyor...")
+
+    assert endpoint_weight(f"{BASE_URL}/exchangeInfo") == 20
+    assert endpoint_weight(f"{BASE_URL}/klines", {'symbol': 'BTCUSDT', 'interval': '1h'}) == 2
+    assert endpoint_weight(f"{BASE_URL}/ticker/24hr") == 80
+    assert endpoint_weight(f"{BASE_URL}/ticker/24hr", {'symbol': 'BTCUSDT'}) == 2
+    assert endpoint_weight(f"{BASE_URL}/ticker/24hr", {'symbols': '["A","B"]'}) == 2
+    assert endpoint_weight(f"{BASE_URL}/ticker/24hr", {'symbols': [f"C{i}" for i in range(50)]}) == 40
+    assert endpoint_weight(f"{BASE_URL}/ticker/price?symbol=USDTTUSD") == 2
+    assert endpoint_weight(f"{BASE_URL}/ticker/price") == 4
+    assert endpoint_weight(f"{BASE_URL}/unknown") == 1
+
+    print("\n✅ Uç nokta ağırlığı testi tamamlandı!")
+
+
+def test_throughput_ceiling():
+    """Sürekli talepte her dakikanın bütçeye ulaştığını ama aşmadığını test eder"""
+    print("📈 Dakikalık Tavan Testi Başlıyor...")
+
+    clock = FakeClock()
+    limiter = RequestWeightLimiter(clock=clock, sleep=clock.sleep)
+    start = clock.now
+
+    # Boşta birikmiş kova: ilk istekler beklemeden geçer
+    assert limiter.acquire(20) == 0.0
+    assert clock.slept == 0.0
+
+    minutes = {}
+    weights = [2] * 40 + [80]  # Bir tarama: çok sayıda klines + tüm piyasa ticker
+    index = 0
+    while clock.now - start < 600:
+        weight = weights[index % len(weights)]
+        limiter.acquire(weight)
+        minute = int(clock.now // 60)
+        minutes[minute] = minutes.get(minute, 0) + weight
+        index += 1
+
+    full_minutes = sorted(minutes)[1:-1]
+    for minute in sorted(minutes):
+        assert minutes[minute] <= limiter.budget, (minute, minutes[minute])
+    for minute in full_minutes:
+        assert minutes[minute] >= limiter.budget * 0.95, (minute, minutes[minute])
+
+    status = limiter.status()
+    print(f"✅ {len(full_minutes)} tam dakika: {min(minutes[m] for m in full_minutes)}-"
+          f"{max(minutes[m] for m in full_minutes)} ağırlık / {limiter.budget} bütçe")
+    assert status['remaining'] == limiter.budget - status['used']
+
+    print("\n✅ Dakikalık tavan testi tamamlandı!")
+
+
+def test_header_sync_and_backoff():
+    """Başlıktaki kullanılan ağırlığın ve 429 Retry-After süresinin uygulandığını test eder"""
+    print("🚦 Başlık Eşitleme ve Geri Çekilme Testi Başlıyor...")
+
+    clock = FakeClock(now=1_700_000_010.0)
+    limiter = RequestWeightLimiter(clock=clock, sleep=clock.sleep)
+
+    # Aynı IP'den başka bir süreç bütçenin çoğunu harcamış
+    limiter.acquire(2)
+    limiter.observe(200, {'X-MBX-USED-WEIGHT-1M': str(limiter.budget - 10)})
+    assert limiter.status()['remaining'] == 10
+
+    limiter.acquire(2)
+    assert clock.slept == 0.0
+    waited = limiter.acquire(20)  # Pencereye sığmaz -> sonraki dakikayı bekler
+    assert waited > 0 and int(clock.now) % 60 == 0
+    print(f"✅ Bütçe dolunca {waited:.0f} sn beklendi (dakika başı)")
+
+    # 429: Retry-After boyunca hiçbir istek gönderilmez
+    limiter.observe(429, {'Retry-After': '7'})
+    assert limiter.status()['banned_for'] == 7
+    before = clock.now
+    limiter.acquire(2)
+    assert clock.now - before >= 7
+    assert limiter.status()['rejections'] == 1
+
+    # Retry-After yoksa bekleme her reddedişte katlanır
+    limiter.observe(418, {})
+    first = limiter.status()['banned_for']
+    limiter.observe(418, {})
+    assert limiter.status()['banned_for'] >= 2 * first
+
+    print("\n✅ Başlık eşitleme ve geri çekilme testi tamamlandı!")
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._payload = payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self._payload
+
+
+def test_fetcher_retries_after_429():
+    """ConcurrentFetcher'ın 429 sonrası bekleyip isteği tekrarladığını test eder"""
+    print("🔁 429 Tekrar Deneme Testi Başlıyor...")
+
+    clock = FakeClock()
+    limiter = RequestWeightLimiter(clock=clock, sleep=clock.sleep)
+    fetcher = ConcurrentFetcher(max_workers=2, limiter=limiter)
+
+    responses = [FakeResponse(429, headers={'Retry-After': '3'}),
+                 FakeResponse(200, payload={'ok': True}, headers={'X-MBX-USED-WEIGHT-1M': '22'})]
+    sent = []
+
+    def fake_get(url, params=None, timeout=None):
+        sent.append(clock.now)
+        return responses.pop(0)
+    fetcher.session.get = fake_get
+
+    assert fetcher.get_json(f"{BASE_URL}/exchangeInfo") == {'ok': True}
+    assert len(sent) == 2 and sent[1] - sent[0] >= 3
+    assert limiter.status()['weight'] == 40  # İki deneme x exchangeInfo ağırlığı
+
+    print("\n✅ 429 tekrar deneme testi tamamlandı!")
+
+
+def test_thread_safety():
+    """Eşzamanlı iş parçacıklarının kova hızını aşmadığını gerçek saatle test eder"""
+    print("🧵 Eşzamanlılık Testi Başlıyor...")
+
+    # Saniyede 20 ağırlık, en fazla 20 birikim
+    limiter = RequestWeightLimiter(limit=1200, safety_margin=1.0, burst_seconds=1.0)
+    granted = []
+    lock = threading.Lock()
+    start = time.monotonic()
+
+    def worker():
+        while time.monotonic() - start < 1.0:
+            limiter.acquire(1)
+            with lock:
+                granted.append(time.monotonic() - start)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = max(granted)
+    print(f"✅ {len(granted)} istek, {elapsed:.2f} sn")
+    assert len(granted) <= 20 + 20 * elapsed + 1
+
+    print("\n✅ Eşzamanlılık testi tamamlandı!")
+
+
+if __name__ == "__main__":
+    test_endpoint_weights()
+    test_throughput_ceiling()
+    test_header_sync_and_backoff()
+    test_fetcher_retries_after_429()
+    test_thread_safety()
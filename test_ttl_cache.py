@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+TTL Önbellek Testleri
+Süre dolumu, LRU çıkarma, bayt sınırı ve sayaçları sahte saatle test eder
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from utils.ttl_cache import TTLCache
+from testing_helpers import FakeClock
+
+
+def test_ttl_expiry():
+    """Süresi dolan kayıtların (bir günden eski olanlar dahil) geçersiz sayıldığını test eder"""
+    print("⏱️ TTL Süre Dolumu Testi Başlıyor...")
+
+    clock = FakeClock()
+    cache = TTLCache(ttl=60, clock=clock)
+    cache.set('BTC', 1)
+    cache.set('ETH', 2, ttl=300)
+
+    clock.now += 59
+    assert cache.get('BTC') == 1
+
+    clock.now += 1
+    assert cache.get('BTC') is None
+    assert cache.get('ETH') == 2
+
+    # timedelta.seconds bir günde sıfırlanırdı; monoton saat sıfırlanmaz
+    clock.now += 86_400 + 10
+    assert 'ETH' not in cache
+
+    stats = cache.stats()
+    print(f"✅ Sayaçlar: {stats}")
+    assert stats['hits'] == 2 and stats['misses'] == 1 and stats['expirations'] == 2
+    print("\n✅ TTL süre dolumu testi tamamlandı!")
+
+
+def test_lru_eviction():
+    """Kayıt sınırı aşılınca en uzun süredir kullanılmayan kaydın çıkarıldığını test eder"""
+    print("🗂️ LRU Çıkarma Testi Başlıyor...")
+
+    cache = TTLCache(ttl=None, max_entries=3)
+    for key in ['A', 'B', 'C']:
+        cache.set(key, key.lower())
+
+    cache.get('A')  # A en son kullanılan olur
+    cache.set('D', 'd')
+
+    assert 'B' not in cache
+    assert [key for key in ['A', 'C', 'D'] if key in cache] == ['A', 'C', 'D']
+    assert cache.evictions == 1 and len(cache) == 3
+    print("\n✅ LRU çıkarma testi tamamlandı!")
+
+
+def test_byte_limit():
+    """Bayt sınırının DataFrame boyutlarıyla uygulandığını test eder"""
+    print("💾 Bayt Sınırı Testi Başlıyor...")
+
+    frame = pd.DataFrame(np.zeros((1000, 4)))  # ~32 KB
+    size = int(frame.memory_usage(deep=True).sum())
+
+    cache = TTLCache(ttl=None, max_entries=None, max_bytes=int(size * 2.5))
+    for i in range(5):
+        cache.set(i, {'data': frame.copy()})
+
+    print(f"✅ {len(cache)} kayıt, {cache.size_bytes} bayt (sınır {cache.max_bytes})")
+    assert len(cache) == 2 and cache.size_bytes <= cache.max_bytes
+    assert 3 in cache and 4 in cache
+
+    cache.set('huge', pd.DataFrame(np.zeros((10_000, 4))))  # Tek başına sınırı aşar
+    assert 'huge' not in cache and len(cache) == 2
+    print("\n✅ Bayt sınırı testi tamamlandı!")
+
+
+def test_crypto_analyzer_cache():
+    """CryptoAnalyzer önbelleğinin sınırlı kaldığını ve süre ayarına uyduğunu test eder"""
+    print("🪙 Crypto Önbellek Testi Başlıyor...")
+
+    from test_crypto_scan import make_fake_klines, new_analyzer
+
+    requests_made = []
+
+    def fake_get_json(url, params=None):
+        requests_made.append(params['symbol'])
+        return make_fake_klines(params['symbol'], params.get('limit', 168))
+
+    analyzer = new_analyzer()
+    analyzer.fetcher.get_json = fake_get_json
+    analyzer.cache.max_entries = 5
+
+    for i in range(20):
+        analyzer.get_chart_data(f"COIN{i}USDT")
+    assert len(analyzer.cache) == 5
+
+    analyzer.get_chart_data("COIN19USDT")
+    assert len(requests_made) == 20  # Önbellekten geldi
+
+    # Süre değişikliği mevcut kayıtlara da uygulanır
+    analyzer.cache_duration = 0
+    for _ in range(2):
+        before = len(requests_made)
+        analyzer.get_chart_data("COIN18USDT")
+        assert len(requests_made) > before
+
+    print(f"✅ Sayaçlar: {analyzer.cache.stats()}")
+    print("\n✅ Crypto önbellek testi tamamlandı!")
+
+
+if __name__ == "__main__":
+    test_ttl_expiry()
+    test_lru_eviction()
+    test_byte_limit()
+    test_crypto_analyzer_cache()
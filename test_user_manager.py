@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Kullanıcı ve Portföy Deposu Testleri
+JSON verisinin (bozuk kayıtlar atlanarak) içe aktarılmasını, alım/satımın atomikliğini,
+önbelleğin başka oturumların yazmalarıyla geçersiz kılınmasını ve işlem maliyetinin
+geçmiş boyutundan bağımsız kaldığını geçici klasörde test eder
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from portfolio.user_manager import UserManager
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+JSON_FILES = ["users.json", "portfolios.json", "watchlists.json", "transactions.json"]
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_json_import_and_trading():
+    """Eski JSON verisinin aynen okunduğunu ve alım/satım akışının korunduğunu test eder"""
+    print("👤 Kullanıcı Deposu Testi Başlıyor...")
+
+    with tempfile.TemporaryDirectory(prefix="user_manager_test_") as data_dir:
+        for name in JSON_FILES:
+            shutil.copy(os.path.join(DATA_DIR, name), data_dir)
+
+        manager = UserManager(data_dir)
+        assert manager.get_users() == load(os.path.join(data_dir, "users.json"))
+        for username in manager.get_users():
+            assert manager.get_portfolio(username) == load(os.path.join(data_dir, "portfolios.json")).get(username, {})
+            assert manager.get_watchlist(username) == load(os.path.join(data_dir, "watchlists.json")).get(username, [])
+            assert manager.get_transactions(username) == load(
+                os.path.join(data_dir, "transactions.json")).get(username, [])
+
+        # Dönen değerler kopyadır: değiştirmek önbelleği bozmaz
+        manager.get_portfolio("ugur")["FAKE"] = {}
+        assert "FAKE" not in manager.get_portfolio("ugur")
+
+        balance = manager.get_user_balance("ugur")
+        history = len(manager.get_transactions("ugur"))
+        assert manager.buy_crypto("ugur", "BTCUSDT", 1000.0, 50000.0)
+        assert manager.buy_crypto("ugur", "BTCUSDT", 3000.0, 60000.0)
+        position = manager.get_portfolio("ugur")["BTCUSDT"]
+        assert abs(position['amount'] - 0.07) < 1e-12 and position['total_invested'] == 4000.0
+        assert manager.get_user_balance("ugur") == balance - 4000.0
+
+        assert not manager.buy_crypto("ugur", "BTCUSDT", 10 ** 9, 1.0)  # Yetersiz bakiye
+        assert not manager.sell_crypto("ugur", "BTCUSDT", 1.0, 1.0)  # Yetersiz miktar
+        assert not manager.buy_crypto("nobody", "BTCUSDT", 1.0, 1.0)
+
+        assert manager.sell_crypto("ugur", "BTCUSDT", position['amount'], 70000.0)
+        assert "BTCUSDT" not in manager.get_portfolio("ugur")
+        transactions = manager.get_transactions("ugur")
+        assert [t['type'] for t in transactions[history:]] == ["BUY", "BUY", "SELL"]
+        assert [t['id'] for t in transactions[history:]] == [history + 1, history + 2, history + 3]
+        assert transactions[-1]['balance_after'] == manager.get_user_balance("ugur")
+
+        manager.add_to_watchlist("ugur", "ETHUSDT")
+        manager.add_to_watchlist("ugur", "ETHUSDT")
+        manager.add_to_watchlist("ugur", "SOLUSDT")
+        manager.remove_from_watchlist("ugur", "ETHUSDT")
+        assert manager.get_watchlist("ugur")[-1:] == ["SOLUSDT"] and "ETHUSDT" not in manager.get_watchlist("ugur")
+
+        manager.update_portfolio("ugur", {"ADAUSDT": {'amount': 10.0, 'avg_price': 0.5, 'total_invested': 5.0}})
+        assert list(manager.get_portfolio("ugur")) == ["ADAUSDT"]
+        manager.reset_user_balance("ugur")
+        assert manager.get_user_balance("ugur") == 500000.0
+
+        # JSON dosyaları değiştirilmez; ikinci açılış tekrar içe aktarmaz
+        for name in JSON_FILES:
+            assert load(os.path.join(data_dir, name)) == load(os.path.join(DATA_DIR, name))
+        assert UserManager(data_dir).get_watchlist("ugur") == manager.get_watchlist("ugur")
+
+    with tempfile.TemporaryDirectory(prefix="user_manager_test_") as data_dir:
+        manager = UserManager(data_dir)
+        assert sorted(manager.get_users()) == ["gokhan", "ugur"]
+        assert manager.get_user_balance("gokhan") == 500000.0
+
+    print("\n✅ Kullanıcı deposu testi tamamlandı!")
+
+
+def test_legacy_json_with_bad_records():
+    """Yinelenen işlem numarası ve bozuk kayıtlar içeren eski JSON'un açılışı engellemediğini test eder"""
+    print("🧹 Bozuk JSON İçe Aktarma Testi Başlıyor...")
+
+    with tempfile.TemporaryDirectory(prefix="user_manager_test_") as data_dir:
+        for name in JSON_FILES:
+            shutil.copy(os.path.join(DATA_DIR, name), data_dir)
+
+        # Eski sürümün iki oturumu aynı numarayı vermiş; bir kayıt yarım, biri bozuk yazılmış
+        transactions = load(os.path.join(data_dir, "transactions.json"))
+        legacy = transactions["gokhan"]
+        duplicate = dict(legacy[-1], symbol="ADAUSDT", total_cost=1500.0, balance_after=478000.0)
+        transactions["gokhan"] = legacy + [duplicate, {'type': 'SELL', 'symbol': 'TRXUSDT'}, "bozuk kayıt"]
+        portfolios = load(os.path.join(data_dir, "portfolios.json"))
+        portfolios["gokhan"]["ADAUSDT"] = {'amount': 100.0}
+        portfolios["ugur"] = ["BTCUSDT"]
+        for name, data in (("transactions.json", transactions), ("portfolios.json", portfolios)):
+            with open(os.path.join(data_dir, name), 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+
+        manager = UserManager(data_dir)
+        assert manager.get_users() == load(os.path.join(data_dir, "users.json"))
+
+        # Geçerli kayıtlar aynen, yinelenen numaralı işlem sona yeni numarayla aktarılır;
+        # numarasız işlem sırasını numara alır, bozuk kayıt atlanır
+        imported = manager.get_transactions("gokhan")
+        assert imported[:len(legacy)] == legacy and len(imported) == len(legacy) + 2
+        assert imported[len(legacy)]['type'] == "SELL" and imported[len(legacy)]['id'] == len(legacy) + 2
+        assert imported[-1]['symbol'] == "ADAUSDT" and imported[-1]['id'] == len(legacy) + 4
+
+        # Eksik alanlı pozisyon ve liste olan portföy atlanır
+        assert sorted(manager.get_portfolio("gokhan")) == sorted(load(
+            os.path.join(DATA_DIR, "portfolios.json"))["gokhan"])
+        assert manager.get_portfolio("ugur") == {}
+
+        # Yeni işlemler aktarılan son numaradan devam eder
+        assert manager.buy_crypto("gokhan", "BTCUSDT", 100.0, 50000.0)
+        assert manager.get_transactions("gokhan")[-1]['id'] == len(legacy) + 5
+
+    print("\n✅ Bozuk JSON içe aktarma testi tamamlandı!")
+
+
+def test_concurrent_sessions():
+    """İki oturumun eşzamanlı işlemlerinde yazma kaybı olmadığını ve önbelleklerin güncel kaldığını test eder"""
+    print("🔀 Eşzamanlı Oturum Testi Başlıyor...")
+
+    with tempfile.TemporaryDirectory(prefix="user_manager_test_") as data_dir:
+        first, second = UserManager(data_dir), UserManager(data_dir)
+        assert first.get_portfolio("gokhan") == {} and second.get_user_balance("gokhan") == 500000.0
+
+        def trade(manager, symbol):
+            for _ in range(50):
+                assert manager.buy_crypto("gokhan", symbol, 100.0, 2.0)
+
+        threads = [threading.Thread(target=trade, args=(manager, symbol))
+                   for manager in (first, second) for symbol in ("AAAUSDT", "BBBUSDT")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Diğer oturumun yazmaları önbellekte eski değer bırakmaz
+        for manager in (first, second):
+            assert manager.get_user_balance("gokhan") == 500000.0 - 200 * 100.0
+            assert manager.get_portfolio("gokhan")["AAAUSDT"]['total_invested'] == 10000.0
+            transactions = manager.get_transactions("gokhan")
+            assert [t['id'] for t in transactions] == list(range(1, 201))
+
+    print("\n✅ Eşzamanlı oturum testi tamamlandı!")
+
+
+def test_trade_cost_flat():
+    """Alım/satım süresinin işlem geçmişi büyüdükçe artmadığını test eder"""
+    print("⏱️ İşlem Maliyeti Testi Başlıyor...")
+
+    def timed_trades(manager):
+        start = time.perf_counter()
+        for _ in range(100):
+            manager.buy_crypto("gokhan", "ETHUSDT", 10.0, 2000.0)
+            manager.sell_crypto("gokhan", "ETHUSDT", 0.001, 2000.0)
+        return time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory(prefix="user_manager_test_") as data_dir:
+        manager = UserManager(data_dir)
+        small = timed_trades(manager)
+
+        with manager.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO transactions (username, id, type, symbol, timestamp, data) VALUES (?, ?, 'BUY', ?, '', '{}')",
+                [("gokhan", 1000 + i, f"SYM{i % 500}") for i in range(50000)]
+            )
+        large = timed_trades(manager)
+        print(f"✅ 200 işlem: boş geçmiş {small * 1000:.0f} ms, 50k işlemlik geçmiş {large * 1000:.0f} ms")
+        assert large < small * 3 + 0.5
+
+    print("\n✅ İşlem maliyeti testi tamamlandı!")
+
+
+if __name__ == "__main__":
+    test_json_import_and_trading()
+    test_legacy_json_with_bad_records()
+    test_concurrent_sessions()
+    test_trade_cost_flat()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Arkadan Yazma Kuyruğu Testleri
+Kayıtların toplu işlemlerde birleştiğini, dolu kuyrukta ekleyenin bekletildiğini,
+kapanışta kalan kayıtların yazıldığını ve geçici hatada partinin yeniden denendiğini
+geçici veritabanıyla test eder
+"""
+
+import sys
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.write_behind import WriteBehindQueue
+
+
+class AnalysisWriter:
+    """Her partiyi tek işlemde yazan, parti boyutlarını kaydeden analiz yazıcısı"""
+
+    def __init__(self, db_path, delay=0.0):
+        self.db_path = db_path
+        self.delay = delay
+        self.batches = []
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS analysis_results "
+                         "(symbol TEXT, analysis_type TEXT, result TEXT, confidence REAL)")
+
+    def __call__(self, rows):
+        time.sleep(self.delay)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.executemany("INSERT INTO analysis_results VALUES (?, ?, ?, ?)", rows)
+        finally:
+            conn.close()
+        self.batches.append(len(rows))
+
+    def count(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM analysis_results").fetchone()[0]
+
+
+def test_batched_writes():
+    """Farklı iş parçacıklarından gelen kayıtların az sayıda toplu işlemde yazıldığını test eder"""
+    print("📝 Arkadan Yazma Testi Başlıyor...")
+
+    with tempfile.TemporaryDirectory(prefix="write_behind_test_") as data_dir:
+        writer = AnalysisWriter(os.path.join(data_dir, "stocks.db"))
+        news = []
+        queue = WriteBehindQueue({'analysis': writer, 'news': news.extend}, batch_size=200, backoff=0.01)
+
+        def produce(worker):
+            for i in range(500):
+                queue.put('analysis', (f"SYM{worker}", "risk", "AL", i / 500))
+                if i % 100 == 0:
+                    queue.put('news', {'symbol': f"SYM{worker}", 'news_list': []})
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        enqueue_time = time.perf_counter() - start
+
+        assert queue.flush(timeout=10)
+        assert writer.count() == 2000 and len(news) == 20
+        assert max(writer.batches) <= 200 and len(writer.batches) < 100
+        assert queue.stats['written'] == 2020 and queue.stats['failed'] == 0 and len(queue) == 0
+        print(f"✅ 2000 analiz {len(writer.batches)} işlemde yazıldı (kuyruğa alma {enqueue_time * 1000:.1f} ms)")
+
+        try:
+            queue.put('unknown', None)
+            assert False, "Bilinmeyen tür reddedilmeliydi"
+        except KeyError:
+            pass
+
+        # Kalıcı yazıcı hatası denemeler tükenince kaydı düşürür, flush bunu bildirir
+        # ve kuyruk çalışmaya devam eder
+        queue.put('analysis', ("BAD",))
+        assert not queue.flush(timeout=5)
+        assert queue.stats['failed'] == 1 and queue.stats['retries'] == 3
+        queue.put('analysis', ("SYM9", "risk", "SAT", 0.1))
+        assert queue.close() and writer.count() == 2001
+
+        try:
+            queue.put('analysis', ("SYM9", "risk", "SAT", 0.1))
+            assert False, "Kapalı kuyruk kayıt almamalı"
+        except RuntimeError:
+            pass
+
+    print("\n✅ Arkadan yazma testi tamamlandı!")
+
+
+def test_transient_failure_retry():
+    """Geçici kilit hatasında partinin yeniden denenip kaybolmadığını test eder"""
+    print("🔁 Yeniden Deneme Testi Başlıyor...")
+
+    with tempfile.TemporaryDirectory(prefix="write_behind_test_") as data_dir:
+        writer = AnalysisWriter(os.path.join(data_dir, "stocks.db"))
+        failures = [2]
+
+        def locked_writer(rows):
+            if failures[0]:
+                failures[0] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            writer(rows)
+
+        queue = WriteBehindQueue({'analysis': locked_writer}, backoff=0.01)
+        for i in range(50):
+            queue.put('analysis', ("GARAN", "risk", "AL", float(i)))
+        assert queue.flush(timeout=5)
+        assert writer.count() == 50 and queue.stats['written'] == 50
+        assert queue.stats['retries'] == 2 and queue.stats['failed'] == 0
+
+        # Denemeler tükenirse kayıp kapanışta bildirilir
+        failures[0] = 10
+        queue.put('analysis', ("GARAN", "risk", "SAT", 0.0))
+        assert not queue.close() and queue.stats['failed'] == 1 and writer.count() == 50
+        assert not queue._thread.is_alive()
+
+    print("\n✅ Yeniden deneme testi tamamlandı!")
+
+
+def test_backpressure_and_shutdown():
+    """Dolu kuyrukta ekleyenin bekletildiğini ve kapanışta kuyruğun boşaltıldığını test eder"""
+    print("🚧 Geri Basınç Testi Başlıyor...")
+
+    with tempfile.TemporaryDirectory(prefix="write_behind_test_") as data_dir:
+        writer = AnalysisWriter(os.path.join(data_dir, "stocks.db"), delay=0.05)
+        queue = WriteBehindQueue({'analysis': writer}, maxsize=10, batch_size=5)
+
+        for i in range(60):
+            assert queue.put('analysis', ("ASELS", "risk", "TUT", float(i)))
+        assert queue.stats['blocked'] > 0 and queue.stats['max_depth'] <= 10
+
+        # Süre sınırlı ekleme: yazıcı yetişemezse kayıt reddedilir
+        writer.delay = 1.0
+        results = [queue.put('analysis', ("ASELS", "risk", "TUT", 0.0), timeout=0.01) for _ in range(30)]
+        assert not all(results)
+
+        writer.delay = 0.0
+        assert queue.close(timeout=30)
+        assert writer.count() == 60 + sum(results) and len(queue) == 0
+        assert not queue._thread.is_alive()
+
+    print("\n✅ Geri basınç testi tamamlandı!")
+
+
+if __name__ == "__main__":
+    test_batched_writes()
+    test_transient_failure_retry()
+    test_backpressure_and_shutdown()
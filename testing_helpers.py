@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Test Yardımcıları
+Kök dizindeki test betiklerinin paylaştığı sahte nesneler
+"""
+
+
+class FakeClock:
+    """Elle ya da uyku çağrılarıyla ilerletilen sahte saat"""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+        self.slept = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
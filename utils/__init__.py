@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+"""
+Ortak yardımcı modüller
+"""
+
+from .ttl_cache import TTLCache
+from .sqlite_pool import SQLitePool
+from .write_behind import WriteBehindQueue
+
+__all__ = ['TTLCache', 'SQLitePool', 'WriteBehindQueue']
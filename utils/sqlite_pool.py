@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+SQLite Bağlantı Havuzu
+Her iş parçacığına kalıcı bir bağlantı verir; PRAGMA ayarları bağlantı açılırken bir kez
+uygulanır, hazırlanmış ifadeler bağlantı ömrü boyunca önbellekte kalır
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# Bağlantı açılırken bir kez uygulanan ayarlar
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',  # Okuyucular yazmaları beklemez
+    'synchronous': 'NORMAL',  # WAL ile güvenli, her işlemde fsync yapılmaz
+    'cache_size': -16000,  # Negatif: KiB cinsinden (~16 MB sayfa önbelleği)
+    'mmap_size': 64 * 1024 * 1024,  # Okumalar bellek eşlemeli dosyadan
+    'temp_store': 'MEMORY',  # Sıralama ve geçici tablolar bellekte
+}
+
+
+class SQLitePool:
+    """İş parçacığı başına kalıcı SQLite bağlantıları"""
+
+    def __init__(self, db_path: str, timeout: float = 30.0, cached_statements: int = 256,
+                 pragmas: Optional[Dict] = None):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.cached_statements = cached_statements  # Bağlantı başına hazırlanmış ifade önbelleği
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.logger = logging.getLogger(__name__)
+
+        self._local = threading.local()
+        self._connections = {}  # iş parçacığı kimliği -> (iş parçacığı, bağlantı)
+        self._lock = threading.Lock()
+        self.stats = {'opened': 0, 'reused': 0, 'closed': 0}
+
+    def connection(self) -> sqlite3.Connection:
+        """Çağıran iş parçacığının bağlantısı (ilk kullanımda açılır).
+
+        Dönen bağlantı `with` bloğunda kullanılabilir; blok başarıyla biterse işlem
+        onaylanır, hata olursa geri alınır, bağlantı açık kalır.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self.stats['reused'] += 1
+            return conn
+
+        conn = self._open()
+        self._local.conn = conn
+        thread = threading.current_thread()
+        with self._lock:
+            self._prune()
+            self._connections[thread.ident] = (thread, conn)
+            self.stats['opened'] += 1
+        return conn
+
+    @contextmanager
+    def transaction(self, mode: str = "IMMEDIATE") -> Iterator[sqlite3.Connection]:
+        """Açık BEGIN <mode> işlemi; blok başarıyla biterse onaylanır, hata olursa geri alınır.
+
+        IMMEDIATE yazma kilidini baştan alır: blok içindeki okuma-kontrol-yazma adımları
+        arasında başka bağlantı yazamaz (meşgulse `timeout` kadar beklenir). Aynı iş
+        parçacığının bağlantısında onaylanmamış bir işlem açıksa o iş geri alınır ve hata
+        verilir; yarım kalan iş başkasının atomik bloğunda sessizce onaylanmaz.
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            conn.rollback()
+            raise sqlite3.ProgrammingError(
+                "Bağlantıda onaylanmamış işlem açıkken transaction() çağrıldı; yarım kalan iş geri alındı"
+            )
+        conn.execute(f"BEGIN {mode}")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
+    def _open(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # check_same_thread=False yalnızca kapanışın başka iş parçacığından yapılabilmesi için
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def _prune(self):
+        """Sonlanmış iş parçacıklarının bağlantılarını kapatır"""
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                conn.close()
+                del self._connections[ident]
+                self.stats['closed'] += 1
+
+    def close(self):
+        """Çağıran iş parçacığının bağlantısını kapatır"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._connections.pop(threading.get_ident(), None)
+            conn.close()
+            self.stats['closed'] += 1
+
+    def close_all(self):
+        """Tüm iş parçacıklarının bağlantılarını kapatır"""
+        with self._lock:
+            for thread, conn in self._connections.values():
+                conn.close()
+                self.stats['closed'] += 1
+            self._connections.clear()
+        self._local = threading.local()
+
+    def status(self) -> Dict:
+        """Bağlantı sayaçları ve uygulanan ayarlar"""
+        with self._lock:
+            self._prune()
+            open_connections = len(self._connections)
+        requests = self.stats['opened'] + self.stats['reused']
+        return {
+            'db_path': self.db_path,
+            'open_connections': open_connections,
+            'reuse_rate': self.stats['reused'] / requests * 100 if requests else 0.0,
+            'cached_statements': self.cached_statements,
+            'pragmas': dict(self.pragmas),
+            **self.stats,
+        }
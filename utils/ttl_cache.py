@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Süre ve Boyut Sınırlı Önbellek
+Monoton saatle süre kontrolü yapan, kayıt sayısı ya da bayt sınırı aşılınca
+en uzun süredir kullanılmayan kaydı çıkaran (LRU) iş parçacığı güvenli önbellek
+"""
+
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """Bir değerin bellekte kapladığı yaklaşık bayt sayısı"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray) or hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+    """Süre sınırlı LRU önbellek (isabet/ıska/çıkarma sayaçlarıyla)"""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = 256,
+                 max_bytes: Optional[int] = None, sizeof: Callable[[Any], int] = estimate_size,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl  # None: süre sınırı yok; değişiklik mevcut kayıtlara da uygulanır
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.clock = clock
+
+        self._data = OrderedDict()  # anahtar -> (eklenme zamanı, kayda özel ttl, değer, bayt)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        """Geçerli kaydı döndürür ve en son kullanılan olarak işaretler"""
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is not None and self._expired(entry, self.clock()):
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[2]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Kaydı ekler; sınırlar aşılırsa en eski kullanılan kayıtlar çıkarılır"""
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            # Tek başına bayt sınırını aşan kayıt saklanmaz
+            if self.max_bytes is not None and size > self.max_bytes:
+                self.evictions += 1
+                return
+
+            self._data[key] = (self.clock(), ttl, value, size)
+            self._bytes += size
+            self._evict()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.set(key, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Kaydı siler ve değerini döndürür"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._remove(key)[2]
+
+    def clear(self):
+        """Tüm kayıtları siler (sayaçlar korunur)"""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> tuple:
+        entry = self._data.pop(key)
+        self._bytes -= entry[3]
+        return entry
+
+    def _expired(self, entry: tuple, now: float) -> bool:
+        ttl = self.ttl if entry[1] is None else entry[1]
+        return ttl is not None and now - entry[0] >= ttl
+
+    def _evict(self):
+        """Kayıt sayısı ve bayt sınırına inene kadar LRU kayıtları çıkarır"""
+        now = self.clock()
+
+        # Önce süresi dolmuş kayıtlar temizlenir
+        if self._over_limit():
+            for key in [k for k, entry in self._data.items() if self._expired(entry, now)]:
+                self._remove(key)
+                self.expirations += 1
+
+        while self._over_limit():
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def _over_limit(self) -> bool:
+        if self.max_entries is not None and len(self._data) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Önbellek sayaçları"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
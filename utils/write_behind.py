@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Arkadan Yazma Kuyruğu
+Kayıt isteklerini sınırlı bir kuyruğa alıp hemen döner; arka plandaki tek yazıcı iş
+parçacığı biriken kayıtları türlerine göre toplu işlemlerle yazar. Kuyruk doluysa
+ekleyen taraf bekletilir (geri basınç), kapanışta kalan kayıtlar boşaltılır. Yazımı
+başarısız olan parti artan beklemelerle yeniden denenir; denemeler tükenirse düşürülür
+ve `flush`/`close` bunu False döndürerek bildirir
+"""
+
+import time
+import queue
+import atexit
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Tür başına toplu yazıcı fonksiyonlarıyla çalışan sınırlı arkadan yazma kuyruğu"""
+
+    def __init__(self, writers: Dict[str, Callable[[List[Any]], Any]], maxsize: int = 1000,
+                 batch_size: int = 500, linger: float = 0.05, name: str = "write-behind",
+                 retries: int = 3, backoff: float = 0.1):
+        self.writers = writers  # tür -> kayıt listesini tek işlemde yazan fonksiyon
+        self.batch_size = batch_size
+        self.linger = linger  # İlk kayıttan sonra aynı partiye katılacak kayıtlar için bekleme (sn)
+        self.retries = retries  # Parti düşürülmeden önceki yeniden deneme sayısı
+        self.backoff = backoff  # İlk yeniden denemeden önceki bekleme (sn), her denemede iki katına çıkar
+        self.logger = logging.getLogger(__name__)
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._pending = 0  # Kuyruğa alınmış ama yazımı bitmemiş kayıtlar
+        self._done = threading.Condition()
+        self._closed = False
+        self._reported_failed = 0  # Son flush/close çağrısında bildirilmiş düşürülen kayıt sayısı
+
+        self.stats = {'enqueued': 0, 'written': 0, 'failed': 0, 'retries': 0, 'batches': 0, 'blocked': 0,
+                      'max_depth': 0}
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)  # Süreç kapanırken bekleyen kayıtlar yazılır
+
+    def put(self, kind: str, item: Any, timeout: Optional[float] = None) -> bool:
+        """Kaydı kuyruğa alır; kuyruk doluysa yer açılana (ya da `timeout` dolana) kadar bekler"""
+        if kind not in self.writers:
+            raise KeyError(f"Bilinmeyen kayıt türü: {kind}")
+        if self._closed:
+            raise RuntimeError("Kuyruk kapatıldı")
+
+        with self._done:
+            self._pending += 1
+        try:
+            try:
+                self._queue.put_nowait((kind, item))
+            except queue.Full:
+                with self._done:
+                    self.stats['blocked'] += 1
+                self._queue.put((kind, item), timeout=timeout)
+        except queue.Full:
+            self._finish(1)
+            self.logger.warning(f"Yazma kuyruğu dolu, {kind} kaydı alınamadı")
+            return False
+
+        with self._done:
+            self.stats['enqueued'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], self._queue.qsize())
+        return True
+
+    def _finish(self, count: int):
+        with self._done:
+            self._pending -= count
+            if self._pending == 0:
+                self._done.notify_all()
+
+    def _next_batch(self):
+        """Bir kaydı bekler, ardından `linger` süresince partiyi doldurur; (parti, durdur) döndürür"""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            try:
+                entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True  # Bu parti yazıldıktan sonra durulur
+            batch.append(entry)
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+
+            # Türlere göre grupla (ilk görülme sırasıyla); her tür tek işlemde yazılır
+            groups = {}
+            for kind, item in batch:
+                groups.setdefault(kind, []).append(item)
+            for kind, items in groups.items():
+                self._write(kind, items)
+            self._finish(len(batch))
+
+    def _write(self, kind: str, items: List[Any]):
+        """Partiyi yazar; hata olursa (ör. `database is locked`) artan beklemelerle yeniden dener"""
+        for attempt in range(self.retries + 1):
+            try:
+                self.writers[kind](items)
+                self.stats['written'] += len(items)
+                self.stats['batches'] += 1
+                return
+            except Exception as e:
+                if attempt == self.retries:
+                    with self._done:
+                        self.stats['failed'] += len(items)
+                    self.logger.error(f"{kind} kayıtları {attempt + 1} denemede yazılamadı, "
+                                      f"{len(items)} kayıt düşürüldü: {e}")
+                    return
+                self.stats['retries'] += 1
+                self.logger.warning(f"{kind} kayıtları yazılırken hata ({len(items)} kayıt), "
+                                    f"yeniden denenecek: {e}")
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler; süre dolarsa ya da önceki
+        flush/close çağrısından bu yana kayıt düşürüldüyse False döner"""
+        with self._done:
+            if not self._done.wait_for(lambda: self._pending == 0, timeout=timeout):
+                return False
+            dropped = self.stats['failed'] - self._reported_failed
+            self._reported_failed = self.stats['failed']
+        if dropped:
+            self.logger.warning(f"{dropped} kayıt yazılamadan düşürüldü")
+        return dropped == 0
+
+    def close(self, timeout: Optional[float] = 30.0) -> bool:
+        """Yeni kayıtları reddeder, kalanları yazar ve yazıcıyı durdurur; kayıt kaybı varsa False döner"""
+        if self._closed:
+            return True
+        self._closed = True
+        atexit.unregister(self.close)
+
+        flushed = self.flush(timeout)
+        if self._pending:
+            self.logger.warning(f"Kapanışta {self._pending} kayıt yazılamadı")
+            return False
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        return flushed
+
+    def __len__(self) -> int:
+        return self._pending